@@ -0,0 +1,105 @@
+"""
+Benchmark of the overlapping of asynchronous stages in AsyncPipeline. Each
+element passes through an asynchronous processor and an asynchronous sink
+which each wait a fixed time per element (standing in for I/O), and the
+pipeline is timed with each stage working on one element at a time, and
+with several at once. Checks that the processor's output stays in order.
+
+Usage: python benchmarks/async_overlap.py [-n ELEMENTS] [-d DELAY] [-c CONCURRENCY]
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from wai.annotations.core.stream import AsyncPipeline, StreamProcessor, StreamSink
+
+
+class DelayingProcessor(StreamProcessor[int, int]):
+    """
+    Asynchronous processor which waits before passing each element on,
+    waiting less for later elements so that they finish out of order.
+    """
+    def __init__(self, delay: float, elements: int):
+        self._delay: float = delay
+        self._elements: int = elements
+
+    def process_element(self, element, then, done):
+        raise NotImplementedError("Only processes asynchronously")
+
+    async def process_element_async(self, element, then, done):
+        await asyncio.sleep(self._delay * (1.0 - 0.5 * element / self._elements))
+        await then(element)
+
+    def finish(self, then, done):
+        done()
+
+
+class DelayingSink(StreamSink[int]):
+    """
+    Asynchronous sink which records the order it receives elements in,
+    and waits for each.
+    """
+    def __init__(self, delay: float):
+        self._delay: float = delay
+        self.received: List[int] = []
+
+    def consume_element(self, element):
+        raise NotImplementedError("Only consumes asynchronously")
+
+    async def consume_element_async(self, element):
+        self.received.append(element)
+        await asyncio.sleep(self._delay)
+
+    def finish(self):
+        pass
+
+
+def time_pipeline(elements: int, delay: float, concurrency: int) -> float:
+    """
+    Times the processing of a number of elements through the delaying stages.
+
+    :param elements:    The number of elements to process.
+    :param delay:       The time each stage waits per element, in seconds.
+    :param concurrency: The number of elements each stage works on at once.
+    :return:            The time taken, in seconds.
+    """
+    sink = DelayingSink(delay)
+    pipeline = AsyncPipeline(
+        processors=[DelayingProcessor(delay, elements)],
+        sink=sink,
+        concurrency=concurrency
+    )
+
+    start = time.perf_counter()
+    asyncio.run(pipeline.process_async(range(elements)))
+    seconds = time.perf_counter() - start
+
+    # The processor finishes later elements first, but must pass them on in order
+    if sink.received != list(range(elements)):
+        raise AssertionError(f"Elements were lost or reordered with concurrency {concurrency}: {sink.received}")
+
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--elements", type=int, default=10, help="the number of elements to process")
+    parser.add_argument("-d", "--delay", type=float, default=0.1, help="the time each stage waits per element")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="the number of elements to overlap")
+    args = parser.parse_args()
+
+    sequential = time_pipeline(args.elements, args.delay, 1)
+    concurrent = time_pipeline(args.elements, args.delay, args.concurrency)
+
+    print(f"{args.elements} elements, {args.delay:.3f} s per element per stage")
+    print(f"  concurrency 1    {sequential:8.3f} s")
+    print(f"  concurrency {args.concurrency:<4d} {concurrent:8.3f} s ({sequential / concurrent:5.2f}x)")
+
+    # Overlapping should take little more than one delay per stage
+    if concurrent > sequential / 2:
+        raise AssertionError(f"Concurrency {args.concurrency} didn't overlap the stages' waits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the scandir-based recursive globbing engine against glob.iglob,
+on a generated tree of empty files (spread over two levels of directories).
+The tree is created in a temporary directory unless an existing one is given
+with --directory, in which case it is created there on the first run and
+reused on later runs.
+
+Usage: python benchmarks/glob_engines.py [-n FILES] [-f FILES_PER_DIR] [-w WORKERS] [-r REPEATS] [-d DIRECTORY]
+"""
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import timeit
+
+from wai.annotations.core.util import scandir_iglob
+
+
+def create_tree(directory: str, files: int, files_per_directory: int):
+    """
+    Creates a tree of empty '.png' files, with a '.txt' file alongside every
+    tenth so that the pattern doesn't match everything.
+
+    :param directory:           The root of the tree.
+    :param files:               The number of files to create.
+    :param files_per_directory: The number of files in each leaf directory.
+    """
+    for index in range(files):
+        leaf = index // files_per_directory
+        leaf_directory = os.path.join(directory, f"d{leaf // 100:04d}", f"d{leaf % 100:02d}")
+        if index % files_per_directory == 0:
+            os.makedirs(leaf_directory, exist_ok=True)
+        extension = "txt" if index % 10 == 0 else "png"
+        open(os.path.join(leaf_directory, f"{index:08d}.{extension}"), "w").close()
+
+
+def time_glob(function, repeats: int) -> float:
+    """
+    Times the exhaustion of a glob.
+
+    :param function:    Creates the glob iterator.
+    :param repeats:     The number of times to repeat the timing.
+    :return:            The best time, in seconds.
+    """
+    return min(timeit.repeat(lambda: sum(1 for _ in function()), number=1, repeat=repeats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--files", type=int, default=1000000, help="the number of files in the tree")
+    parser.add_argument("-f", "--files-per-dir", type=int, default=1000, help="the number of files per directory")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="the number of threads for the threaded engine")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="the number of timing repeats")
+    parser.add_argument("-d", "--directory", type=str, default=None, help="the directory to create/reuse the tree in")
+    args = parser.parse_args()
+
+    directory = args.directory if args.directory is not None else tempfile.mkdtemp()
+    try:
+        if not os.path.isdir(directory) or len(os.listdir(directory)) == 0:
+            print(f"Creating {args.files} files in {directory}...")
+            create_tree(directory, args.files, args.files_per_dir)
+
+        pattern = os.path.join(directory, "**", "*.png")
+
+        # Check the engines agree before timing them
+        expected = list(glob.iglob(pattern, recursive=True))
+        for workers in (0, args.workers):
+            if list(scandir_iglob(pattern, workers)) != expected:
+                raise AssertionError(f"scandir_iglob with {workers} workers doesn't match glob.iglob")
+
+        engines = {
+            "glob.iglob": lambda: glob.iglob(pattern, recursive=True),
+            "scandir_iglob": lambda: scandir_iglob(pattern),
+            f"scandir_iglob ({args.workers} threads)": lambda: scandir_iglob(pattern, args.workers),
+        }
+
+        print(f"Globbing '{pattern}' ({len(expected)} matches), best of {args.repeats}")
+        baseline = None
+        for name, function in engines.items():
+            seconds = time_glob(function, args.repeats)
+            baseline = baseline if baseline is not None else seconds
+            print(f"  {name:28} {seconds:8.3f} s ({baseline / seconds:5.2f}x)")
+
+    finally:
+        if args.directory is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Micro-benchmark of the per-element overhead of executing a pipeline, in both
+the checked (default) and unchecked modes of Pipeline.process.
+
+Usage: python benchmarks/pipeline_overhead.py [-s STAGES] [-n ELEMENTS] [-r REPEATS]
+"""
+import argparse
+import timeit
+
+from wai.annotations.core.stream import Pipeline
+from wai.annotations.isp.passthrough.component import PassThrough
+
+
+def time_pipeline(pipeline: Pipeline, elements: int, repeats: int, checked: bool) -> float:
+    """
+    Times the processing of a number of elements through a pipeline.
+
+    :param pipeline:    The pipeline to time.
+    :param elements:    The number of elements to process.
+    :param repeats:     The number of times to repeat the timing.
+    :param checked:     Whether to execute the pipeline in checked mode.
+    :return:            The best per-element time, in nanoseconds.
+    """
+    source = range(elements)
+
+    def run():
+        pipeline.process(source, lambda element: None, checked=checked)
+
+    return min(timeit.repeat(run, number=1, repeat=repeats)) / elements * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--stages", type=int, default=10, help="the number of pass-through stages")
+    parser.add_argument("-n", "--elements", type=int, default=100000, help="the number of elements to process")
+    parser.add_argument("-r", "--repeats", type=int, default=5, help="the number of timing repeats")
+    args = parser.parse_args()
+
+    pipeline = Pipeline(processors=[PassThrough([]) for _ in range(args.stages)])
+
+    checked = time_pipeline(pipeline, args.elements, args.repeats, True)
+    unchecked = time_pipeline(pipeline, args.elements, args.repeats, False)
+
+    print(f"{args.stages}-stage pass-through pipeline, {args.elements} elements, best of {args.repeats}")
+    print(f"  checked:   {checked:10.1f} ns/element ({checked / args.stages:8.1f} ns/element/stage)")
+    print(f"  unchecked: {unchecked:10.1f} ns/element ({unchecked / args.stages:8.1f} ns/element/stage)")
+    print(f"  speed-up:  {checked / unchecked:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""
+Benchmark suite measuring the throughput of the built-in plugins, in
+isolation and in typical chains, against synthetic datasets. Run with
+'python -m benchmarks.suite --help' from the repository root.
+"""
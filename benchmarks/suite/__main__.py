@@ -0,0 +1,134 @@
+"""
+Benchmark suite for the built-in wai.annotations plugins.
+
+Runs each plugin registered in the 'wai.annotations.plugins' entry-point group
+in isolation (sources reading generated files, processors/sinks fed generated
+instances), and typical chains of plugins as the convert command would run
+them, against synthetic datasets of several sizes for each domain. Everything
+is generated locally, so no network access or external data is required.
+
+Usage:
+  python -m benchmarks.suite run [-s SIZES] [-r REPEATS] [-p PLUGIN ...] [-c CHAIN ...] [-o RESULTS]
+  python -m benchmarks.suite compare BASELINE RESULTS [-t TOLERANCE]
+
+'compare' exits with a non-zero status if any case is slower than the baseline
+by more than the tolerance, or failed.
+"""
+import argparse
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
+
+from ._cases import isolation_cases, chain_cases, CHAINS
+from ._datasets import generate_dataset, DOMAIN_CODES
+from ._results import run_case, create_results, load_results, compare_results, format_comparison
+
+
+def run(args: argparse.Namespace):
+    """
+    Runs the benchmark cases and writes the results.
+    """
+    cases = []
+    if not args.chains_only:
+        cases += list(isolation_cases(args.plugins))
+    if not args.isolation_only:
+        cases += list(chain_cases(args.chains))
+    cases = [case for case in cases if case.domain in args.domains]
+
+    results = []
+    with TemporaryDirectory() as data_directory:
+        for size in args.sizes:
+            for domain in args.domains:
+                dataset = generate_dataset(
+                    domain,
+                    size,
+                    os.path.join(data_directory, f"{domain}-{size}"),
+                    args.seed
+                )
+
+                for case in cases:
+                    if case.domain != domain:
+                        continue
+
+                    result = run_case(case, dataset, args.repeats)
+                    results.append(result)
+
+                    print(
+                        f"{result['name']:60s} " + (
+                            f"{result['best'] * 1000:10.1f} ms  {result['elements_per_second']:10.1f} elements/s"
+                            if "error" not in result else
+                            f"ERROR {result['error']}"
+                        ),
+                        file=sys.stderr
+                    )
+
+    with open(args.output, "w") as file:
+        json.dump(create_results(results, args.repeats), file, indent=2)
+
+
+def compare(args: argparse.Namespace) -> int:
+    """
+    Compares the results of a run against a baseline.
+
+    :return:    The exit status.
+    """
+    rows, regressions = compare_results(load_results(args.baseline), load_results(args.results), args.tolerance)
+
+    print(format_comparison(rows))
+
+    if regressions > 0:
+        print(f"{regressions} case(s) regressed by more than {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="runs the benchmarks")
+    run_parser.add_argument(
+        "-s", "--sizes", type=lambda s: [int(size) for size in s.split(",")], default=[10, 100, 1000],
+        help="comma-separated numbers of files in the generated datasets (default: 10,100,1000)"
+    )
+    run_parser.add_argument("-r", "--repeats", type=int, default=3, help="the number of timing repeats")
+    run_parser.add_argument(
+        "-d", "--domains", nargs="+", choices=DOMAIN_CODES, default=list(DOMAIN_CODES),
+        help="the domains to generate datasets for"
+    )
+    run_parser.add_argument("-p", "--plugins", nargs="+", help="the plugins to benchmark in isolation (default: all)")
+    run_parser.add_argument(
+        "-c", "--chains", nargs="+", choices=list(CHAINS), help="the chains of plugins to benchmark (default: all)"
+    )
+    run_parser.add_argument("--isolation-only", action="store_true", help="only benchmarks plugins in isolation")
+    run_parser.add_argument("--chains-only", action="store_true", help="only benchmarks chains of plugins")
+    run_parser.add_argument("--seed", type=int, default=42, help="the seed for generating the datasets")
+    run_parser.add_argument(
+        "-o", "--output", default="benchmark-results.json", help="the file to write the results to as JSON"
+    )
+
+    compare_parser = subparsers.add_parser("compare", help="compares results against a baseline")
+    compare_parser.add_argument("baseline", help="the results file of the baseline run")
+    compare_parser.add_argument("results", help="the results file to compare")
+    compare_parser.add_argument(
+        "-t", "--tolerance", type=float, default=0.1,
+        help="the fraction by which a case may be slower than the baseline (default: 0.1)"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args)
+        return 0
+
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+The benchmark cases: each built-in plugin in isolation, and typical
+chains of plugins as they would be run by the convert command.
+"""
+import time
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterator, List, Optional, Sequence, Type
+
+from wai.annotations.core.builder import ConversionPipelineBuilder
+from wai.annotations.core.plugin import get_all_plugins, get_plugin_domains, get_plugin_specifier
+from wai.annotations.core.specifier import (
+    StageSpecifier, SourceStageSpecifier, ProcessorStageSpecifier, SinkStageSpecifier
+)
+from wai.annotations.core.specifier.util import instantiate_stage_as_pipeline
+
+from ._datasets import Dataset, DOMAIN_CODES
+
+# The kinds of benchmark case
+ISOLATION = "isolation"
+CHAIN = "chain"
+
+# The options to give plugins which can't be run with their defaults. "{input}" is
+# replaced by a glob selecting the dataset's files, and "{output}" by an empty directory.
+PLUGIN_OPTIONS: Dict[str, List[str]] = {
+    "convert-image-format": ["-f", "png"],
+    "filter-labels": ["-l", "cat", "dog"],
+    "filter-metadata": ["-k", "score", "-t", "numeric", "-c", ">=0.5"],
+    "label-present": ["-l", "cat"],
+    "map-labels": ["-m", "cat=animal", "-m", "dog=animal"],
+    "od-to-ic": ["-m", "majority"],
+    "od-to-is": ["--labels", "cat", "dog"],
+    "remove-classes": ["-c", "cat"],
+    "write-labels": ["-o", "{output}/labels.txt"]
+}
+
+# Typical chains of plugins, by name
+CHAINS: Dict[str, List[List[str]]] = {
+    "images-od-to-void-is": [
+        ["from-images-od", "-i", "{input}"],
+        ["od-to-is", "--labels", "cat", "dog"],
+        ["to-void-is"]
+    ],
+    "images-od-to-void-ic": [
+        ["from-images-od", "-i", "{input}"],
+        ["od-to-ic", "-m", "majority"],
+        ["to-void-ic"]
+    ],
+    "images-od-filter-to-images-od": [
+        ["from-images-od", "-i", "{input}"],
+        ["coerce-box"],
+        ["discard-negatives"],
+        ["check-duplicate-filenames"],
+        ["to-images-od", "-o", "{output}"]
+    ],
+    "images-ic-convert-png-to-images-ic": [
+        ["from-images-ic", "-i", "{input}"],
+        ["convert-image-format", "-f", "png"],
+        ["to-images-ic", "-o", "{output}"]
+    ],
+    "images-is-to-images-is": [
+        ["from-images-is", "-i", "{input}"],
+        ["to-images-is", "-o", "{output}"]
+    ],
+    "audio-sp-clean-to-audio-sp": [
+        ["from-audio-files-sp", "-i", "{input}"],
+        ["clean-transcript", "--punctuation"],
+        ["to-audio-files-sp", "-o", "{output}"]
+    ],
+    "audio-ac-to-void-ac": [
+        ["from-audio-files-ac", "-i", "{input}"],
+        ["sample", "-s", "1", "-T", "0.5"],
+        ["to-void-ac"]
+    ],
+    "spectra-sc-to-spectra-sc": [
+        ["from-spectra-sc", "-i", "{input}"],
+        ["to-spectra-sc", "-o", "{output}"]
+    ]
+}
+
+# The source plugin which reads the files generated for each domain
+DOMAIN_SOURCES: Dict[str, str] = {
+    "ic": "from-images-ic",
+    "od": "from-images-od",
+    "is": "from-images-is",
+    "ac": "from-audio-files-ac",
+    "sp": "from-audio-files-sp",
+    "sc": "from-spectra-sc"
+}
+
+
+class BenchmarkCase:
+    """
+    A pipeline to time against a dataset of one domain.
+    """
+    def __init__(self, name: str, kind: str, domain: str, stages: List[List[str]]):
+        # The name identifying the case (without the dataset size)
+        self.name: str = name
+
+        # Whether the case is a single plugin in isolation or a chain of plugins
+        self.kind: str = kind
+
+        # The code of the domain of the dataset to process
+        self.domain: str = domain
+
+        # The stages of the pipeline, as the options to each stage
+        self.stages: List[List[str]] = stages
+
+    def time(self, dataset: Dataset) -> float:
+        """
+        Times one execution of the case against a dataset.
+
+        :param dataset:     The dataset to process.
+        :return:            The wall time taken, in seconds.
+        """
+        with TemporaryDirectory() as output:
+            stages = [format_options(stage, dataset, output) for stage in self.stages]
+
+            if self.kind == CHAIN:
+                pipeline = ConversionPipelineBuilder.from_options([option for stage in stages for option in stage])
+                source, sink = None, None
+            else:
+                specifier = get_plugin_specifier(stages[0][0])
+                pipeline = instantiate_stage_as_pipeline(specifier, stages[0][1:])
+
+                # Sources read the dataset's files, other plugins are given its instances
+                source = None if issubclass(specifier, SourceStageSpecifier) else dataset.create_instances()
+                sink = None if issubclass(specifier, SinkStageSpecifier) else discard
+
+            start = time.perf_counter()
+            pipeline.process(source, sink)
+            return time.perf_counter() - start
+
+
+def discard(element):
+    """
+    Sink for plugins benchmarked without a sink.
+    """
+    pass
+
+
+def format_options(options: Sequence[str], dataset: Dataset, output: str) -> List[str]:
+    """
+    Substitutes the dataset's files and the output directory into the options of a stage.
+
+    :param options:     The options, possibly containing "{input}"/"{output}".
+    :param dataset:     The dataset being processed.
+    :param output:      The directory to write any output into.
+    :return:            The formatted options.
+    """
+    return [
+        option.replace("{input}", dataset.glob).replace("{output}", output)
+        for option in options
+    ]
+
+
+def isolation_cases(plugins: Optional[Sequence[str]] = None) -> Iterator[BenchmarkCase]:
+    """
+    Creates a case for each plugin in isolation, for each domain it supports.
+
+    :param plugins:     The names of the plugins to benchmark, or None for all registered plugins.
+    :return:            An iterator of the cases.
+    """
+    all_plugins = get_all_plugins()
+    codes = domain_codes()
+
+    for name in sorted(all_plugins if plugins is None else plugins):
+        specifier: Type[StageSpecifier] = all_plugins[name]
+        options = [name] + PLUGIN_OPTIONS.get(name, [])
+        if issubclass(specifier, SourceStageSpecifier):
+            options += ["-i", "{input}"]
+        elif issubclass(specifier, SinkStageSpecifier) and not name.startswith("to-void-"):
+            options += ["-o", "{output}"]
+
+        for domain in get_plugin_domains(specifier):
+            if domain not in codes:
+                continue
+
+            # Processors are named for each domain they are benchmarked in
+            case_name = (
+                f"{name}[{codes[domain]}]"
+                if issubclass(specifier, ProcessorStageSpecifier) else
+                name
+            )
+
+            yield BenchmarkCase(case_name, ISOLATION, codes[domain], [options])
+
+
+def chain_cases(chains: Optional[Sequence[str]] = None) -> Iterator[BenchmarkCase]:
+    """
+    Creates a case for each typical chain of plugins.
+
+    :param chains:      The names of the chains to benchmark, or None for all.
+    :return:            An iterator of the cases.
+    """
+    codes = domain_codes()
+    all_plugins = get_all_plugins()
+
+    for name in (CHAINS if chains is None else chains):
+        stages = CHAINS[name]
+
+        # Skip chains which use plugins that aren't installed
+        if any(stage[0] not in all_plugins for stage in stages):
+            continue
+
+        domain = codes[get_plugin_specifier(stages[0][0]).domain()]
+
+        yield BenchmarkCase(name, CHAIN, domain, stages)
+
+
+def domain_codes() -> Dict[Type, str]:
+    """
+    Gets the domain code for each domain specifier which datasets can be generated for.
+    """
+    all_plugins = get_all_plugins()
+
+    return {
+        all_plugins[source].domain(): code
+        for code, source in DOMAIN_SOURCES.items()
+        if source in all_plugins and code in DOMAIN_CODES
+    }
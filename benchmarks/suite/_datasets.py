@@ -0,0 +1,226 @@
+"""
+Generates synthetic datasets for each domain, both as files on disk (for
+benchmarking sources and chains) and as in-memory instances with synthetic
+annotations (for benchmarking processors and sinks in isolation).
+"""
+import io
+import math
+import os
+import random
+import wave
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# The codes of the domains which datasets can be generated for
+DOMAIN_CODES = ("ic", "od", "is", "ac", "sp", "sc")
+
+# The labels used in the synthetic annotations
+LABELS = ("cat", "dog", "bird", "fish")
+
+# The sample rate of the generated audio files
+SAMPLE_RATE = 16000
+
+
+class Dataset:
+    """
+    A synthetic dataset for a single domain.
+    """
+    def __init__(self, domain: str, directory: str, filenames: List[str], seed: int):
+        # The code of the dataset's domain
+        self.domain: str = domain
+
+        # The directory the dataset's files are in
+        self.directory: str = directory
+
+        # The files in the dataset
+        self.filenames: List[str] = filenames
+
+        # The seed for generating the synthetic annotations
+        self._seed: int = seed
+
+    @property
+    def size(self) -> int:
+        return len(self.filenames)
+
+    @property
+    def glob(self) -> str:
+        """
+        A glob which selects all files in the dataset.
+        """
+        return os.path.join(self.directory, "*")
+
+    def create_instances(self) -> list:
+        """
+        Creates the instances of the dataset, with synthetic annotations.
+        New instances are created on each call, as processors may modify them.
+        """
+        rng = random.Random(self._seed)
+        factory = _INSTANCE_FACTORIES[self.domain]
+        return [factory(filename, rng) for filename in self.filenames]
+
+
+def generate_dataset(domain: str, size: int, directory: str, seed: int = 42) -> Dataset:
+    """
+    Generates the files of a synthetic dataset.
+
+    :param domain:      The code of the domain to generate the dataset for.
+    :param size:        The number of files to generate.
+    :param directory:   The directory to write the files into.
+    :param seed:        The seed for the random content of the files.
+    :return:            The dataset.
+    """
+    if domain not in DOMAIN_CODES:
+        raise ValueError(f"Unknown domain '{domain}', must be one of: {', '.join(DOMAIN_CODES)}")
+
+    os.makedirs(directory, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    writer, extension = _FILE_WRITERS[domain]
+    filenames = []
+    for index in range(size):
+        filename = os.path.join(directory, f"{domain}-{index:06d}.{extension}")
+        with open(filename, "wb") as file:
+            file.write(writer(rng))
+        filenames.append(filename)
+
+    return Dataset(domain, directory, filenames, seed)
+
+
+def _image_bytes(rng: np.random.Generator) -> bytes:
+    """
+    Creates a JPEG image of random size and content.
+    """
+    from PIL import Image as PILImage
+
+    width, height = int(rng.integers(64, 257)), int(rng.integers(48, 193))
+    pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    PILImage.fromarray(pixels).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _audio_bytes(rng: np.random.Generator) -> bytes:
+    """
+    Creates a short mono WAV file of a noisy tone.
+    """
+    duration = float(rng.uniform(0.25, 1.0))
+    frequency = float(rng.uniform(200.0, 2000.0))
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = 0.5 * np.sin(2 * math.pi * frequency * t) + 0.05 * rng.standard_normal(len(t))
+    samples = (np.clip(signal, -1.0, 1.0) * 32767).astype("<i2")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def _spectrum_bytes(rng: np.random.Generator) -> bytes:
+    """
+    Creates an ADAMS spectrum file with a few random peaks.
+    """
+    wave_numbers = np.linspace(400.0, 4000.0, 512)
+    amplitudes = 0.01 * rng.standard_normal(len(wave_numbers))
+    for centre in rng.uniform(400.0, 4000.0, 5):
+        amplitudes += np.exp(-((wave_numbers - centre) / 30.0) ** 2)
+
+    lines = ["waveno,amplitude"] + [f"{x:.2f},{y:.6f}" for x, y in zip(wave_numbers, amplitudes)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# The functions which create the contents of each domain's files, and the files' extensions
+_FILE_WRITERS: Dict[str, tuple] = {
+    "ic": (_image_bytes, "jpg"),
+    "od": (_image_bytes, "jpg"),
+    "is": (_image_bytes, "jpg"),
+    "ac": (_audio_bytes, "wav"),
+    "sp": (_audio_bytes, "wav"),
+    "sc": (_spectrum_bytes, "spec")
+}
+
+
+def _create_ic_instance(filename: str, rng: random.Random):
+    from wai.annotations.domain.classification import Classification
+    from wai.annotations.domain.image import Image
+    from wai.annotations.domain.image.classification import ImageClassificationInstance
+
+    return ImageClassificationInstance(Image.from_file(filename), Classification(rng.choice(LABELS)))
+
+
+def _create_od_instance(filename: str, rng: random.Random):
+    from wai.common.adams.imaging.locateobjects import LocatedObjects, LocatedObject
+    from wai.common.geometry import Point, Polygon
+    from wai.annotations.domain.image import Image
+    from wai.annotations.domain.image.object_detection import ImageObjectDetectionInstance
+
+    image = Image.from_file(filename)
+    width, height = image.size
+
+    objects = LocatedObjects()
+    for _ in range(rng.randint(1, 8)):
+        w, h = rng.randint(4, width // 2), rng.randint(4, height // 2)
+        x, y = rng.randint(0, width - w - 1), rng.randint(0, height - h - 1)
+        located_object = LocatedObject(x, y, w, h, type=rng.choice(LABELS), score=rng.random())
+        located_object.set_polygon(Polygon(
+            Point(x, y), Point(x + w, y), Point(x + w, y + h), Point(x, y + h)
+        ))
+        objects.append(located_object)
+
+    return ImageObjectDetectionInstance(image, objects)
+
+
+def _create_is_instance(filename: str, rng: random.Random):
+    from wai.annotations.domain.image import Image
+    from wai.annotations.domain.image.segmentation import ImageSegmentationInstance, ImageSegmentationAnnotation
+
+    image = Image.from_file(filename)
+    width, height = image.size
+
+    annotation = ImageSegmentationAnnotation(list(LABELS), image.size)
+    indices = np.zeros((height, width), np.uint16)
+    for _ in range(rng.randint(1, 4)):
+        w, h = rng.randint(4, width // 2), rng.randint(4, height // 2)
+        x, y = rng.randint(0, width - w), rng.randint(0, height - h)
+        indices[y:y + h, x:x + w] = rng.randint(1, len(LABELS))
+    annotation.indices = indices
+
+    return ImageSegmentationInstance(image, annotation)
+
+
+def _create_ac_instance(filename: str, rng: random.Random):
+    from wai.annotations.domain.audio import Audio
+    from wai.annotations.domain.audio.classification import AudioClassificationInstance
+    from wai.annotations.domain.classification import Classification
+
+    return AudioClassificationInstance(Audio.from_file(filename), Classification(rng.choice(LABELS)))
+
+
+def _create_sp_instance(filename: str, rng: random.Random):
+    from wai.annotations.domain.audio import Audio
+    from wai.annotations.domain.audio.speech import SpeechInstance, Transcription
+
+    words = [rng.choice(LABELS) for _ in range(rng.randint(3, 12))]
+    return SpeechInstance(Audio.from_file(filename), Transcription(" ".join(words).capitalize() + "."))
+
+
+def _create_sc_instance(filename: str, rng: random.Random):
+    from wai.annotations.domain.classification import Classification
+    from wai.annotations.domain.spectra import Spectrum
+    from wai.annotations.domain.spectra.classification import SpectrumClassificationInstance
+
+    return SpectrumClassificationInstance(Spectrum.from_file(filename), Classification(rng.choice(LABELS)))
+
+
+# The functions which create an instance of each domain from a generated file
+_INSTANCE_FACTORIES: Dict[str, Callable] = {
+    "ic": _create_ic_instance,
+    "od": _create_od_instance,
+    "is": _create_is_instance,
+    "ac": _create_ac_instance,
+    "sp": _create_sp_instance,
+    "sc": _create_sc_instance
+}
@@ -0,0 +1,168 @@
+"""
+Running the benchmark cases, and storing/comparing their results.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ._cases import BenchmarkCase
+from ._datasets import Dataset
+
+# The version of the results format
+RESULTS_VERSION = 1
+
+
+def run_case(case: BenchmarkCase, dataset: Dataset, repeats: int) -> Dict[str, Any]:
+    """
+    Times a case against a dataset a number of times.
+
+    :param case:        The case to time.
+    :param dataset:     The dataset to process.
+    :param repeats:     The number of times to time the case.
+    :return:            The result of the case, as a JSON object.
+    """
+    result: Dict[str, Any] = {
+        "name": f"{case.name}/{dataset.size}",
+        "kind": case.kind,
+        "domain": case.domain,
+        "size": dataset.size,
+        "stages": case.stages
+    }
+
+    try:
+        times = [case.time(dataset) for _ in range(repeats)]
+    except (Exception, SystemExit) as e:
+        # Record the failure rather than abandoning the whole run (bad
+        # options make the argument parser exit)
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    best = min(times)
+    result.update(
+        times=times,
+        best=best,
+        median=statistics.median(times),
+        elements_per_second=dataset.size / best if best > 0.0 else 0.0
+    )
+
+    return result
+
+
+def create_results(results: List[Dict[str, Any]], repeats: int) -> Dict[str, Any]:
+    """
+    Creates the results document of a benchmark run, describing the
+    environment it was run in.
+
+    :param results:     The results of each case.
+    :param repeats:     The number of times each case was timed.
+    :return:            The results document.
+    """
+    try:
+        from importlib.metadata import version
+        package_version = version("wai.annotations.core")
+    except Exception:
+        package_version = None
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wai.annotations.core": package_version,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "repeats": repeats,
+        "results": results
+    }
+
+
+def load_results(filename: str) -> Dict[str, Any]:
+    """
+    Loads a results document written by a benchmark run.
+
+    :param filename:    The file the results were written to.
+    :return:            The results document.
+    """
+    with open(filename, "r") as file:
+        document = json.load(file)
+
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"'{filename}' is not a version {RESULTS_VERSION} benchmark results file")
+
+    return document
+
+
+def compare_results(
+        baseline: Dict[str, Any],
+        current: Dict[str, Any],
+        tolerance: float
+) -> Tuple[List[Tuple[str, Optional[float], Optional[float], str]], int]:
+    """
+    Compares the best times of the cases in two benchmark runs.
+
+    :param baseline:    The results document of the baseline run.
+    :param current:     The results document of the run to compare.
+    :param tolerance:   The fraction by which a case may be slower than the
+                        baseline before it is considered a regression.
+    :return:            The comparison for each case (name, baseline time, current
+                        time, status), and the number of regressions.
+    """
+    baseline_times = {result["name"]: result.get("best") for result in baseline["results"]}
+    current_times = {result["name"]: result.get("best") for result in current["results"]}
+
+    rows = []
+    regressions = 0
+    for name in sorted(set(baseline_times) | set(current_times)):
+        baseline_time = baseline_times.get(name)
+        current_time = current_times.get(name)
+
+        if baseline_time is None or current_time is None:
+            if name in current_times and current_time is None:
+                status = "error"
+                regressions += 1
+            else:
+                status = "new" if name not in baseline_times else "missing"
+        elif current_time > baseline_time * (1.0 + tolerance):
+            status = "slower"
+            regressions += 1
+        elif current_time < baseline_time * (1.0 - tolerance):
+            status = "faster"
+        else:
+            status = "same"
+
+        rows.append((name, baseline_time, current_time, status))
+
+    return rows, regressions
+
+
+def format_comparison(rows: List[Tuple[str, Optional[float], Optional[float], str]]) -> str:
+    """
+    Formats a comparison of two benchmark runs as a table.
+
+    :param rows:    The comparison for each case, from 'compare_results'.
+    :return:        The table.
+    """
+    def format_time(value: Optional[float]) -> str:
+        return f"{value * 1000:.1f}" if value is not None else "-"
+
+    def format_change(baseline_time: Optional[float], current_time: Optional[float]) -> str:
+        if baseline_time is None or current_time is None or baseline_time == 0.0:
+            return "-"
+        return f"{100 * (current_time - baseline_time) / baseline_time:+.1f}%"
+
+    table = [("Case", "Baseline (ms)", "Current (ms)", "Change", "Status")] + [
+        (name, format_time(baseline_time), format_time(current_time), format_change(baseline_time, current_time), status)
+        for name, baseline_time, current_time, status in rows
+    ]
+
+    widths = [max(len(row[column]) for row in table) for column in range(5)]
+
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if column in (0, 4) else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in table
+    )
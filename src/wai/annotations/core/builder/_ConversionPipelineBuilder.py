@@ -1,8 +1,10 @@
-from typing import Optional, List, Set, Tuple, Type
+import logging
+from typing import Callable, Optional, List, Set, Tuple, Type
 
 from wai.common.cli import OptionsList
 
-from ..domain import DomainSpecifier
+from ..component.util import LocalFilenameSource, LocalFileWriter, WithOutputDirectory
+from ..domain import DomainSpecifier, Instance
 from ..logging import LoggingEnabled, StreamLogger, get_library_root_logger
 from ..plugin import *
 from ..specifier import *
@@ -17,12 +19,22 @@ class ConversionPipelineBuilder(LoggingEnabled):
     A complete conversion chain. Consists of an input stage, a variable number of intermediate
     stages and an output stage, all optional.
     """
-    def __init__(self):
+    def __init__(self, validate_first: Optional[int] = None, validate_every: int = 0):
+        """
+        :param validate_first:  The number of instances to check the domain of after each
+                                stage, before only checking a sample. None to check all.
+        :param validate_every:  The interval at which to check the domain of instances
+                                after the first few, or 0 to check no more.
+        """
         # The component stages in the conversion chain
         self._source: Optional[Tuple[Pipeline, Type[DomainSpecifier]]] = None
         self._processors: List[Tuple[Pipeline, DomainTransferMap]] = []
         self._sink: Optional[Tuple[Pipeline, Type[DomainSpecifier]]] = None
 
+        # The sampling of instances for run-time domain validation
+        self._validate_first: Optional[int] = validate_first
+        self._validate_every: int = validate_every
+
     @classmethod
     def split_global_options(cls, options: OptionsList) -> Tuple[OptionsList, OptionsList]:
         """
@@ -69,18 +81,27 @@ class ConversionPipelineBuilder(LoggingEnabled):
         return stage_options
 
     @classmethod
-    def from_options(cls, options: OptionsList) -> Pipeline:
+    def from_options(
+            cls,
+            options: OptionsList,
+            validate_first: Optional[int] = None,
+            validate_every: int = 0
+    ) -> Pipeline:
         """
         Creates a conversion chain from command-line options.
 
-        :param options:     The command-line options.
-        :return:            The conversion chain.
+        :param options:         The command-line options.
+        :param validate_first:  The number of instances to check the domain of after each
+                                stage, before only checking a sample. None to check all.
+        :param validate_every:  The interval at which to check the domain of instances
+                                after the first few, or 0 to check no more.
+        :return:                The conversion chain.
         """
         # Split the stage options
         stage_option_lists = cls.split_options(options)
 
         # Create the empty conversion chain
-        conversion_chain = ConversionPipelineBuilder()
+        conversion_chain = ConversionPipelineBuilder(validate_first, validate_every)
 
         # Add each stage from the options list
         for stage_options in stage_option_lists:
@@ -141,44 +162,70 @@ class ConversionPipelineBuilder(LoggingEnabled):
             processors += self._source[0].processors
 
         # Add input domain validation and logging
-        processors.append(
-            InlineDomainValidator(self._source[1])
+        processors += self._create_validators(
+            (self._source[1],)
             if self._source is not None else
-            InlineDomainValidator(*self._processors[0][1].keys())
+            tuple(self._processors[0][1].keys())
             if len(self._processors) > 0 else
-            InlineDomainValidator(self._sink[1])
-        )
-        processors.append(
-            StreamLogger(
-                get_library_root_logger().info,
-                lambda instance: f"Sourced {instance.data.filename}"
-            )
+            (self._sink[1],)
         )
+        processors += self._create_info_loggers(lambda instance: f"Sourced {instance.data.filename}")
 
         # Add any processors with domain validation
         for processor_pipeline, domain_transfer_map in self._processors:
             processors += processor_pipeline.processors
-            processors.append(InlineDomainValidator(*domain_transfer_map.values()))
+            processors += self._create_validators(tuple(domain_transfer_map.values()))
 
         # Add logging to the pipeline to report when an instance is consumed
-        processors.append(
-            StreamLogger(
-                get_library_root_logger().info,
-                lambda instance: f"Consuming {instance.data.filename}"
-            )
-        )
+        processors += self._create_info_loggers(lambda instance: f"Consuming {instance.data.filename}")
 
         # Add the sink
         if self._sink is not None:
             processors += self._sink[0].processors
             sink = self._sink[0].sink
 
+        # Make sure files written by the sink can't be read back in by the source
+        if isinstance(source, LocalFilenameSource) and isinstance(sink, (LocalFileWriter, WithOutputDirectory)):
+            source.output_paths.append(sink.output_path)
+
         return Pipeline(
             source=source,
             processors=processors,
             sink=sink
         )
 
+    def _create_validators(self, domains: Tuple[Type[DomainSpecifier], ...]) -> List[InlineDomainValidator]:
+        """
+        Creates the run-time validation of the domains of the instances at some
+        point in the pipeline. The domains themselves have already been checked
+        statically as the stages were added, so this only guards against components
+        which produce instances other than those they declare. Omitted entirely if
+        no instances are to be checked.
+
+        :param domains:     The domains allowed at this point in the pipeline.
+        :return:            The validator, if any.
+        """
+        validator = InlineDomainValidator(*domains, first=self._validate_first, every=self._validate_every)
+
+        return [validator] if validator.checks_any else []
+
+    @staticmethod
+    def _create_info_loggers(message_formatter: Callable[[Instance], str]) -> List[StreamLogger]:
+        """
+        Creates a stream-logger which logs a message for each instance at the INFO
+        level. Omitted entirely if INFO logging is disabled, so that the message
+        is not formatted for every instance.
+
+        :param message_formatter:   Creates the message to log for an instance.
+        :return:                    The logger, if any.
+        """
+        logger = get_library_root_logger()
+
+        if not logger.isEnabledFor(logging.INFO):
+            return []
+
+        return [StreamLogger(logger.info, message_formatter)]
+
     def _add_source_stage(self, stage_specifier: Type[SourceStageSpecifier], stage_pipeline: Pipeline):
         """
         Adds a source stage to the pipeline.
@@ -1,8 +1,8 @@
-from typing import Type, Tuple
+from typing import Optional, Type, Tuple
 
 from ..domain import Instance, DomainSpecifier
 from ..stream import StreamProcessor, ThenFunction, DoneFunction
-from ..stream.util import RequiresNoFinalisation
+from ..stream.util import RequiresNoFinalisation, ProcessState
 from .error import BadDomain
 
 
@@ -11,12 +11,42 @@ class InlineDomainValidator(
     StreamProcessor[Instance, Instance]
 ):
     """
-    Makes sure all instances are from the specified domain.
+    Makes sure all instances are from the specified domain. Can optionally
+    only check a sample of the instances, namely the first few, and then
+    every so-many thereafter.
     """
-    def __init__(self, *domains: Type[DomainSpecifier]):
+    # The number of instances seen so far
+    _count: int = ProcessState(lambda self: 0)
+
+    def __init__(
+            self,
+            *domains: Type[DomainSpecifier],
+            first: Optional[int] = None,
+            every: int = 0
+    ):
         self._domains: Tuple[Type[DomainSpecifier], ...] = domains
         self._instance_classes: Tuple[Type[Instance], ...] = tuple(domain.instance_type() for domain in domains)
 
+        # The number of instances to check before sampling, or None to check all
+        self._first: Optional[int] = first
+
+        # The interval at which to check instances after the first few, or 0 for none
+        self._every: int = every
+
+    @property
+    def checks_all(self) -> bool:
+        """
+        Whether this validator checks every instance.
+        """
+        return self._first is None or self._every == 1
+
+    @property
+    def checks_any(self) -> bool:
+        """
+        Whether this validator checks any instances.
+        """
+        return self.checks_all or self._first > 0 or self._every > 0
+
     def process_element(
             self,
             element: Instance,
@@ -24,8 +54,23 @@ class InlineDomainValidator(
             done: DoneFunction
     ):
         # Make sure the instance is from the given domain
-        if not isinstance(element, self._instance_classes):
+        if self._should_check() and not isinstance(element, self._instance_classes):
             raise BadDomain(f"{element.__class__.__name__} in stream where allowed domains are: "
                             f"{', '.join(domain.name() for domain in self._domains)}")
 
         then(element)
+
+    def _should_check(self) -> bool:
+        """
+        Whether the current instance is one of the sampled instances.
+        """
+        if self.checks_all:
+            return True
+
+        index = self._count
+        self._count = index + 1
+
+        if index < self._first:
+            return True
+
+        return self._every > 0 and (index - self._first) % self._every == 0
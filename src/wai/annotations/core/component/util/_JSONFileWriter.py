@@ -1,5 +1,6 @@
+import json
 from abc import ABC
-from typing import TypeVar, Optional
+from typing import Any, List, TypeVar, Optional
 
 from wai.common.cli.options import FlagOption, Option
 
@@ -36,3 +37,34 @@ class JSONFileWriter(SeparateFileWriter[ExternalFormat], ABC):
         :return:
         """
         return "whether to format the JSON annotations file with indentation"
+
+    def can_merge_shard_files(self) -> bool:
+        # Can only merge the JSON files if the writer implements 'merge_json_documents'
+        return (
+            not self.expects_file
+            or type(self).merge_shard_files is not JSONFileWriter.merge_shard_files
+            or type(self).merge_json_documents is not JSONFileWriter.merge_json_documents
+        )
+
+    def merge_shard_files(self, shard_filenames: List[str], filename: str):
+        # Load the JSON written by each shard
+        documents = []
+        for shard_filename in shard_filenames:
+            with open(shard_filename, "r") as file:
+                documents.append(json.load(file))
+
+        merged = self.merge_json_documents(documents)
+
+        with open(filename, "w") as file:
+            json.dump(merged, file, indent=self.indent)
+
+    def merge_json_documents(self, documents: List[Any]) -> Any:
+        """
+        Merges the JSON annotations files written by several shards of a
+        conversion into one. Writers which support sharded conversion
+        should override this method.
+
+        :param documents:   The JSON documents written by each shard, in shard order.
+        :return:            The merged JSON document.
+        """
+        raise Exception(f"{type(self).__name__} can't merge JSON files written by separate workers")
@@ -2,17 +2,18 @@ from argparse import Namespace
 import os
 from abc import abstractmethod, abstractproperty
 from tempfile import TemporaryDirectory
-from typing import Optional, TypeVar, Iterator, IO, Tuple, Iterable
+from typing import Optional, TypeVar, Iterator, IO, Tuple, Iterable, Callable
 
 from wai.common.cli.options import TypedOption, Option
 
 from ...stream import Pipeline
 from .._SinkComponent import SinkComponent
+from ._ShardableOutput import ShardableOutput
 
 ElementType = TypeVar("ElementType")
 
 
-class LocalFileWriter(SinkComponent[ElementType]):
+class LocalFileWriter(ShardableOutput, SinkComponent[ElementType]):
     """
     Base class for classes which can write a specific external format to disk.
     """
@@ -40,6 +41,23 @@ class LocalFileWriter(SinkComponent[ElementType]):
 
         return output_path
 
+    def redirect_output(self, redirect: Callable[[str], str]):
+        self.output = redirect(os.path.abspath(self.output))
+
+    def owns_output_file(self, filename: str) -> bool:
+        # Only writers to a single file write whole files (possibly once per split sub-directory)
+        if not self.expects_file:
+            return False
+
+        return (
+            os.path.basename(filename) == os.path.basename(self.output)
+            and os.path.abspath(filename).startswith(self.output_path)
+        )
+
+    def can_merge_shard_files(self) -> bool:
+        # Writers to a directory write no files which would need merging
+        return not self.expects_file or super().can_merge_shard_files()
+
     @classmethod
     def get_help_text_for_option(cls, option: Option) -> Optional[str]:
         if option is cls.output:
@@ -1,17 +1,30 @@
+from functools import partial
 from itertools import chain
-from typing import List, TextIO, Tuple, Optional, Iterable, Iterator
+import os
+import shutil
+from typing import Callable, Dict, List, TextIO, Tuple, Optional, Iterable, Iterator
 
-from wai.common.cli.options import TypedOption, Option
+from wai.common.cli.options import TypedOption, FlagOption, Option
 from wai.common.iterate import random
 
 from ...stream import ThenFunction, DoneFunction
 from ...stream.util import ProcessState
-from ...util import chain_map, recursive_iglob, read_file_list, InstanceState
+from ...util import (
+    chain_map, recursive_iglob, read_file_list, InstanceState, FilePrefetcher, buffered_shuffle, external_shuffle,
+    DatasetIndex, glob_can_reach
+)
 from .._SourceComponent import SourceComponent
+from ._ShardableOutput import ShardableOutput
 from ._WithRandomness import WithRandomness
 
+# The ways the files can be shuffled
+FULL_SHUFFLE = "full"
+BUFFER_SHUFFLE = "buffer"
+EXTERNAL_SHUFFLE = "external"
+SHUFFLE_MODES = (FULL_SHUFFLE, BUFFER_SHUFFLE, EXTERNAL_SHUFFLE)
 
-class LocalFilenameSource(WithRandomness, SourceComponent[Tuple[str, bool]]):
+
+class LocalFilenameSource(ShardableOutput, WithRandomness, SourceComponent[Tuple[str, bool]]):
     """
     Source which yields globbed file-names from disk.
     """
@@ -55,6 +68,80 @@ class LocalFilenameSource(WithRandomness, SourceComponent[Tuple[str, bool]]):
         help="optional file to write read filenames into"
     )
 
+    # The index to select input files from
+    index: Optional[str] = TypedOption(
+        "--index",
+        type=str,
+        metavar="FILENAME",
+        help="an index of the input files created by the 'index' command, to select files from with --select"
+    )
+
+    # The predicate selecting input files from the index
+    select: Optional[str] = TypedOption(
+        "--select",
+        type=str,
+        metavar="PREDICATE",
+        help="an SQL expression over the --index selecting which input files to read, without reading their "
+             "annotations first; can use the columns path, negative, size, mtime, instances, width and height, "
+             "and the functions label_count(labels, LABEL) and has_label(labels, LABEL), "
+             "e.g. \"has_label(labels, 'cat') AND width >= 640\""
+    )
+
+    # How to shuffle the files when a seed is given
+    shuffle_mode: str = TypedOption(
+        "--shuffle-mode",
+        type=str,
+        default=FULL_SHUFFLE,
+        choices=SHUFFLE_MODES,
+        help="how to shuffle the files when a seed is given: 'full' lists all files in memory and shuffles "
+             "them, 'buffer' shuffles approximately through a buffer of --shuffle-buffer-size files, and "
+             "'external' shuffles exactly holding at most --shuffle-buffer-size files in memory, spilling "
+             "the rest to temporary files"
+    )
+
+    # The number of files held in memory by the buffer/external shuffle modes
+    shuffle_buffer_size: int = TypedOption(
+        "--shuffle-buffer-size",
+        type=int,
+        default=10000,
+        metavar="COUNT",
+        help="the number of files to hold in memory when shuffling in 'buffer' or 'external' mode"
+    )
+
+    # The number of files to read ahead of the file being processed
+    read_ahead: int = TypedOption(
+        "--read-ahead",
+        type=int,
+        default=0,
+        metavar="COUNT",
+        help="the number of files to read in the background ahead of the file being processed (0 to disable)"
+    )
+
+    # The maximum amount of read-ahead data to hold in memory
+    read_ahead_memory: int = TypedOption(
+        "--read-ahead-memory",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="the maximum amount of read-ahead file data to hold in memory, in megabytes"
+    )
+
+    # The number of threads to list directories with while globbing
+    glob_workers: int = TypedOption(
+        "--glob-workers",
+        type=int,
+        default=0,
+        metavar="COUNT",
+        help="the number of threads to list directories with concurrently when globbing input files, "
+             "which helps on network file systems (0 to list them one at a time)"
+    )
+
+    # Whether to give the OS hints about which files will be read next
+    fadvise: bool = FlagOption(
+        "--fadvise",
+        help="advises the operating system to cache files which will be read soon (where supported)"
+    )
+
     # The open file handle to write to
     _file_handle: Optional[TextIO] = ProcessState(
         lambda self: open(self.output_filename, "w") if self.output_filename is not None else None
@@ -65,48 +152,222 @@ class LocalFilenameSource(WithRandomness, SourceComponent[Tuple[str, bool]]):
             then: ThenFunction[Tuple[str, bool]],
             done: DoneFunction
     ):
-        # Warn the user if no input files were specified
-        if len(self.input_file_names) + len(self.negative_file_names) == 0:
-            self.logger.warning("No input files selected to convert")
+        for element in self.iterate_elements():
+            then(element)
+
+        done()
 
-        inputs = self.input_file_names
+    def iterate_elements(self) -> Iterator[Tuple[str, bool]]:
+        # The number of files produced, to warn the user if none were selected
+        count = 0
 
-        if self.has_random:
-            inputs = tuple(random(iter(inputs), self.random))
+        try:
+            with self.create_prefetcher() as prefetcher:
+                # Files are discovered as they are produced, unless shuffling requires the full list
+                # (the negatives are listed now if they must be listed before anything is written)
+                inputs = self.iterate_input_file_names()
+                negatives = self.iterate_negative_file_names()
 
-        for input in inputs:
-            then((input, False))
-            if self._file_handle is not None:
-                self._file_handle.write(f"{input},false\n")
+                if self.has_random:
+                    inputs = self.shuffle(inputs)
+
+                for input in prefetcher.iterate(inputs):
+                    count += 1
+                    yield input, False
+                    if self._file_handle is not None:
+                        self._file_handle.write(f"{input},false\n")
+
+                if self.has_random:
+                    negatives = self.shuffle(negatives)
 
-        negatives = self.negative_file_names
+                for negative in prefetcher.iterate(negatives):
+                    count += 1
+                    yield negative, True
+                    if self._file_handle is not None:
+                        self._file_handle.write(f"{negative},true\n")
 
-        if self.has_random:
-            negatives = tuple(random(iter(negatives), self.random))
+            # Warn the user if no input files were specified
+            if count == 0:
+                self.logger.warning("No input files selected to convert")
 
-        for negative in negatives:
-            then((negative, True))
+        finally:
             if self._file_handle is not None:
-                self._file_handle.write(f"{negative},true\n")
+                self._file_handle.close()
 
-        if self._file_handle is not None:
-            self._file_handle.close()
+    def shuffle(self, file_names: Iterator[str]) -> Iterable[str]:
+        """
+        Shuffles file-names in the configured shuffle mode.
 
-        done()
+        :param file_names:  The file-names to shuffle.
+        :return:            The file-names in shuffled order.
+        """
+        if self.shuffle_mode == BUFFER_SHUFFLE:
+            return buffered_shuffle(file_names, self.random, self.shuffle_buffer_size)
+        elif self.shuffle_mode == EXTERNAL_SHUFFLE:
+            return external_shuffle(file_names, self.random, self.shuffle_buffer_size)
+
+        return tuple(random(file_names, self.random))
+
+    def create_prefetcher(self) -> FilePrefetcher:
+        """
+        Creates a prefetcher which reads the produced files ahead of
+        their being processed, as configured by the read-ahead options.
+        """
+        return FilePrefetcher(
+            self.read_ahead,
+            self.read_ahead_memory * 1024 * 1024,
+            self.fadvise
+        )
+
+    def redirect_output(self, redirect: Callable[[str], str]):
+        if self.output_filename is not None:
+            self.output_filename = redirect(os.path.abspath(self.output_filename))
+
+    def owns_output_file(self, filename: str) -> bool:
+        return (
+            self.output_filename is not None
+            and os.path.abspath(filename) == os.path.abspath(self.output_filename)
+        )
+
+    def merge_shard_files(self, shard_filenames: List[str], filename: str):
+        # The lists of read files are simply concatenated
+        with open(filename, "w") as file:
+            for shard_filename in shard_filenames:
+                with open(shard_filename, "r") as shard_file:
+                    shutil.copyfileobj(shard_file, file)
 
     @InstanceState
     def input_file_names(self) -> Tuple[str, ...]:
-        return tuple(self.load_file_names(self.inputs, self.input_files))
+        return tuple(self.discover_file_names(self.inputs, self.input_files))
 
     @InstanceState
     def negative_file_names(self) -> Tuple[str, ...]:
-        return tuple(self.load_file_names(self.negatives, self.negative_files))
+        return tuple(self.discover_file_names(self.negatives, self.negative_files))
+
+    @InstanceState
+    def output_paths(self) -> List[str]:
+        """
+        The files/directories which the rest of the conversion writes to.
+        Files written there must not be read back in as inputs.
+        """
+        return []
+
+    def iterate_input_file_names(self) -> Iterator[str]:
+        """
+        Iterates over the input files, discovering them (by globbing and
+        reading file lists) as iteration proceeds, rather than listing them
+        all up front like 'input_file_names'. If the globs could reach the
+        output of the conversion, they are listed up front anyway, so that
+        files written while converting are never discovered as inputs.
+        """
+        if self.can_reach_output(self.inputs, self.input_files):
+            return iter(self.input_file_names)
+
+        return self.discover_file_names(self.inputs, self.input_files)
+
+    def iterate_negative_file_names(self) -> Iterator[str]:
+        """
+        Iterates over the negative files, discovering them as iteration
+        proceeds (unless they could include the output of the conversion),
+        rather than listing them all up front like 'negative_file_names'.
+        """
+        if self.can_reach_output(self.negatives, self.negative_files):
+            return iter(self.negative_file_names)
+
+        return self.discover_file_names(self.negatives, self.negative_files)
+
+    def discover_file_names(self, direct_files: Iterable[str], list_files: Iterable[str]) -> Iterator[str]:
+        """
+        Discovers the files matching some globs, and in the file lists matching
+        others, as iteration proceeds, selecting them from the index if selecting.
+
+        :param direct_files:    The globs of the files.
+        :param list_files:      The globs of the file lists.
+        :return:                An iterator over the file-names.
+        """
+        return self.select_from_index(self.load_file_names(direct_files, list_files, self.glob_workers))
+
+    def can_reach_output(self, direct_files: Iterable[str], list_files: Iterable[str]) -> bool:
+        """
+        Whether any of the globs of files/file lists could match a file
+        written by the conversion (including the list of read files).
+        """
+        output_paths = list(self.output_paths)
+        if self.output_filename is not None:
+            output_paths.append(self.output_filename)
+
+        return any(
+            glob_can_reach(pathname, output_path)
+            for pathname in chain(direct_files, list_files)
+            for output_path in output_paths
+        )
+
+    @InstanceState
+    def index_selection(self) -> Optional[Dict[str, int]]:
+        """
+        The indexed modification time of each file selected from the index,
+        by absolute path, or None if not selecting from an index.
+        """
+        if self.select is None:
+            return None
+
+        if self.index is None:
+            raise Exception("Selecting input files (--select) requires an index (--index)")
+
+        with DatasetIndex(self.index) as index:
+            return dict(index.select(self.select))
+
+    def select_from_index(self, file_names: Iterator[str]) -> Iterator[str]:
+        """
+        Filters file-names to those selected from the index, if selecting.
+
+        :param file_names:  The file-names to filter.
+        :return:            The selected file-names.
+        """
+        if self.index_selection is None:
+            return file_names
+
+        return self._iterate_selected(file_names)
+
+    def _iterate_selected(self, file_names: Iterator[str]) -> Iterator[str]:
+        """
+        Yields the file-names which were selected from the index, warning if
+        any have changed or been removed since they were indexed. Removed files
+        are still yielded, to be handled by the reader as when not selecting.
+        """
+        selection = self.index_selection
+        changed = 0
+
+        for file_name in file_names:
+            mtime = selection.get(os.path.abspath(file_name))
+            if mtime is None:
+                continue
+
+            try:
+                if os.stat(file_name).st_mtime_ns != mtime:
+                    changed += 1
+            except FileNotFoundError:
+                changed += 1
+
+            yield file_name
+
+        if changed > 0:
+            self.logger.warning(
+                f"{changed} selected files have changed or been removed since they were indexed in '{self.index}' "
+                f"(re-run the 'index' command to update it)"
+            )
 
     @classmethod
-    def load_file_names(cls, direct_files: Iterable[str], list_files: Iterable[str]) -> Iterator[str]:
+    def load_file_names(
+            cls,
+            direct_files: Iterable[str],
+            list_files: Iterable[str],
+            glob_workers: int = 0
+    ) -> Iterator[str]:
+        glob = partial(recursive_iglob, workers=glob_workers)
         return chain(
-            chain_map(recursive_iglob, direct_files),
-            chain_map(read_file_list, chain_map(recursive_iglob, list_files))
+            chain_map(glob, direct_files),
+            chain_map(read_file_list, chain_map(glob, list_files))
         )
 
     @classmethod
@@ -6,9 +6,10 @@ from wai.common.cli.options import FlagOption, Option
 
 from ...domain import Data
 from ._LocalFileWriter import LocalFileWriter, ElementType
+from ._WithDataPlacement import WithDataPlacement
 
 
-class SeparateFileWriter(LocalFileWriter[ElementType], ABC):
+class SeparateFileWriter(WithDataPlacement, LocalFileWriter[ElementType], ABC):
     """
     Writer for external formats where the file is stored separately
     to the annotations.
@@ -39,4 +40,4 @@ class SeparateFileWriter(LocalFileWriter[ElementType], ABC):
         :param path:        The path to write the file to.
         """
         if not self.annotations_only:
-            data_file.write_data_if_present(path)
+            super().write_data_file(data_file, path)
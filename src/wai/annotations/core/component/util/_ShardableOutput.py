@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import Callable, List
+
+
+class ShardableOutput(ABC):
+    """
+    Mixin class for components which write files to disk, allowing a
+    conversion to be sharded across several worker processes. Each worker
+    writes into a directory of its own, and the files are then moved into
+    place, with any file written by more than one worker being merged by
+    the component which owns it.
+    """
+    @abstractmethod
+    def redirect_output(self, redirect: Callable[[str], str]):
+        """
+        Redirects the files written by this component.
+
+        :param redirect:    Maps an output path of this component to the path to write to instead.
+        """
+        raise NotImplementedError(self.redirect_output.__qualname__)
+
+    @abstractmethod
+    def owns_output_file(self, filename: str) -> bool:
+        """
+        Whether the given file is one which this component writes the
+        entire contents of, as opposed to one file per element.
+
+        :param filename:    The absolute path to the file.
+        :return:            True if this component is responsible for merging the file.
+        """
+        raise NotImplementedError(self.owns_output_file.__qualname__)
+
+    def can_merge_shard_files(self) -> bool:
+        """
+        Whether this component can merge the files it writes the entire
+        contents of, if more than one shard writes them. Checked before a
+        sharded conversion starts, so that it can be refused up front rather
+        than failing once all shards have completed.
+
+        :return:    True if the files can be merged (or none are written).
+        """
+        return type(self).merge_shard_files is not ShardableOutput.merge_shard_files
+
+    def merge_shard_files(self, shard_filenames: List[str], filename: str):
+        """
+        Merges the versions of an output file written by several shards
+        of a conversion.
+
+        :param shard_filenames:     The files written by each shard, in shard order.
+        :param filename:            The file to write the merged contents to.
+        """
+        raise Exception(
+            f"{type(self).__name__} can't merge the '{filename}' files written by separate workers"
+        )
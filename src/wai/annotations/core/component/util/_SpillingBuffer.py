@@ -0,0 +1,39 @@
+from typing import Optional, TypeVar
+
+from wai.common.cli.options import TypedOption
+
+from ...stream.util import ProcessState
+from ...util import SpillingList
+from ._Buffer import Buffer
+
+ElementType = TypeVar("ElementType")
+
+
+class SpillingBuffer(Buffer[ElementType]):
+    """
+    Utility component which buffers the entire stream, keeping elements
+    in memory up to a budget and spilling the rest to a temporary file
+    on disk. Forwards the buffered elements as a SpillingList, which loads
+    spilled elements as they are accessed.
+    """
+    buffer_memory: int = TypedOption(
+        "--buffer-memory",
+        type=int,
+        default=1024,
+        metavar="MB",
+        help="the maximum memory to buffer elements in, in megabytes (as measured by their "
+             "pickled size); further elements are spilled to a temporary file"
+    )
+
+    buffer_dir: Optional[str] = TypedOption(
+        "--buffer-dir",
+        type=str,
+        metavar="DIR",
+        help="the directory to create the temporary file for spilled elements in "
+             "(defaults to the system's temporary directory)"
+    )
+
+    # The buffered elements
+    _buffer: SpillingList[ElementType] = ProcessState(
+        lambda self: SpillingList(self.buffer_memory * 1024 * 1024, self.buffer_dir)
+    )
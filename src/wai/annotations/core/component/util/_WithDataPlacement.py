@@ -0,0 +1,44 @@
+from abc import ABC
+from typing import Optional
+
+from wai.common.cli.options import TypedOption, Option
+
+from ...domain import Data
+from ...util import DATA_PLACEMENTS, COPY_PLACEMENT
+from .._Component import Component
+
+
+class WithDataPlacement(Component, ABC):
+    """
+    Adds an option to a writer component which selects how data files
+    which are unchanged from their source files are placed in the output.
+    """
+    # How to place unchanged data files in the output
+    data_placement: str = TypedOption(
+        "--data-placement",
+        type=str,
+        default=COPY_PLACEMENT,
+        choices=DATA_PLACEMENTS
+    )
+
+    def write_data_file(self, data_file: Data, path: str):
+        """
+        Writes the data-file to disk.
+
+        :param data_file:   The data-file to write.
+        :param path:        The path to write the file to.
+        """
+        data_file.write_data_if_present(path, self.data_placement)
+
+    @classmethod
+    def get_help_text_for_option(cls, option: Option) -> Optional[str]:
+        if option is cls.data_placement:
+            return cls.get_help_text_for_data_placement_option()
+        return super().get_help_text_for_option(option)
+
+    @classmethod
+    def get_help_text_for_data_placement_option(cls) -> str:
+        return "how to output data files which are unchanged from their source files: 'write' writes the data " \
+               "from memory, 'copy' copies the source file in the kernel, 'hardlink'/'symlink' link to the " \
+               "source file, and 'reflink' clones the source file on copy-on-write file systems (links fall " \
+               "back to copying where unsupported)"
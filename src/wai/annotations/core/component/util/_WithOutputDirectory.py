@@ -0,0 +1,58 @@
+import os
+from abc import ABC
+from typing import Callable, Optional
+
+from wai.common.cli.options import TypedOption, Option
+
+from .._Component import Component
+from ._ShardableOutput import ShardableOutput
+
+
+class WithOutputDirectory(ShardableOutput, Component, ABC):
+    """
+    Adds an option to a writer component which selects the directory to
+    write its files into, one or more per element. The output can be
+    redirected, so conversions with the writer can be sharded across
+    workers or performed incrementally.
+    """
+    # The directory to write the files into
+    output_dir: str = TypedOption(
+        "-o", "--output-dir",
+        type=str,
+        default="."
+    )
+
+    @property
+    def output_path(self) -> str:
+        """
+        The directory this writer is writing to.
+        """
+        output_path = os.path.abspath(self.output_dir)
+
+        # Make sure the path ends with a slash
+        if not output_path.endswith(os.path.sep):
+            output_path += os.path.sep
+
+        return output_path
+
+    def redirect_output(self, redirect: Callable[[str], str]):
+        self.output_dir = redirect(os.path.abspath(self.output_dir))
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def owns_output_file(self, filename: str) -> bool:
+        # Only writes one file per element
+        return False
+
+    def can_merge_shard_files(self) -> bool:
+        # Writes no files which would need merging
+        return True
+
+    @classmethod
+    def get_help_text_for_option(cls, option: Option) -> Optional[str]:
+        if option is cls.output_dir:
+            return cls.get_help_text_for_output_dir_option()
+        return super().get_help_text_for_option(option)
+
+    @classmethod
+    def get_help_text_for_output_dir_option(cls) -> str:
+        return "the directory to write the files to"
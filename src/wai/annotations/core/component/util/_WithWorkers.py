@@ -0,0 +1,81 @@
+from abc import ABC
+from typing import Optional
+
+from wai.common.cli.options import TypedOption, FlagOption, Option
+
+from ...stream import StreamProcessor
+from ...stream.util import ParallelStreamProcessor, WORKER_TYPES, THREAD_WORKERS
+from .._Component import Component
+
+
+class WithWorkers(Component, ABC):
+    """
+    Adds options to a stateless processor component which allow it to
+    process elements on a pool of worker threads/processes.
+    """
+    # The number of workers to process elements with
+    workers: int = TypedOption(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N"
+    )
+
+    # Whether to use threads or processes as workers
+    worker_type: str = TypedOption(
+        "--worker-type",
+        type=str,
+        default=THREAD_WORKERS,
+        choices=WORKER_TYPES
+    )
+
+    # Whether to forward elements as soon as they are ready
+    unordered: bool = FlagOption(
+        "--unordered"
+    )
+
+    @property
+    def is_parallel(self) -> bool:
+        """
+        Whether this processor should be run on multiple workers.
+        """
+        return self.workers > 1
+
+    def parallelise(self) -> StreamProcessor:
+        """
+        Gets a version of this processor which runs on the configured
+        number of workers.
+
+        :return:    The parallel processor, or this processor if only one worker is requested.
+        """
+        if not self.is_parallel:
+            return self
+
+        return ParallelStreamProcessor(
+            self,
+            self.workers,
+            self.worker_type,
+            ordered=not self.unordered
+        )
+
+    @classmethod
+    def get_help_text_for_option(cls, option: Option) -> Optional[str]:
+        if option is cls.workers:
+            return cls.get_help_text_for_workers_option()
+        if option is cls.worker_type:
+            return cls.get_help_text_for_worker_type_option()
+        if option is cls.unordered:
+            return cls.get_help_text_for_unordered_option()
+        return super().get_help_text_for_option(option)
+
+    @classmethod
+    def get_help_text_for_workers_option(cls) -> str:
+        return "the number of workers to process elements with"
+
+    @classmethod
+    def get_help_text_for_worker_type_option(cls) -> str:
+        return "whether to use threads or processes as workers"
+
+    @classmethod
+    def get_help_text_for_unordered_option(cls) -> str:
+        return "forwards elements as soon as they are processed, rather than in input order"
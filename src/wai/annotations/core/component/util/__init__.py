@@ -8,5 +8,12 @@ from ._JSONFileWriter import JSONFileWriter
 from ._LocalFilenameSource import LocalFilenameSource
 from ._LocalFileWriter import LocalFileWriter, ExpectsFile, ExpectsDirectory, iterate_files
 from ._SeparateFileWriter import SeparateFileWriter
-from ._splitting import SplitSink, SplitState, RequiresNoSplitFinalisation, WithPersistentSplitFiles
+from ._ShardableOutput import ShardableOutput
+from ._SpillingBuffer import SpillingBuffer
+from ._splitting import (
+    SplitSink, SplitState, RequiresNoSplitFinalisation, WithPersistentSplitFiles, AppendsToSplitFiles
+)
+from ._WithDataPlacement import WithDataPlacement
+from ._WithOutputDirectory import WithOutputDirectory
 from ._WithRandomness import WithRandomness
+from ._WithWorkers import WithWorkers
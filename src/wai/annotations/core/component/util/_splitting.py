@@ -46,6 +46,17 @@ class SplitSink(SinkComponent[ElementType], ABC):
         if isinstance(self, LocalFileWriter):
             self.create_split_directories(self.output_path)
 
+    def start_resumed(self):
+        # Persistent split files are re-opened, so must be appended to rather than truncated
+        if isinstance(self, WithPersistentSplitFiles) and not isinstance(self, AppendsToSplitFiles):
+            raise Exception(
+                f"{type(self).__name__} can't add to the split files written by an interrupted conversion, "
+                f"so the conversion can't be resumed"
+            )
+
+        self.is_resumed = True
+        self.start()
+
     def consume_element(self, element: ElementType):
         self.consume_element_for_split_with_exit_stack(element)
         self._move_to_next_split()
@@ -194,6 +205,9 @@ class SplitSink(SinkComponent[ElementType], ABC):
 
     split_index: int = ProcessState(lambda self: 0 if self.is_splitting else -1)
 
+    # Whether this sink is adding to the output of an interrupted conversion
+    is_resumed: bool = ProcessState(lambda self: False)
+
     @property
     def split_label(self) -> Optional[str]:
         if not self.is_splitting:
@@ -265,6 +279,16 @@ class WithPersistentSplitFiles(Generic[SplitFilesType]):
     # The split files
     _split_files: SplitFilesType = SplitState(lambda self: self.__init_split_files_actual())
 
+    @property
+    def split_file_mode(self) -> str:
+        """
+        The mode to open split files in. When resuming an interrupted conversion,
+        files are opened for appending so the output already written is kept.
+        Sub-classes which open their files in this mode (in '_init_split_files')
+        should declare so with the AppendsToSplitFiles mixin.
+        """
+        return "a" if self.is_resumed else "w"
+
     def __init_split_files_actual(self) -> SplitFilesType:
         split_files = self._init_split_files()
         iterator = self._iterate_split_files(split_files)
@@ -291,3 +315,13 @@ class WithPersistentSplitFiles(Generic[SplitFilesType]):
         :return:                An iterator over those files.
         """
         raise NotImplementedError(self._iterate_split_files.__qualname__)
+
+
+class AppendsToSplitFiles:
+    """
+    Mixin class for declaring that a sink WithPersistentSplitFiles opens its
+    split files in 'split_file_mode', so that it can resume an interrupted
+    conversion. Other sinks with persistent split files refuse to resume, as
+    re-opening their files would discard the output already written.
+    """
+    pass
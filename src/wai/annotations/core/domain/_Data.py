@@ -2,6 +2,7 @@ import os
 from abc import abstractmethod
 from typing import Optional
 from ..logging import LoggingEnabled, get_library_root_logger
+from ..util import take_prefetched_data, place_file, remove_if_linked, COPY_PLACEMENT, WRITE_PLACEMENT
 
 
 class Data(LoggingEnabled):
@@ -9,12 +10,22 @@ class Data(LoggingEnabled):
     The base class for representing a single item in a data-set, without
     its annotations. Should be sub-typed by specific domains to represent
     items in that domain, e.g. image files for the image domain.
+
+    Data read from disk is deferred by default: only the path of the file
+    is stored, and its contents are read the first time they are accessed.
+    While the data is unchanged from the file it was read from, writing it
+    places that file in the output (e.g. by copying or linking it) rather
+    than writing the data held in memory.
     """
     def __init__(self, filename: str, data: Optional[bytes] = None):
         self._path: str = os.path.dirname(filename)
         self._filename: str = os.path.basename(filename)
         self._data: Optional[bytes] = data
 
+        # The file containing the data, which is read from when the data is
+        # first accessed if deferred. None if the data didn't come from a file.
+        self._source_file: Optional[str] = None
+
     @property
     def filename(self) -> str:
         """
@@ -34,25 +45,71 @@ class Data(LoggingEnabled):
         """
         The binary contents of the file, if available.
         """
+        if self._data is None and self._source_file is not None:
+            self._data = self._read_source_file()
         return self._data
 
+    @property
+    def is_deferred(self) -> bool:
+        """
+        Whether the data is still to be read from its source file.
+        """
+        return self._data is None and self._source_file is not None
+
     @classmethod
-    def from_file(cls, filepath: str) -> 'Data':
+    def from_file(cls, filepath: str, lazy: bool = True) -> 'Data':
         """
         Reads an item from disk.
 
+        :param filepath:    The file to read.
+        :param lazy:        Whether to defer reading the file's contents
+                            until they are first accessed.
+        :return:            The file-info object.
+        """
+        # Use the data if it has already been read ahead of time,
+        # otherwise just record where to read the data from
+        item = cls.from_file_data(filepath, take_prefetched_data(filepath))
+        item._source_file = filepath
+
+        # Read the data now if not deferring
+        if not lazy:
+            item.data
+
+        return item
+
+    @classmethod
+    def deferred(cls, filepath: str) -> 'Data':
+        """
+        Creates an item whose data is read from disk when first accessed.
+
         :param filepath:    The file to read.
         :return:            The file-info object.
         """
-        # Try to read the data
-        data = None
-        if os.path.exists(filepath):
-            with open(filepath, "rb") as file:
-                data = file.read()
-        else:
-            get_library_root_logger().warning("Missing file, cannot read data: %s" % filepath)
+        item = cls.from_file_data(filepath, None)
+        item._source_file = filepath
+        return item
 
-        return cls.from_file_data(filepath, data)
+    def _read_source_file(self) -> Optional[bytes]:
+        """
+        Reads the deferred data from the source file.
+
+        :return:    The data, or None if the file is missing.
+        """
+        try:
+            with open(self._source_file, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            get_library_root_logger().warning("Missing file, cannot read data: %s" % self._source_file)
+            self._source_file = None
+            return None
+
+    def release(self):
+        """
+        Releases any resources derived from the data (e.g. decoded
+        representations) once they are no longer needed. They are
+        recreated if the data is used again.
+        """
+        pass
 
     @classmethod
     @abstractmethod
@@ -67,19 +124,43 @@ class Data(LoggingEnabled):
         """
         pass
 
-    def write_data_if_present(self, path: str) -> bool:
+    def write_data_if_present(self, path: str, placement: str = COPY_PLACEMENT) -> bool:
         """
         Writes the file data to disk under its filename in the given path.
 
-        :param path:    The directory to write the file into.
-        :return:        Whether the file was written or not.
+        :param path:        The directory to write the file into.
+        :param placement:   How to place the source file in the output if the data
+                            is unchanged from it (see place_file). If 'write', or the
+                            data didn't come from a file, the data is written from memory.
+        :return:            Whether the file was written or not.
         """
+        destination = os.path.join(path, self._filename)
+
+        # Place the source file directly, without reading it into memory
+        if self._source_file is not None and placement != WRITE_PLACEMENT:
+            try:
+                place_file(self._source_file, destination, placement)
+                return True
+            except FileNotFoundError:
+                if os.path.exists(self._source_file):
+                    raise
+
+                # Write the data from memory if it was read before the source file went missing
+                if self.is_deferred:
+                    get_library_root_logger().warning("Missing file, cannot read data: %s" % self._source_file)
+                    self._source_file = None
+                    return False
+
         # Can't write anything without data
-        if self.data is None:
+        data = self.data
+        if data is None:
             return False
 
+        # Replace rather than write through any link left by a previous placement
+        remove_if_linked(destination)
+
         # Write the data to disk
-        with open(os.path.join(path, self._filename), "wb") as file:
-            file.write(self.data)
+        with open(destination, "wb") as file:
+            file.write(data)
 
         return True
@@ -54,6 +54,13 @@ class Instance(Generic[DataType, AnnotationsType]):
             None
         )
 
+    def release(self):
+        """
+        Releases any resources derived from this instance's data, once
+        it has been consumed.
+        """
+        self._data.release()
+
     def __iter__(self):
         yield self._data
         yield self._annotations
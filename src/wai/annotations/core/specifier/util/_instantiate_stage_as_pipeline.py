@@ -3,6 +3,7 @@ from typing import Type
 from wai.common.cli import OptionsList
 
 from ...component import *
+from ...component.util import WithWorkers
 from ...stream import Pipeline
 from .._StageSpecifier import StageSpecifier
 from ._get_configured_stage_parser import get_configured_stage_parser
@@ -32,8 +33,14 @@ def instantiate_stage_as_pipeline(specifier: Type[StageSpecifier], options: Opti
         sink = components[-1]
         components = components[:-1]
 
+    # Run any processors which have requested multiple workers in parallel
+    processors = tuple(
+        component.parallelise() if isinstance(component, WithWorkers) else component
+        for component in components
+    )
+
     return Pipeline(
         source=source,
-        processors=components,
+        processors=processors,
         sink=sink
     )
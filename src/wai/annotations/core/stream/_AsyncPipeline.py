@@ -0,0 +1,509 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterable, Awaitable, Callable, Iterable, List, Optional, Set, Union
+
+from .error import DoneNeverCalled, ThenCalledAfterDone
+from .util import FunctionStreamSink, IterableStreamSource, RequiresNoFinalisation, reset_all_process_state
+from ._Pipeline import Pipeline
+from ._StreamProcessor import StreamProcessor
+from ._StreamSink import StreamSink
+from ._StreamSource import StreamSource
+from ._typing import ThenFunction, DoneFunction, ElementType, AsyncThenFunction
+
+# Marker placed in a stage's input queue once the upstream stage is done
+_END_OF_STREAM = object()
+
+
+class AsyncPipeline(Pipeline):
+    """
+    A pipeline which can be executed inside an asyncio event loop without
+    blocking it.
+
+    Each stage runs as a separate task, connected to the next by a bounded
+    queue, so the source, processors and sink all run concurrently. Stages
+    may provide asynchronous variants of their methods, which are used in
+    preference to the synchronous ones:
+
+    - sources: 'async produce_async(then, done)'
+    - processors: 'async process_element_async(element, then, done)'
+                  and 'async finish_async(then, done)'
+    - sinks: 'async consume_element_async(element)' and 'async finish_async()'
+
+    The 'then'/'done' functions passed to these variants are coroutine
+    functions, and must be awaited. Synchronous methods are run on an
+    executor, so existing components can be used unchanged.
+
+    Each stage with an asynchronous per-element method can work on up to
+    'concurrency' elements at once (e.g. to overlap the I/O for many files),
+    in which case the elements a processor outputs for each input element
+    are still passed on in input order. The asynchronous methods of such
+    stages must then tolerate being called again before earlier calls have
+    completed.
+    """
+    def __init__(self,
+                 source: Optional[StreamSource] = None,
+                 processors: Iterable[StreamProcessor] = tuple(),
+                 sink: Optional[StreamSink] = None,
+                 executor: Optional[Executor] = None,
+                 queue_size: int = 16,
+                 concurrency: int = 1):
+        super().__init__(source, processors, sink)
+
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be at least 1, got {queue_size}")
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+
+        # The executor to run synchronous stage methods on. Must have at least
+        # one thread per synchronous stage. If none is given, one is created
+        # for each execution.
+        self._executor: Optional[Executor] = executor
+
+        # The maximum number of elements waiting between each pair of stages
+        self._queue_size: int = queue_size
+
+        # The maximum number of elements each asynchronous stage works on at once
+        self._concurrency: int = concurrency
+
+    @classmethod
+    def from_pipeline(
+            cls,
+            pipeline: Pipeline,
+            executor: Optional[Executor] = None,
+            queue_size: int = 16,
+            concurrency: int = 1
+    ) -> 'AsyncPipeline':
+        """
+        Creates an asynchronous pipeline with the same stages as a
+        synchronous one.
+
+        :param pipeline:    The pipeline to copy.
+        :param executor:    The executor to run synchronous stage methods on.
+        :param queue_size:  The maximum number of elements waiting between stages.
+        :param concurrency: The maximum number of elements each asynchronous stage works on at once.
+        :return:            The asynchronous pipeline.
+        """
+        return cls(
+            pipeline.source if pipeline.has_source else None,
+            pipeline.processors,
+            pipeline.sink if pipeline.has_sink else None,
+            executor,
+            queue_size,
+            concurrency
+        )
+
+    async def process_async(self,
+                            source: Optional[Union[Iterable, AsyncIterable]] = None,
+                            sink: Optional[Union[ThenFunction, AsyncThenFunction]] = None):
+        """
+        Executes this pipeline asynchronously.
+
+        :param source:  The source to provide stream elements to the pipeline.
+                        Can be an iterable or an asynchronous iterable.
+                        Uses the fixed source if none given.
+        :param sink:    The sink to consume the stream elements. Can be a
+                        function or a coroutine function. Uses the fixed
+                        sink if none given.
+        """
+        # Use the provided sink function, or the fixed sink if none given
+        if sink is None:
+            sink = self.sink
+        elif inspect.iscoroutinefunction(sink):
+            sink = _AsyncFunctionStreamSink(sink)
+        else:
+            sink = FunctionStreamSink(sink)
+
+        # Use the provided source iterable, or the fixed source if none given
+        if source is None:
+            source = self.source
+        elif isinstance(source, AsyncIterable):
+            source = _AsyncIterableStreamSource(source)
+        else:
+            source = IterableStreamSource(source)
+
+        # Create an executor with a thread per stage if none was provided
+        executor = self._executor
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ThreadPoolExecutor(len(self.processors) + 2)
+
+        execution = _AsyncExecution(
+            asyncio.get_running_loop(),
+            executor,
+            len(self.processors) + 1,
+            self._queue_size,
+            self._concurrency
+        )
+
+        # Make sure all process state is reset
+        reset_all_process_state(source, *self.processors, sink)
+
+        try:
+            # Start all stages
+            await execution.run(sink.start)
+            for processor in self.processors:
+                await execution.run(processor.start)
+
+            # Create a task for each stage
+            tasks = [asyncio.ensure_future(execution.produce(source))]
+            for index, processor in enumerate(self.processors):
+                tasks.append(asyncio.ensure_future(execution.process(processor, index)))
+            tasks.append(asyncio.ensure_future(execution.consume(sink)))
+
+            # Wait for all stages to complete, abandoning the rest if one fails
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                execution.abort()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=False)
+
+            # Tidy up all process state
+            reset_all_process_state(source, *self.processors, sink)
+
+
+class _AsyncExecution:
+    """
+    The state of a single execution of an asynchronous pipeline.
+    """
+    def __init__(
+            self,
+            loop: asyncio.AbstractEventLoop,
+            executor: Executor,
+            num_queues: int,
+            queue_size: int,
+            concurrency: int
+    ):
+        # The event loop the pipeline is executing on
+        self._loop: asyncio.AbstractEventLoop = loop
+
+        # The executor to run synchronous methods on
+        self._executor: Executor = executor
+
+        # The queues between each stage of the pipeline
+        self._queues: List[asyncio.Queue] = [asyncio.Queue(queue_size) for _ in range(num_queues)]
+
+        # The maximum number of elements each asynchronous stage works on at once
+        self._concurrency: int = concurrency
+
+        # Whether the execution has been abandoned
+        self._aborted: bool = False
+
+        # The tasks currently waiting to place an element in a full queue
+        self._blocked: Set[asyncio.Task] = set()
+
+    async def run(self, method: Callable, *args):
+        """
+        Runs a synchronous method on the executor.
+        """
+        return await self._loop.run_in_executor(self._executor, method, *args)
+
+    def abort(self):
+        """
+        Abandons the execution, releasing any stages which are waiting
+        for room in the queue to the next stage.
+        """
+        self._aborted = True
+
+        for task in tuple(self._blocked):
+            task.cancel()
+
+    async def produce(self, source: StreamSource):
+        """
+        Runs the source stage.
+        """
+        output = _StageOutput(self, self._queues[0])
+
+        produce_async = getattr(source, "produce_async", None)
+        if produce_async is not None:
+            await produce_async(output.then, output.done)
+        else:
+            await self.run(source.produce, output.then_threadsafe, output.done_threadsafe)
+
+        output.check_done_called()
+
+    async def process(self, processor: StreamProcessor, index: int):
+        """
+        Runs a processor stage.
+        """
+        input_queue = self._queues[index]
+        output = _StageOutput(self, self._queues[index + 1])
+
+        process_element_async = getattr(processor, "process_element_async", None)
+        finish_async = getattr(processor, "finish_async", None)
+
+        if process_element_async is not None and self._concurrency > 1:
+            await self.map_concurrently(input_queue, process_element_async, output)
+        else:
+            while True:
+                element = await input_queue.get()
+
+                if element is _END_OF_STREAM:
+                    break
+
+                if process_element_async is not None:
+                    await process_element_async(element, output.then, output.done)
+                else:
+                    await self.run(processor.process_element, element, output.then_threadsafe, output.done_threadsafe)
+
+        if finish_async is not None:
+            await finish_async(output.then, output.done)
+        else:
+            await self.run(processor.finish, output.then_threadsafe, output.done_threadsafe)
+
+        output.check_done_called()
+
+    async def consume(self, sink: StreamSink):
+        """
+        Runs the sink stage.
+        """
+        input_queue = self._queues[-1]
+
+        consume_element_async = getattr(sink, "consume_element_async", None)
+        finish_async = getattr(sink, "finish_async", None)
+
+        if consume_element_async is not None and self._concurrency > 1:
+            await self.map_concurrently(input_queue, lambda element, then, done: consume_element_async(element))
+        else:
+            while True:
+                element = await input_queue.get()
+
+                if element is _END_OF_STREAM:
+                    break
+
+                if consume_element_async is not None:
+                    await consume_element_async(element)
+                else:
+                    await self.run(sink.consume_element, element)
+
+        if finish_async is not None:
+            await finish_async()
+        else:
+            await self.run(sink.finish)
+
+    async def map_concurrently(
+            self,
+            input_queue: asyncio.Queue,
+            call: Callable[..., Awaitable],
+            output: Optional['_StageOutput'] = None
+    ):
+        """
+        Calls an asynchronous per-element method for each element in a stage's
+        input queue, with up to the concurrency limit of calls in progress at
+        once. The elements each call outputs are buffered, and passed on in
+        input order once the calls for all earlier elements have passed theirs on.
+
+        :param input_queue: The stage's input queue.
+        :param call:        Calls the method with an element and 'then'/'done' functions.
+        :param output:      The stage's output, or None for the sink.
+        """
+        # Each call holds its slot until its output has been passed on, so at most
+        # 'concurrency' elements' worth of output are ever buffered
+        slots = asyncio.Semaphore(self._concurrency)
+        in_progress: Set[asyncio.Task] = set()
+
+        # The call for the previous element, which passes on its output before the next call can
+        previous: Optional[asyncio.Task] = None
+
+        async def call_in_order(element, preceding: Optional[asyncio.Task]):
+            try:
+                element_output = _BufferedOutput()
+                await call(element, element_output.then, element_output.done)
+
+                # Wait for the call for the preceding element to pass on its output
+                if preceding is not None:
+                    await asyncio.wait([preceding])
+                    if preceding.cancelled() or preceding.exception() is not None:
+                        return
+
+                if output is not None:
+                    await element_output.forward_to(output)
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                element = await input_queue.get()
+
+                if element is _END_OF_STREAM:
+                    break
+
+                await slots.acquire()
+                _raise_first_failure(in_progress)
+
+                previous = asyncio.ensure_future(call_in_order(element, previous))
+                in_progress.add(previous)
+                previous.add_done_callback(_discard_if_succeeded(in_progress))
+
+            # Wait for the remaining calls to complete
+            while len(in_progress) > 0:
+                await asyncio.wait(in_progress, return_when=asyncio.FIRST_EXCEPTION)
+                _raise_first_failure(in_progress)
+
+        finally:
+            for task in tuple(in_progress):
+                task.cancel()
+
+    async def put(self, queue: asyncio.Queue, element):
+        """
+        Places an element in the queue to the next stage, waiting
+        for room if necessary.
+        """
+        if self._aborted:
+            raise asyncio.CancelledError()
+
+        task = asyncio.current_task()
+        self._blocked.add(task)
+        try:
+            await queue.put(element)
+        finally:
+            self._blocked.discard(task)
+
+    def call_threadsafe(self, coroutine_function: Callable, *args):
+        """
+        Runs a coroutine function on the event loop from an executor
+        thread, waiting for it to complete.
+        """
+        # Stop stages still running on the executor once the execution is abandoned
+        if self._aborted:
+            raise asyncio.CancelledError()
+
+        return asyncio.run_coroutine_threadsafe(coroutine_function(*args), self._loop).result()
+
+
+class _StageOutput:
+    """
+    The 'then'/'done' functions for a single stage of an asynchronous
+    pipeline, in both asynchronous and thread-safe synchronous forms.
+    """
+    def __init__(self, execution: _AsyncExecution, queue: asyncio.Queue):
+        self._execution: _AsyncExecution = execution
+        self._queue: asyncio.Queue = queue
+        self._done_called: bool = False
+
+    async def then(self, element):
+        # If 'done' has been called already, error
+        if self._done_called:
+            raise ThenCalledAfterDone()
+
+        await self._execution.put(self._queue, element)
+
+    async def done(self):
+        # Only close the stream once
+        if self._done_called:
+            return
+
+        self._done_called = True
+
+        await self._execution.put(self._queue, _END_OF_STREAM)
+
+    def then_threadsafe(self, element):
+        self._execution.call_threadsafe(self.then, element)
+
+    def done_threadsafe(self):
+        self._execution.call_threadsafe(self.done)
+
+    def check_done_called(self):
+        """
+        Ensures the stage called 'done' once it finished.
+        """
+        if not self._done_called:
+            raise DoneNeverCalled()
+
+
+class _BufferedOutput:
+    """
+    Collects the elements output by a single call of a processor working on
+    several elements at once, until they can be passed on in order.
+    """
+    def __init__(self):
+        self._elements: List = []
+        self._done_called: bool = False
+
+    async def then(self, element):
+        # If 'done' has been called already, error
+        if self._done_called:
+            raise ThenCalledAfterDone()
+
+        self._elements.append(element)
+
+    async def done(self):
+        self._done_called = True
+
+    async def forward_to(self, output: _StageOutput):
+        """
+        Passes the collected elements (and any call to 'done') on to the stage's output.
+        """
+        for element in self._elements:
+            await output.then(element)
+
+        if self._done_called:
+            await output.done()
+
+
+def _discard_if_succeeded(tasks: Set[asyncio.Task]) -> Callable[[asyncio.Task], None]:
+    """
+    Creates a done-callback which removes a task from a set of tasks, unless it
+    failed (so that the failure can be raised by '_raise_first_failure').
+    """
+    def callback(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is None:
+            tasks.discard(task)
+
+    return callback
+
+
+def _raise_first_failure(tasks: Set[asyncio.Task]):
+    """
+    Raises the exception of any task in a set which has failed.
+    """
+    for task in tasks:
+        if task.done() and not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+
+class _AsyncIterableStreamSource(StreamSource[ElementType]):
+    """
+    Wraps an asynchronous iterable as a stream-source for an
+    asynchronous pipeline.
+    """
+    def __init__(self, iterable: AsyncIterable[ElementType]):
+        self._iterable: AsyncIterable[ElementType] = iterable
+
+    def produce(
+            self,
+            then: ThenFunction[ElementType],
+            done: DoneFunction
+    ):
+        raise NotImplementedError("Asynchronous iterables can only be produced asynchronously")
+
+    async def produce_async(self, then, done):
+        async for element in self._iterable:
+            await then(element)
+
+        await done()
+
+
+class _AsyncFunctionStreamSink(
+    RequiresNoFinalisation,
+    StreamSink[ElementType]
+):
+    """
+    A stream-sink that awaits a coroutine function for each element.
+    """
+    def __init__(self, function: AsyncThenFunction[ElementType]):
+        # The function to call
+        self._function: AsyncThenFunction[ElementType] = function
+
+    def consume_element(self, element: ElementType):
+        raise NotImplementedError("Coroutine functions can only be consumed asynchronously")
+
+    async def consume_element_async(self, element: ElementType):
+        await self._function(element)
@@ -1,5 +1,8 @@
-from typing import Iterable, Tuple, Optional
+import time
+from threading import Event
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional
 
+from .error import DoneNeverCalled, PipelineAborted
 from .util import *
 from ._StreamProcessor import StreamProcessor
 from ._StreamSink import StreamSink
@@ -25,6 +28,9 @@ class Pipeline:
         # The optional consumer of the stream
         self._sink: Optional[StreamSink] = sink
 
+        # The performance counters from the last profiled execution
+        self._profile: Optional[PipelineProfile] = None
+
     @property
     def has_source(self):
         """
@@ -65,9 +71,54 @@ class Pipeline:
             raise Exception("No sink")
         return self._sink
 
+    @property
+    def profile(self) -> Optional[PipelineProfile]:
+        """
+        The per-stage performance counters from the last execution of this
+        pipeline with profiling enabled, or None if it hasn't been profiled.
+        """
+        return self._profile
+
+    def iterate(self, source: Optional[Iterable] = None) -> Iterator:
+        """
+        Executes this pipeline's source and processors, lazily yielding the
+        elements that would be passed to the sink. The sink is not used.
+
+        Elements are pulled through the processors by a single loop rather
+        than pushed via nested calls, so the stack depth does not grow with
+        the number of processors, and execution is suspended between yielded
+        elements.
+
+        :param source:  The source to provide stream elements to the pipeline.
+                        Uses the fixed source if none given.
+        :return:        An iterator over the processed elements.
+        """
+        # Use the provided source iterable, or the fixed source if none given
+        if source is None:
+            source = self.source
+        else:
+            source = IterableStreamSource(source)
+
+        # Make sure all process state is reset
+        reset_all_process_state(source, *self.processors)
+
+        try:
+            yield from iterate_stream(source.iterate_elements(), self.processors)
+        finally:
+            # Tidy up all process state
+            reset_all_process_state(source, *self.processors)
+
     def process(self,
                 source: Optional[Iterable] = None,
-                sink: Optional[ThenFunction] = None):
+                sink: Optional[ThenFunction] = None,
+                checked: bool = True,
+                batch_size: int = 1,
+                profile: bool = False,
+                profile_memory: bool = False,
+                thread_boundaries: Iterable[int] = tuple(),
+                queue_size: int = 16,
+                journal: Optional[CheckpointJournal] = None,
+                resume: bool = False):
         """
         Executes this pipeline.
 
@@ -75,6 +126,37 @@ class Pipeline:
                         Uses the fixed source if none given.
         :param sink:    The sink to consume the stream elements.
                         Uses the fixed sink if none given.
+        :param checked: Whether to enforce the calling semantics of the 'then'/'done'
+                        functions on each stage. Disabling the checks removes the
+                        per-element overhead they incur, so is suitable for production
+                        runs of stages which are known to be well-behaved.
+        :param batch_size:
+                        The number of elements to gather into a batch for stages
+                        which implement batch-processing. Batching is disabled if 1.
+        :param profile: Whether to record the time spent in, and number of elements
+                        passing through, each stage. The results are available from
+                        the 'profile' property once execution completes.
+        :param profile_memory:
+                        Whether to also record the memory allocated and retained by
+                        each stage, and the largest objects held by the elements reaching
+                        the sink. Implies profiling. Tracing allocations slows execution
+                        considerably, so the times recorded are inflated.
+        :param thread_boundaries:
+                        The indices of the processors at which to split the pipeline
+                        into parts which execute concurrently on separate threads.
+                        A boundary at index i runs processor i onwards on a new thread,
+                        so 0 separates the source from the processors, and the number
+                        of processors separates the sink from them.
+        :param queue_size:
+                        The maximum number of elements waiting at each thread boundary.
+                        Upstream parts block when their downstream queue is full.
+        :param journal: A journal in which to record the source elements which have been
+                        completely processed. Elements are recorded as soon as they have
+                        been consumed if no stage requires finalisation, otherwise only
+                        once the execution completes.
+        :param resume:  Whether to resume an interrupted execution, skipping the source
+                        elements recorded in the journal and (if any were recorded)
+                        starting the sink in a mode which adds to its existing output.
         """
         # Use the provided sink function, or the fixed sink if none given
         if sink is None:
@@ -88,35 +170,168 @@ class Pipeline:
         else:
             source = IterableStreamSource(source)
 
+        # Release the resources derived from each element once the sink has consumed it
+        producer, processors, consumer = source, self.processors, ReleasingStreamSink(sink)
+
+        # Gather elements into batches for stages that process them
+        if batch_size > 1:
+            processors = tuple(
+                BatchingStreamProcessor(processor, batch_size) if processes_batches(processor)
+                else processor
+                for processor in processors
+            )
+            if consumes_batches(sink):
+                consumer = BatchingStreamSink(consumer, batch_size)
+
+        # Validate the thread boundaries
+        thread_boundaries = set(thread_boundaries)
+        for index in thread_boundaries:
+            if not 0 <= index <= len(processors):
+                raise ValueError(f"Thread boundary {index} is outside the pipeline (0-{len(processors)})")
+
+        # Record the source elements once the stream has finished with them
+        journaller = None
+        if journal is not None:
+            journaller = producer = JournallingStreamSource(
+                producer,
+                journal,
+                resume,
+                record_immediately=(
+                    len(thread_boundaries) == 0
+                    and not isinstance(consumer, BatchingStreamSink)
+                    and all(isinstance(stage, RequiresNoFinalisation) for stage in processors + (sink,))
+                )
+            )
+        elif resume:
+            raise ValueError("Can only resume an execution with a journal")
+
+        # Wrap each stage to record its performance counters
+        profile = profile or profile_memory
+        memory_tracker = MemoryTracker() if profile_memory else None
+        if profile:
+            producer = ProfilingStreamSource(producer, memory_tracker=memory_tracker)
+            processors = tuple(
+                ProfilingStreamProcessor(processor, memory_tracker=memory_tracker)
+                for processor in processors
+            )
+            consumer = ProfilingStreamSink(consumer, memory_tracker=memory_tracker)
+
+        # Select how to bind the 'then'/'done' functions to each stage
+        bind = enforce_calling_semantics if checked else bind_directly
+
         # Make sure all process state is reset
         reset_all_process_state(source, *self.processors, sink)
 
-        # Start the sink
-        sink.start()
+        # Read the elements completed by any interrupted execution
+        start_time = time.perf_counter()
+        if journal is not None:
+            journal.open(resume)
+        try:
+            # Start the sink, adding to its existing output only if the interrupted
+            # execution completed some elements (if elements are only recorded once
+            # the execution completes, the journal is empty and the output is re-written)
+            if resume and len(journal) > 0:
+                consumer.start_resumed()
+            else:
+                consumer.start()
+
+            # Start building the functional pipeline from the sink backwards
+            pipeline = consumer.consume_element, consumer.finish
+
+            # The boundaries between the parts executing on separate threads, in pipeline order
+            boundaries: List[ThreadBoundary] = []
+            abort = Event()
+
+            # Start and attach each processor in turn, splitting the pipeline at each boundary
+            for index in reversed(range(len(processors) + 1)):
+                if index < len(processors):
+                    processor = processors[index]
+                    processor.start()
+                    pipeline = bind(
+                        processor.process_element,
+                        processor.finish,
+                        then=pipeline[0],
+                        done=pipeline[1]
+                    )
 
-        # Start building the functional pipeline from the sink backwards
-        pipeline = sink.consume_element, sink.finish
+                if index in thread_boundaries:
+                    boundary = ThreadBoundary(
+                        *pipeline,
+                        queue_size,
+                        abort,
+                        boundaries[0] if len(boundaries) > 0 else None
+                    )
+                    boundaries.insert(0, boundary)
+                    pipeline = boundary.then, boundary.done
 
-        # Start and attach each processor in turn
-        for processor in reversed(self.processors):
-            processor.start()
-            pipeline = enforce_calling_semantics(
-                processor.process_element,
-                processor.finish,
+            # Attach the source
+            pipeline = bind(
+                producer.produce,
                 then=pipeline[0],
                 done=pipeline[1]
             )
 
-        # Attach the source
-        pipeline = enforce_calling_semantics(
-            source.produce,
-            then=pipeline[0],
-            done=pipeline[1]
-        )
+            # Execute the pipeline
+            if memory_tracker is not None:
+                memory_tracker.start()
+            if len(boundaries) == 0:
+                pipeline[0]()
+            else:
+                self._execute_pipelined(pipeline[0], boundaries, abort)
 
-        # Execute the pipeline
-        try:
-            pipeline[0]()
+            # The execution completed, so all source elements have been processed
+            if journaller is not None:
+                journaller.commit()
         finally:
+            if journal is not None:
+                journal.close()
+
+            # Collect the performance counters
+            if profile:
+                self._profile = PipelineProfile(
+                    [producer.profile] + [processor.profile for processor in processors] + [consumer.profile],
+                    time.perf_counter() - start_time,
+                    memory_tracker.stop() if memory_tracker is not None else None
+                )
+
             # Tidy up all process state
             reset_all_process_state(source, *self.processors, sink)
+
+    @staticmethod
+    def _execute_pipelined(execute: Callable[[], None], boundaries: List[ThreadBoundary], abort: Event):
+        """
+        Executes a pipeline which has been split into parts on separate
+        threads, waiting for all parts to complete.
+
+        :param execute:     Executes the first part of the pipeline.
+        :param boundaries:  The boundaries between the parts, in pipeline order.
+        :param abort:       The event which aborts the execution.
+        """
+        # Start the threads of the downstream parts
+        for boundary in boundaries:
+            boundary.start()
+
+        # Execute the first part on this thread
+        errors: List[BaseException] = []
+        try:
+            execute()
+
+            # Executing the first part must close the stream to the first boundary
+            if not boundaries[0].done_called:
+                raise DoneNeverCalled()
+        except BaseException as e:
+            errors.append(e)
+            abort.set()
+
+        # Wait for the downstream parts to complete
+        for boundary in boundaries:
+            error = boundary.join()
+            if error is not None:
+                errors.append(error)
+
+        # Raise the originating error, rather than those caused by aborting
+        for error in errors:
+            if not isinstance(error, PipelineAborted):
+                raise error
+        if len(errors) > 0:
+            raise errors[0]
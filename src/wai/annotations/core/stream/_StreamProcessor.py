@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, TypeVar, List
 
 from ._typing import ThenFunction, DoneFunction
 
@@ -37,6 +37,26 @@ class StreamProcessor(Generic[InputElementType, OutputElementType]):
         """
         raise NotImplementedError(self.process_element.__qualname__)
 
+    def process_batch(
+            self,
+            elements: List[InputElementType],
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        """
+        Processes a batch of consecutive elements in the stream. Processors
+        which can process many elements more efficiently than one at a time
+        should override this method. By default, processes each element in turn.
+
+        :param elements:    The elements to process, in stream order.
+        :param then:        A function to call to forward processed elements
+                            further into the stream.
+        :param done:        Should be called when no more processed elements will
+                            be produced.
+        """
+        for element in elements:
+            self.process_element(element, then, done)
+
     @abstractmethod
     def finish(
             self,
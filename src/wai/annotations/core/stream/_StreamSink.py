@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Generic
+from typing import Generic, List
 
 from ._typing import ElementType
 
@@ -14,6 +14,15 @@ class StreamSink(Generic[ElementType]):
         """
         pass
 
+    def start_resumed(self):
+        """
+        Performs any setup required before resuming the consumption of a
+        stream which was interrupted part-way through. Sinks which can add
+        to the output they have already written (e.g. by opening files in
+        append mode) should override this. By default, starts as normal.
+        """
+        self.start()
+
     @abstractmethod
     def consume_element(self, element: ElementType):
         """
@@ -23,6 +32,17 @@ class StreamSink(Generic[ElementType]):
         """
         raise NotImplementedError(self.consume_element.__qualname__)
 
+    def consume_batch(self, elements: List[ElementType]):
+        """
+        Consumes a batch of consecutive elements from a stream. Sinks which
+        can consume many elements more efficiently than one at a time should
+        override this method. By default, consumes each element in turn.
+
+        :param elements:    The elements to consume, in stream order.
+        """
+        for element in elements:
+            self.consume_element(element)
+
     @abstractmethod
     def finish(self):
         """
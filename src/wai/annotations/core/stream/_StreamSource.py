@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Generic
+from typing import Generic, Iterator, List
 
 from ._typing import ThenFunction, DoneFunction, ElementType
 
@@ -22,3 +22,20 @@ class StreamSource(Generic[ElementType]):
         :param done:    A function which closes the stream when called.
         """
         raise NotImplementedError(self.produce.__qualname__)
+
+    def iterate_elements(self) -> Iterator[ElementType]:
+        """
+        Produces the elements of the stream as an iterator, for pulling
+        elements through the stream rather than having them pushed.
+
+        The default implementation runs 'produce' to completion and iterates
+        over the elements it produced, so sources which can produce elements
+        incrementally should override this method.
+
+        :return:    An iterator over the produced elements.
+        """
+        elements: List[ElementType] = []
+
+        self.produce(elements.append, lambda: None)
+
+        return iter(elements)
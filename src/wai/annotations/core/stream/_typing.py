@@ -1,4 +1,4 @@
-from typing import TypeVar, Callable
+from typing import TypeVar, Callable, Awaitable
 
 # A generic type of element in a stream
 ElementType = TypeVar("ElementType")
@@ -8,3 +8,7 @@ ThenFunction = Callable[[ElementType], None]
 
 # The type of the function that ends a stage of the pipeline
 DoneFunction = Callable[[], None]
+
+# The types of the 'then'/'done' functions passed to asynchronous stage methods
+AsyncThenFunction = Callable[[ElementType], Awaitable[None]]
+AsyncDoneFunction = Callable[[], Awaitable[None]]
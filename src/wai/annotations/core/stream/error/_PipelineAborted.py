@@ -0,0 +1,7 @@
+class PipelineAborted(Exception):
+    """
+    Error raised in the threads of a pipelined execution when another
+    thread of the execution has failed.
+    """
+    def __init__(self):
+        super().__init__("The pipeline was aborted due to an error in another thread")
@@ -0,0 +1,9 @@
+class ProcessorNotParallelisable(Exception):
+    """
+    Error for when an attempt is made to run a stream-processor with
+    multiple workers, but the processor can't safely be run in parallel.
+    """
+    def __init__(self, processor, reason: str):
+        super().__init__(
+            f"Processor '{type(processor).__name__}' cannot be run with multiple workers: {reason}"
+        )
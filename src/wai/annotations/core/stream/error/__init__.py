@@ -3,4 +3,6 @@ Package for errors occuring in creating/using stream-components.
 """
 from ._CallingSemanticsError import CallingSemanticsError
 from ._DoneNeverCalled import DoneNeverCalled
+from ._PipelineAborted import PipelineAborted
+from ._ProcessorNotParallelisable import ProcessorNotParallelisable
 from ._ThenCalledAfterDone import ThenCalledAfterDone
@@ -0,0 +1,187 @@
+import json
+import os
+from typing import List, Optional, Set, TextIO
+
+from .._StreamSource import StreamSource
+from .._typing import ThenFunction, DoneFunction, ElementType
+
+
+class CheckpointJournal:
+    """
+    A record of which source elements have been completely processed by a
+    pipeline, so that an interrupted execution can be resumed. Elements are
+    recorded one per line as JSON, so must be JSON-serialisable.
+    """
+    def __init__(self, filename: str):
+        # The file the journal is kept in
+        self._filename: str = filename
+
+        # The keys of the elements which have been recorded
+        self._completed: Set[str] = set()
+
+        # The number of elements skipped as already completed
+        self.skipped: int = 0
+
+        # The journal file, while open
+        self._file: Optional[TextIO] = None
+
+    @property
+    def filename(self) -> str:
+        """
+        The file the journal is kept in.
+        """
+        return self._filename
+
+    def __contains__(self, element) -> bool:
+        return self._key(element) in self._completed
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+    def open(self, resume: bool):
+        """
+        Opens the journal for recording.
+
+        :param resume:  Whether to keep the elements recorded by a previous
+                        execution, or start a fresh journal.
+        """
+        self._completed = set()
+        self.skipped = 0
+
+        # Whether the last line of the existing journal is incomplete
+        partial_line = False
+
+        if resume and os.path.exists(self._filename):
+            with open(self._filename, "r") as file:
+                for line in file:
+                    partial_line = not line.endswith("\n")
+
+                    # Skip a final line which was only partially written
+                    if partial_line and not _is_json(line):
+                        continue
+
+                    line = line.strip()
+                    if line == "":
+                        continue
+
+                    self._completed.add(line)
+
+        self._file = open(self._filename, "a" if resume else "w")
+
+        # Terminate any partially-written line so new records start on their own line
+        if partial_line:
+            self._file.write("\n")
+
+    def record(self, element):
+        """
+        Records an element as completely processed.
+
+        :param element:     The source element.
+        """
+        key = self._key(element)
+
+        if key in self._completed:
+            return
+
+        self._completed.add(key)
+        self._file.write(f"{key}\n")
+        self._file.flush()
+
+    def close(self):
+        """
+        Closes the journal.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def _key(element) -> str:
+        """
+        Gets the key to record an element by.
+        """
+        try:
+            return json.dumps(element)
+        except TypeError as e:
+            raise Exception(
+                f"Can't journal source elements of type {type(element).__name__} "
+                f"(must be JSON-serialisable)"
+            ) from e
+
+
+def _is_json(line: str) -> bool:
+    """
+    Whether a line of the journal is valid JSON.
+    """
+    try:
+        json.loads(line)
+        return True
+    except ValueError:
+        return False
+
+
+class JournallingStreamSource(StreamSource[ElementType]):
+    """
+    Wraps a stream-source, recording each element in a checkpoint journal
+    once the stream has finished with it, and optionally skipping the
+    elements already recorded.
+    """
+    def __init__(
+            self,
+            source: StreamSource[ElementType],
+            journal: CheckpointJournal,
+            resume: bool,
+            record_immediately: bool
+    ):
+        self._source: StreamSource[ElementType] = source
+        self._journal: CheckpointJournal = journal
+
+        # Whether to skip elements already in the journal
+        self._resume: bool = resume
+
+        # Whether each element is completely processed by the time 'then'
+        # returns, or if the elements should only be recorded once the
+        # execution completes
+        self._record_immediately: bool = record_immediately
+
+        # The elements produced, but not yet recorded
+        self._pending: List[ElementType] = []
+
+    @property
+    def source(self) -> StreamSource[ElementType]:
+        """
+        The source being journalled.
+        """
+        return self._source
+
+    def produce(
+            self,
+            then: ThenFunction[ElementType],
+            done: DoneFunction
+    ):
+        journal = self._journal
+        pending = self._pending
+
+        def journalled_then(element: ElementType):
+            # Skip elements which were completed by an earlier execution
+            if self._resume and element in journal:
+                journal.skipped += 1
+                return
+
+            then(element)
+
+            if self._record_immediately:
+                journal.record(element)
+            else:
+                pending.append(element)
+
+        self._source.produce(journalled_then, done)
+
+    def commit(self):
+        """
+        Records all pending elements, once the execution has completed.
+        """
+        for element in self._pending:
+            self._journal.record(element)
+
+        self._pending = []
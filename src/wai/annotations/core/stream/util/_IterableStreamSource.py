@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from .._StreamSource import StreamSource
 from .._typing import ThenFunction, DoneFunction, ElementType
@@ -22,3 +22,6 @@ class IterableStreamSource(StreamSource[ElementType]):
 
         # Signal that we are done
         done()
+
+    def iterate_elements(self) -> Iterator[ElementType]:
+        return iter(self._iterable)
@@ -0,0 +1,225 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Deque, List, Optional, Tuple
+
+from ..error import ProcessorNotParallelisable
+from .._StreamProcessor import StreamProcessor, InputElementType, OutputElementType
+from .._typing import ThenFunction, DoneFunction
+from ._is_stateless import is_stateless
+
+# The types of worker pools that can be used
+THREAD_WORKERS: str = "thread"
+PROCESS_WORKERS: str = "process"
+WORKER_TYPES: Tuple[str, ...] = (THREAD_WORKERS, PROCESS_WORKERS)
+
+# The processor installed in a worker process
+_worker_processor: Optional[StreamProcessor] = None
+
+
+def _initialise_worker_process(processor: StreamProcessor):
+    """
+    Installs the processor in a worker process, so it doesn't have to be
+    sent along with each element.
+
+    :param processor:   The processor to install.
+    """
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _process_in_worker_process(element) -> Tuple[List, bool]:
+    """
+    Processes a single element with the processor installed in this
+    worker process.
+
+    :param element:     The element to process.
+    :return:            The output elements, and whether 'done' was called.
+    """
+    return _process_with(_worker_processor, element)
+
+
+def _process_with(processor: StreamProcessor, element) -> Tuple[List, bool]:
+    """
+    Processes a single element, collecting the elements the processor
+    forwards instead of passing them on directly.
+
+    :param processor:   The processor to process the element with.
+    :param element:     The element to process.
+    :return:            The output elements, and whether 'done' was called.
+    """
+    outputs = []
+    done_called = False
+
+    def done():
+        nonlocal done_called
+        done_called = True
+
+    processor.process_element(element, outputs.append, done)
+
+    return outputs, done_called
+
+
+class ParallelStreamProcessor(StreamProcessor[InputElementType, OutputElementType]):
+    """
+    Wraps a stateless stream-processor so that elements are processed by a
+    pool of worker threads or processes. In ordered mode, the output elements
+    are forwarded in the order their inputs were received, otherwise they are
+    forwarded as soon as they become available.
+    """
+    def __init__(
+            self,
+            processor: StreamProcessor[InputElementType, OutputElementType],
+            workers: int,
+            worker_type: str = THREAD_WORKERS,
+            ordered: bool = True,
+            max_in_flight: Optional[int] = None
+    ):
+        # Make sure the processor can safely process elements independently
+        if not is_stateless(processor):
+            raise ProcessorNotParallelisable(
+                processor,
+                "only processors which require no finalisation and hold no process-state "
+                "can be run in parallel"
+            )
+
+        if workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {workers}")
+
+        if worker_type not in WORKER_TYPES:
+            raise ValueError(f"Unknown worker type '{worker_type}', expected one of: {', '.join(WORKER_TYPES)}")
+
+        # The processor to run in parallel
+        self._processor: StreamProcessor[InputElementType, OutputElementType] = processor
+
+        # The number of workers to run the processor on
+        self._workers: int = workers
+
+        # Whether to use threads or processes
+        self._worker_type: str = worker_type
+
+        # Whether outputs must be forwarded in input order
+        self._ordered: bool = ordered
+
+        # The maximum number of elements to have in the pool at once
+        self._max_in_flight: int = max_in_flight if max_in_flight is not None else 2 * workers
+
+        # The pool of workers (only exists while processing a stream)
+        self._executor: Optional[Executor] = None
+
+        # The elements currently being processed, in order of submission
+        self._pending: Deque[Future] = deque()
+
+        # Whether the wrapped processor has signalled it is done
+        self._processor_done: bool = False
+
+    @property
+    def processor(self) -> StreamProcessor[InputElementType, OutputElementType]:
+        """
+        The processor being run in parallel.
+        """
+        return self._processor
+
+    def start(self):
+        self._processor.start()
+        self._pending = deque()
+        self._processor_done = False
+        self._executor = (
+            ProcessPoolExecutor(
+                self._workers,
+                initializer=_initialise_worker_process,
+                initargs=(self._processor,)
+            )
+            if self._worker_type == PROCESS_WORKERS else
+            ThreadPoolExecutor(self._workers)
+        )
+
+    def process_element(
+            self,
+            element: InputElementType,
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        # Once the wrapped processor is done, no more elements are accepted
+        if self._processor_done:
+            return
+
+        # Submit the element to the pool
+        self._pending.append(
+            self._executor.submit(_process_in_worker_process, element)
+            if self._worker_type == PROCESS_WORKERS else
+            self._executor.submit(_process_with, self._processor, element)
+        )
+
+        # Forward any results which are ready, blocking if too many are in flight
+        self._forward_results(then, done, block=len(self._pending) >= self._max_in_flight)
+
+    def finish(
+            self,
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        try:
+            # Forward all remaining results
+            while len(self._pending) > 0 and not self._processor_done:
+                self._forward_results(then, done, block=True)
+
+            # Let the wrapped processor finalise the stream
+            if not self._processor_done:
+                self._processor.finish(then, done)
+        finally:
+            self._shutdown()
+
+    def _forward_results(self, then: ThenFunction[OutputElementType], done: DoneFunction, block: bool):
+        """
+        Forwards the outputs of completed elements into the stream.
+
+        :param then:    The function to forward output elements with.
+        :param done:    The function to call if the wrapped processor signals it is done.
+        :param block:   Whether to wait for at least one element to complete.
+        """
+        # Get the futures whose results can be forwarded
+        if self._ordered:
+            if block:
+                self._pending[0].result()
+            completed = []
+            while len(self._pending) > 0 and self._pending[0].done():
+                completed.append(self._pending.popleft())
+        else:
+            if block:
+                wait(self._pending, return_when=FIRST_COMPLETED)
+            completed = [future for future in self._pending if future.done()]
+            for future in completed:
+                self._pending.remove(future)
+
+        # Forward the outputs for each completed element
+        for future in completed:
+            outputs, done_called = future.result()
+
+            for output in outputs:
+                then(output)
+
+            # If the wrapped processor is done, discard any outstanding work
+            if done_called:
+                self._processor_done = True
+                self._cancel_pending()
+                done()
+                return
+
+    def _cancel_pending(self):
+        """
+        Cancels any elements which have not yet been processed.
+        """
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+    def _shutdown(self):
+        """
+        Shuts down the pool of workers.
+        """
+        if self._executor is None:
+            return
+
+        self._cancel_pending()
+        self._executor.shutdown(wait=True)
+        self._executor = None
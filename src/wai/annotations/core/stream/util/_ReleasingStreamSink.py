@@ -0,0 +1,53 @@
+from typing import List
+
+from .._StreamSink import StreamSink
+from .._typing import ElementType
+
+
+class ReleasingStreamSink(StreamSink[ElementType]):
+    """
+    Wraps a stream-sink, releasing any resources derived from each element
+    (e.g. decoded images) as soon as the sink has consumed it, rather than
+    waiting for the element to be garbage-collected. Elements which the sink
+    holds on to are unaffected, other than having to recreate any released
+    resources if they are used again.
+    """
+    def __init__(self, sink: StreamSink[ElementType]):
+        # The sink consuming the elements
+        self._sink: StreamSink[ElementType] = sink
+
+    @property
+    def sink(self) -> StreamSink[ElementType]:
+        """
+        The sink consuming the elements.
+        """
+        return self._sink
+
+    def start(self):
+        self._sink.start()
+
+    def start_resumed(self):
+        self._sink.start_resumed()
+
+    def consume_element(self, element: ElementType):
+        self._sink.consume_element(element)
+        release(element)
+
+    def consume_batch(self, elements: List[ElementType]):
+        self._sink.consume_batch(elements)
+        for element in elements:
+            release(element)
+
+    def finish(self):
+        self._sink.finish()
+
+
+def release(element):
+    """
+    Releases the resources derived from an element, if it supports it.
+
+    :param element:     The stream element.
+    """
+    release_function = getattr(element, "release", None)
+    if callable(release_function):
+        release_function()
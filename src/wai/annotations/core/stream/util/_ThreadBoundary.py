@@ -0,0 +1,137 @@
+from queue import Queue, Full, Empty
+from threading import Event, Thread
+from typing import Optional
+
+from ..error import DoneNeverCalled, PipelineAborted
+from .._typing import ThenFunction, DoneFunction
+
+# Marker placed in the queue once the upstream part of the pipeline is done
+_END_OF_STREAM = object()
+
+# How often, in seconds, blocked threads check whether the execution has been aborted
+_POLL_INTERVAL = 0.1
+
+
+class ThreadBoundary:
+    """
+    Joins two parts of a pipeline which execute on separate threads.
+    Elements passed to 'then' by the upstream part are placed in a bounded
+    queue, and forwarded to the downstream part on the boundary's own thread.
+    When the queue is full, the upstream part blocks until there is room.
+    """
+    def __init__(
+            self,
+            then: ThenFunction,
+            done: DoneFunction,
+            queue_size: int,
+            abort: Event,
+            next_boundary: Optional['ThreadBoundary'] = None
+    ):
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be at least 1, got {queue_size}")
+
+        # The functions of the downstream part of the pipeline
+        self._downstream_then: ThenFunction = then
+        self._downstream_done: DoneFunction = done
+
+        # The elements waiting to be passed downstream
+        self._queue: Queue = Queue(queue_size)
+
+        # Set when any thread of the execution fails
+        self._abort: Event = abort
+
+        # The boundary at the end of the downstream part, if any
+        self._next_boundary: Optional[ThreadBoundary] = next_boundary
+
+        # The thread executing the downstream part
+        self._thread: Thread = Thread(target=self._run, daemon=True)
+
+        # Whether the upstream part has called 'done'
+        self._done_called: bool = False
+
+        # The error raised by the downstream part, if any
+        self._error: Optional[BaseException] = None
+
+    @property
+    def done_called(self) -> bool:
+        """
+        Whether the upstream part of the pipeline has called 'done'.
+        """
+        return self._done_called
+
+    def start(self):
+        """
+        Starts the thread executing the downstream part of the pipeline.
+        """
+        self._thread.start()
+
+    def join(self) -> Optional[BaseException]:
+        """
+        Waits for the downstream part of the pipeline to complete.
+
+        :return:    The error raised by the downstream part, if any.
+        """
+        self._thread.join()
+        return self._error
+
+    def then(self, element):
+        self._put(element)
+
+    def done(self):
+        # Only close the stream once
+        if self._done_called:
+            return
+
+        self._done_called = True
+
+        self._put(_END_OF_STREAM)
+
+    def _run(self):
+        """
+        Forwards queued elements to the downstream part of the pipeline.
+        """
+        try:
+            while True:
+                element = self._get()
+
+                if element is _END_OF_STREAM:
+                    break
+
+                self._downstream_then(element)
+
+            self._downstream_done()
+
+            # Closing the downstream part must close the stream to the next boundary
+            if self._next_boundary is not None and not self._next_boundary.done_called:
+                raise DoneNeverCalled()
+
+        except BaseException as e:
+            self._error = e
+            self._abort.set()
+
+    def _put(self, element):
+        """
+        Places an element in the queue, waiting for room if necessary.
+        """
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+
+            try:
+                self._queue.put(element, timeout=_POLL_INTERVAL)
+                return
+            except Full:
+                pass
+
+    def _get(self):
+        """
+        Takes the next element from the queue, waiting for one if necessary.
+        """
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+
+            try:
+                return self._queue.get(timeout=_POLL_INTERVAL)
+            except Empty:
+                pass
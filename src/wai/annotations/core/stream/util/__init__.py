@@ -1,9 +1,22 @@
 """
 Utilities for working with streams/pipelines.
 """
+from ._batching import processes_batches, consumes_batches, BatchingStreamProcessor, BatchingStreamSink
+from ._bind_directly import bind_directly
+from ._CheckpointJournal import CheckpointJournal, JournallingStreamSource
 from ._enforce_calling_semantics import enforce_calling_semantics
 from ._FunctionStreamSink import FunctionStreamSink
+from ._is_stateless import has_process_state, is_stateless
+from ._iterate_stream import iterate_stream
 from ._IterableStreamSource import IterableStreamSource
+from ._memory_profiling import MemoryTracker, MemoryReport, LargeObject
+from ._ParallelStreamProcessor import ParallelStreamProcessor, WORKER_TYPES, THREAD_WORKERS, PROCESS_WORKERS
 from ._ProcessState import ProcessState
+from ._profiling import (
+    StageProfile, PipelineProfile, ProfilingStreamSource, ProfilingStreamProcessor, ProfilingStreamSink,
+    get_stage_name, SOURCE_STAGE, PROCESSOR_STAGE, SINK_STAGE
+)
+from ._ReleasingStreamSink import ReleasingStreamSink
 from ._RequiresNoFinalisation import RequiresNoFinalisation
+from ._ThreadBoundary import ThreadBoundary
 from ._reset_process_state import reset_process_state, reset_all_process_state
@@ -0,0 +1,142 @@
+from typing import List
+
+from .._StreamProcessor import StreamProcessor, InputElementType, OutputElementType
+from .._StreamSink import StreamSink
+from .._typing import ThenFunction, DoneFunction, ElementType
+
+
+def processes_batches(processor: StreamProcessor) -> bool:
+    """
+    Whether the given processor provides its own implementation of
+    batch-processing.
+
+    :param processor:   The stream processor.
+    :return:            True if the processor overrides 'process_batch'.
+    """
+    return type(processor).process_batch is not StreamProcessor.process_batch
+
+
+def consumes_batches(sink: StreamSink) -> bool:
+    """
+    Whether the given sink provides its own implementation of
+    batch-consumption.
+
+    :param sink:    The stream sink.
+    :return:        True if the sink overrides 'consume_batch'.
+    """
+    return type(sink).consume_batch is not StreamSink.consume_batch
+
+
+class BatchingStreamProcessor(StreamProcessor[InputElementType, OutputElementType]):
+    """
+    Wraps a stream-processor, gathering the elements of the stream into
+    batches which are passed to the processor's 'process_batch' method.
+    """
+    def __init__(self, processor: StreamProcessor[InputElementType, OutputElementType], batch_size: int):
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+
+        # The processor to pass batches to
+        self._processor: StreamProcessor[InputElementType, OutputElementType] = processor
+
+        # The maximum number of elements in a batch
+        self._batch_size: int = batch_size
+
+        # The batch currently being gathered
+        self._batch: List[InputElementType] = []
+
+    @property
+    def processor(self) -> StreamProcessor[InputElementType, OutputElementType]:
+        """
+        The processor being passed batches.
+        """
+        return self._processor
+
+    def start(self):
+        self._processor.start()
+        self._batch = []
+
+    def process_element(
+            self,
+            element: InputElementType,
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        self._batch.append(element)
+
+        if len(self._batch) >= self._batch_size:
+            self._process_batch(then, done)
+
+    def finish(
+            self,
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        # Process the final, partial batch
+        self._process_batch(then, done)
+
+        self._processor.finish(then, done)
+
+    def _process_batch(self, then: ThenFunction[OutputElementType], done: DoneFunction):
+        """
+        Passes the gathered batch to the processor.
+        """
+        batch, self._batch = self._batch, []
+
+        if len(batch) > 0:
+            self._processor.process_batch(batch, then, done)
+
+
+class BatchingStreamSink(StreamSink[ElementType]):
+    """
+    Wraps a stream-sink, gathering the elements of the stream into
+    batches which are passed to the sink's 'consume_batch' method.
+    """
+    def __init__(self, sink: StreamSink[ElementType], batch_size: int):
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {batch_size}")
+
+        # The sink to pass batches to
+        self._sink: StreamSink[ElementType] = sink
+
+        # The maximum number of elements in a batch
+        self._batch_size: int = batch_size
+
+        # The batch currently being gathered
+        self._batch: List[ElementType] = []
+
+    @property
+    def sink(self) -> StreamSink[ElementType]:
+        """
+        The sink being passed batches.
+        """
+        return self._sink
+
+    def start(self):
+        self._sink.start()
+        self._batch = []
+
+    def start_resumed(self):
+        self._sink.start_resumed()
+        self._batch = []
+
+    def consume_element(self, element: ElementType):
+        self._batch.append(element)
+
+        if len(self._batch) >= self._batch_size:
+            self._consume_batch()
+
+    def finish(self):
+        # Consume the final, partial batch
+        self._consume_batch()
+
+        self._sink.finish()
+
+    def _consume_batch(self):
+        """
+        Passes the gathered batch to the sink.
+        """
+        batch, self._batch = self._batch, []
+
+        if len(batch) > 0:
+            self._sink.consume_batch(batch)
@@ -0,0 +1,49 @@
+from functools import partial
+from typing import Tuple, Callable
+
+from .._typing import ThenFunction, DoneFunction
+
+
+def bind_directly(
+        *funcs: Callable,
+        then: ThenFunction,
+        done: DoneFunction
+) -> Tuple[Callable, ...]:
+    """
+    Creates versions of the given functions that have the given 'then' and
+    'done' functions bound to their arguments, without enforcing the calling
+    semantics. The bindings are made once, so calling a bound function costs
+    no more than calling the function itself. Only the idempotency of 'done'
+    is preserved, as components rely on it.
+
+    :param funcs:   The functions that will be calling the 'then' and 'done' functions.
+    :param then:    The 'then' function.
+    :param done:    The 'done' function.
+    :return:        The bound functions.
+    """
+    # Make sure at least one function was provided
+    if len(funcs) == 0:
+        raise Exception("No funcs provided")
+
+    # Create a closure to track if 'done' has been called
+    done_called: bool = False
+
+    # Define a 'done' function which is idempotent
+    def idempotent_done():
+        # We're assigning to the closure, so need to specify the non-local identifier
+        nonlocal done_called
+
+        # If 'done' was already called, short-circuit
+        if done_called:
+            return
+
+        # Call the actual 'done' function
+        done()
+
+        # 'done' has now been called
+        done_called = True
+
+    return tuple(
+        partial(func, then=then, done=idempotent_done)
+        for func in funcs
+    )
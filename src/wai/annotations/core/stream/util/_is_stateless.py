@@ -0,0 +1,30 @@
+from ._ProcessState import ProcessState
+from ._RequiresNoFinalisation import RequiresNoFinalisation
+
+
+def has_process_state(stream_element) -> bool:
+    """
+    Whether the given stream element declares any process-state.
+
+    :param stream_element:  The stream element to check.
+    :return:                True if any ProcessState descriptors are found.
+    """
+    # Get the class of the element
+    element_type = type(stream_element)
+
+    return any(
+        isinstance(getattr(element_type, attr_name, None), ProcessState)
+        for attr_name in dir(element_type)
+    )
+
+
+def is_stateless(stream_element) -> bool:
+    """
+    Whether the given stream element can be considered stateless, i.e. each
+    element it is given can be processed independently of any other. This is
+    the case for elements which require no finalisation and hold no process-state.
+
+    :param stream_element:  The stream element to check.
+    :return:                Whether the element is stateless.
+    """
+    return isinstance(stream_element, RequiresNoFinalisation) and not has_process_state(stream_element)
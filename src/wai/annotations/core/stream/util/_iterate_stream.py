@@ -0,0 +1,115 @@
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Sequence, Tuple
+
+from ..error import DoneNeverCalled, ThenCalledAfterDone
+from .._StreamProcessor import StreamProcessor
+from .._typing import ThenFunction, DoneFunction
+
+
+def iterate_stream(elements: Iterator, processors: Sequence[StreamProcessor]) -> Iterator:
+    """
+    Pulls elements through a sequence of stream-processors, yielding the
+    elements output by the last processor as they become available.
+
+    Rather than each processor calling the next from within its 'then'
+    function, outputs are queued between the processors and a single loop
+    decides which processor to run next, so the stack depth is independent
+    of the number of processors. The furthest-downstream processor with
+    queued input is always run first, so each element is taken as far through
+    the stream as possible before the next is pulled from the source.
+
+    :param elements:    The source elements.
+    :param processors:  The processors to apply, in order.
+    :return:            An iterator over the processed elements.
+    """
+    # Degenerate case: nothing to process
+    if len(processors) == 0:
+        yield from elements
+        return
+
+    num_processors = len(processors)
+
+    # The elements waiting to be processed by each processor, with the
+    # last queue holding the elements output by the final processor
+    queues: List[Deque] = [deque() for _ in range(num_processors + 1)]
+
+    # Which processors have called 'done', and which have been finished
+    done_called: List[bool] = [False] * num_processors
+    finished: List[bool] = [False] * num_processors
+
+    # Whether the source has been exhausted
+    source_exhausted = False
+
+    # Create the 'then'/'done' functions for each processor
+    functions: List[Tuple[ThenFunction, DoneFunction]] = [
+        _stage_functions(index, queues[index + 1], done_called)
+        for index in range(num_processors)
+    ]
+
+    # Start all processors
+    for processor in processors:
+        processor.start()
+
+    while True:
+        # Yield any completely-processed elements
+        output_queue = queues[num_processors]
+        while len(output_queue) > 0:
+            yield output_queue.popleft()
+
+        # Process the next element for the furthest-downstream processor with input
+        for index in range(num_processors - 1, -1, -1):
+            if len(queues[index]) > 0:
+                then, done = functions[index]
+                processors[index].process_element(queues[index].popleft(), then, done)
+                break
+
+        else:
+            # All queues are empty, so pull the next element from the source
+            if not source_exhausted:
+                for element in elements:
+                    queues[0].append(element)
+                    break
+                else:
+                    source_exhausted = True
+                continue
+
+            # Source is exhausted, so finish the first unfinished processor (all
+            # processors before it have called 'done', so its input has ended)
+            for index in range(num_processors):
+                if not finished[index]:
+                    finished[index] = True
+                    then, done = functions[index]
+                    processors[index].finish(then, done)
+                    if not done_called[index]:
+                        raise DoneNeverCalled()
+                    break
+            else:
+                # All processors have finished
+                while len(output_queue) > 0:
+                    yield output_queue.popleft()
+                return
+
+
+def _stage_functions(index: int, output_queue: Deque, done_called: List[bool]) -> Tuple[ThenFunction, DoneFunction]:
+    """
+    Creates the 'then' and 'done' functions for a processor in a
+    pulled stream.
+
+    :param index:           The index of the processor in the stream.
+    :param output_queue:    The queue to place the processor's outputs into.
+    :param done_called:     The table of which processors have called 'done'.
+    :return:                The 'then' and 'done' functions.
+    """
+    append: Callable = output_queue.append
+
+    def then(element):
+        # If 'done' has been called already, error
+        if done_called[index]:
+            raise ThenCalledAfterDone()
+
+        append(element)
+
+    def done():
+        done_called[index] = True
+
+    return then, done
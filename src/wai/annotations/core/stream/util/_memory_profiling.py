@@ -0,0 +1,365 @@
+import heapq
+import os
+import threading
+import tracemalloc
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# The number of frames of each allocation's traceback to record
+_TRACEBACK_FRAMES = 1
+
+# How deep into an element's attributes to look for large buffers
+_INSPECTION_DEPTH = 4
+
+
+class LargeObject:
+    """
+    A large buffer (bytes, or an array) held by an element of the stream.
+    """
+    def __init__(self, size: int, path: str, type_name: str, element: str):
+        # The size of the buffer, in bytes
+        self.size: int = size
+
+        # The attribute path from the element to the buffer, e.g. 'element.data._data'
+        self.path: str = path
+
+        # A description of the buffer's type
+        self.type_name: str = type_name
+
+        # A description of the element holding the buffer
+        self.element: str = element
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "path": self.path,
+            "type": self.type_name,
+            "element": self.element
+        }
+
+
+class MemoryReport:
+    """
+    The overall memory usage of an execution of a pipeline.
+    """
+    def __init__(
+            self,
+            peak_traced: int,
+            peak_rss: Optional[int],
+            allocation_sites: List[Tuple[str, int, int]],
+            largest_objects: List[LargeObject],
+            buffer_totals: Dict[str, Tuple[int, int, int]]
+    ):
+        # The peak memory allocated by Python while the pipeline was executing, in bytes
+        self.peak_traced: int = peak_traced
+
+        # The peak resident set size of the process, in bytes, if it could be measured
+        self.peak_rss: Optional[int] = peak_rss
+
+        # The locations which allocated the most memory still live at the
+        # end of the execution, as (location, size, number of blocks)
+        self.allocation_sites: List[Tuple[str, int, int]] = allocation_sites
+
+        # The largest buffers held by the elements reaching the sink
+        self.largest_objects: List[LargeObject] = largest_objects
+
+        # The buffers held by the elements reaching the sink, by attribute
+        # path, as (number of buffers, total size, largest size)
+        self.buffer_totals: Dict[str, Tuple[int, int, int]] = buffer_totals
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "peak_traced": self.peak_traced,
+            "peak_rss": self.peak_rss,
+            "allocation_sites": [
+                {"location": location, "size": size, "count": blocks}
+                for location, size, blocks in self.allocation_sites
+            ],
+            "largest_objects": [large_object.to_json() for large_object in self.largest_objects],
+            "buffer_totals": {
+                path: {"count": buffers, "total": total, "largest": largest}
+                for path, (buffers, total, largest) in self.buffer_totals.items()
+            }
+        }
+
+    def format(self) -> str:
+        """
+        Formats the report as human-readable text.
+        """
+        lines = [f"Peak traced memory: {format_megabytes(self.peak_traced)} MB"]
+        if self.peak_rss is not None:
+            lines.append(f"Peak RSS: {format_megabytes(self.peak_rss)} MB")
+
+        if len(self.allocation_sites) > 0:
+            lines.append("Largest allocation sites still live at the end of the execution:")
+            lines += [
+                f"  {format_megabytes(size):>10} MB  {blocks:8d} blocks  {location}"
+                for location, size, blocks in self.allocation_sites
+            ]
+
+        if len(self.buffer_totals) > 0:
+            lines.append("Buffers held by elements reaching the sink, by attribute:")
+            lines += [
+                f"  {format_megabytes(total):>10} MB  {buffers:8d} buffers  "
+                f"(largest {format_megabytes(largest)} MB)  {path}"
+                for path, (buffers, total, largest) in sorted(
+                    self.buffer_totals.items(),
+                    key=lambda item: item[1][1],
+                    reverse=True
+                )
+            ]
+
+        if len(self.largest_objects) > 0:
+            lines.append("Largest objects held by elements reaching the sink:")
+            lines += [
+                f"  {format_megabytes(large_object.size):>10} MB  {large_object.path} "
+                f"({large_object.type_name}) in {large_object.element}"
+                for large_object in self.largest_objects
+            ]
+
+        return "\n".join(lines)
+
+
+class MemoryTracker:
+    """
+    Records the memory usage of each stage of a profiled pipeline, using
+    tracemalloc to measure Python allocations, and by sampling the resident
+    set size of the process on a background thread. Memory is attributed to
+    whichever stage was last resumed, so figures are approximate when stages
+    execute concurrently on separate threads.
+    """
+    def __init__(self, rss_interval: float = 0.01, top_count: int = 10):
+        # The interval at which to sample the resident set size, in seconds
+        self._rss_interval: float = rss_interval
+
+        # The number of allocation sites/large objects to report
+        self._top_count: int = top_count
+
+        # The stage profile which is currently executing
+        self._active = None
+
+        # The peak traced memory seen so far
+        self._peak_traced: int = 0
+
+        # The last-sampled and peak resident set sizes
+        self._last_rss: Optional[int] = None
+        self._peak_rss: Optional[int] = None
+
+        # The largest buffers held by elements, as a min-heap of (size, tie-breaker, object)
+        self._largest_objects: List[Tuple[int, int, LargeObject]] = []
+        self._tie_breaker = count()
+
+        # The number, total size and largest size of the buffers at each attribute path
+        self._buffer_totals: Dict[str, Tuple[int, int, int]] = {}
+
+        # Whether this tracker started tracemalloc (and so should stop it)
+        self._started_tracing: bool = False
+
+        # The thread sampling the resident set size
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling: threading.Event = threading.Event()
+
+    def start(self):
+        """
+        Starts tracking memory usage.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEBACK_FRAMES)
+            self._started_tracing = True
+
+        self._last_rss = self._peak_rss = current_rss()
+        if self._last_rss is not None:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> MemoryReport:
+        """
+        Stops tracking memory usage.
+
+        :return:    The overall memory usage while tracking.
+        """
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+
+        # Find the allocations which are still live
+        allocation_sites = []
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ))
+            allocation_sites = [
+                (f"{statistic.traceback[0].filename}:{statistic.traceback[0].lineno}", statistic.size, statistic.count)
+                for statistic in snapshot.statistics("lineno")[:self._top_count]
+            ]
+
+            self._peak_traced = max(self._peak_traced, tracemalloc.get_traced_memory()[1])
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        return MemoryReport(
+            self._peak_traced,
+            self._peak_rss if self._peak_rss is not None else peak_rss(),
+            allocation_sites,
+            [large_object for size, tie_breaker, large_object in sorted(self._largest_objects, reverse=True)],
+            dict(self._buffer_totals)
+        )
+
+    def enter(self, profile) -> int:
+        """
+        Called when a stage resumes executing.
+
+        :param profile:     The profile of the stage.
+        :return:            The traced memory on entry, to pass to 'leave'.
+        """
+        self._active = profile
+
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+        return tracemalloc.get_traced_memory()[0]
+
+    def leave(self, profile, start: int):
+        """
+        Called when a stage pauses executing, adding the memory it allocated
+        and retained since it resumed to its profile.
+
+        :param profile:     The profile of the stage.
+        :param start:       The traced memory when the stage resumed.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+
+        profile.memory_allocated += max(peak - start, current - start, 0)
+        profile.memory_retained += current - start
+
+        self._peak_traced = max(self._peak_traced, peak)
+
+    def inspect_element(self, element):
+        """
+        Records the largest buffers held by an element.
+
+        :param element:     The stream element.
+        """
+        description = describe_element(element)
+
+        for size, path, type_name in find_buffers(element, "element", _INSPECTION_DEPTH, set()):
+            buffers, total, largest = self._buffer_totals.get(path, (0, 0, 0))
+            self._buffer_totals[path] = buffers + 1, total + size, max(largest, size)
+
+            entry = (size, next(self._tie_breaker), LargeObject(size, path, type_name, description))
+            if len(self._largest_objects) < self._top_count:
+                heapq.heappush(self._largest_objects, entry)
+            elif size > self._largest_objects[0][0]:
+                heapq.heapreplace(self._largest_objects, entry)
+
+    def _sample_rss(self):
+        """
+        Samples the resident set size, attributing any growth to the active stage.
+        """
+        while not self._stop_sampling.wait(self._rss_interval):
+            rss = current_rss()
+            if rss is None:
+                return
+
+            active = self._active
+            if active is not None and rss > self._last_rss:
+                active.rss_growth += rss - self._last_rss
+
+            self._last_rss = rss
+            self._peak_rss = max(self._peak_rss, rss)
+
+
+def find_buffers(obj, path: str, depth: int, seen: Set[int]) -> Iterator[Tuple[int, str, str]]:
+    """
+    Finds the bytes and array buffers held by an object's attributes.
+
+    :param obj:     The object to search.
+    :param path:    The attribute path to the object.
+    :param depth:   How many attributes deep to search.
+    :param seen:    The ids of the objects already searched.
+    :return:        An iterator of (size, path, type description) for each buffer.
+    """
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, (bytes, bytearray)):
+        yield len(obj), path, type(obj).__name__
+        return
+    if isinstance(obj, memoryview):
+        yield obj.nbytes, path, "memoryview"
+        return
+
+    # Duck-type numpy arrays
+    if hasattr(obj, "nbytes") and hasattr(obj, "dtype") and hasattr(obj, "shape"):
+        yield int(obj.nbytes), path, f"{type(obj).__name__}{tuple(obj.shape)} {obj.dtype}"
+        return
+
+    if depth == 0 or isinstance(obj, (str, int, float, bool, type(None))):
+        return
+
+    if isinstance(obj, dict):
+        children = ((f"{path}[{key!r}]", value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        children = ((f"{path}[{index}]", value) for index, value in enumerate(obj))
+    elif hasattr(obj, "__dict__"):
+        children = ((f"{path}.{name}", value) for name, value in vars(obj).items())
+    else:
+        return
+
+    for child_path, child in children:
+        yield from find_buffers(child, child_path, depth - 1, seen)
+
+
+def describe_element(element) -> str:
+    """
+    Describes an element for the memory report, by the filename of its
+    data if it has any.
+    """
+    filename = getattr(getattr(element, "data", None), "filename", None)
+
+    return filename if isinstance(filename, str) else type(element).__name__
+
+
+def current_rss() -> Optional[int]:
+    """
+    Gets the resident set size of this process.
+
+    :return:    The size in bytes, or None if it can't be determined on this platform.
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Gets the peak resident set size of this process over its lifetime.
+
+    :return:    The size in bytes, or None if it can't be determined on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Reported in kilobytes on Linux, but bytes on macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def format_megabytes(size: int) -> str:
+    """
+    Formats a size in bytes as megabytes.
+    """
+    return f"{size / (1024 * 1024):.1f}"
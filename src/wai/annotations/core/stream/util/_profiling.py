@@ -0,0 +1,387 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .._StreamProcessor import StreamProcessor, InputElementType, OutputElementType
+from .._StreamSink import StreamSink
+from .._StreamSource import StreamSource
+from .._typing import ThenFunction, DoneFunction, ElementType
+from ._batching import BatchingStreamProcessor, BatchingStreamSink
+from ._CheckpointJournal import JournallingStreamSource
+from ._memory_profiling import MemoryTracker, MemoryReport, format_megabytes
+from ._ParallelStreamProcessor import ParallelStreamProcessor
+from ._ReleasingStreamSink import ReleasingStreamSink
+
+# The kinds of stage that can be profiled
+SOURCE_STAGE = "source"
+PROCESSOR_STAGE = "processor"
+SINK_STAGE = "sink"
+
+
+class StageProfile:
+    """
+    The performance counters for a single stage of a pipeline. Time spent
+    in the stages downstream of this one is not included in its times.
+    """
+    def __init__(self, name: str, kind: str, memory_tracker: Optional[MemoryTracker] = None):
+        # The name of the stage
+        self.name: str = name
+
+        # Whether the stage is a source, processor or sink
+        self.kind: str = kind
+
+        # The number of elements passed into/out of the stage
+        self.elements_in: int = 0
+        self.elements_out: int = 0
+
+        # The total time spent in the stage, in seconds
+        self.wall_time: float = 0.0
+        self.cpu_time: float = 0.0
+
+        # The tracker of memory usage, if memory is being profiled
+        self._memory_tracker: Optional[MemoryTracker] = memory_tracker
+
+        # The memory allocated by the stage (at its peak), retained by
+        # the stage, and the growth in RSS while in the stage, in bytes
+        self.memory_allocated: int = 0
+        self.memory_retained: int = 0
+        self.rss_growth: int = 0
+
+        # The clock readings (and traced memory) when the stage was last entered
+        self._wall_start: float = 0.0
+        self._cpu_start: float = 0.0
+        self._memory_start: int = 0
+
+    @property
+    def memory_tracked(self) -> bool:
+        """
+        Whether the memory usage of the stage is being profiled.
+        """
+        return self._memory_tracker is not None
+
+    @property
+    def elements_per_second(self) -> float:
+        """
+        The throughput of the stage, based on the time spent in the stage
+        itself. Sources are measured by the number of elements they produce,
+        other stages by the number of elements they receive.
+        """
+        elements = self.elements_out if self.kind == SOURCE_STAGE else self.elements_in
+
+        return elements / self.wall_time if self.wall_time > 0.0 else 0.0
+
+    def resume(self):
+        """
+        Starts timing the stage.
+        """
+        if self._memory_tracker is not None:
+            self._memory_start = self._memory_tracker.enter(self)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+    def pause(self):
+        """
+        Stops timing the stage, adding the time since it was resumed
+        to its totals.
+        """
+        self.wall_time += time.perf_counter() - self._wall_start
+        self.cpu_time += time.thread_time() - self._cpu_start
+        if self._memory_tracker is not None:
+            self._memory_tracker.leave(self, self._memory_start)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Gets the profile as a JSON-compatible dictionary.
+        """
+        result = {
+            "name": self.name,
+            "kind": self.kind,
+            "elements_in": self.elements_in,
+            "elements_out": self.elements_out,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "elements_per_second": self.elements_per_second
+        }
+
+        if self.memory_tracked:
+            result.update(
+                memory_allocated=self.memory_allocated,
+                memory_retained=self.memory_retained,
+                rss_growth=self.rss_growth
+            )
+
+        return result
+
+
+class PipelineProfile:
+    """
+    The performance counters for each stage of an execution of a pipeline.
+    """
+    def __init__(self, stages: Sequence[StageProfile], wall_time: float, memory: Optional[MemoryReport] = None):
+        # The profiles of the stages, in pipeline order
+        self._stages: List[StageProfile] = list(stages)
+
+        # The total time taken to execute the pipeline, in seconds
+        self.wall_time: float = wall_time
+
+        # The overall memory usage, if memory was profiled
+        self.memory: Optional[MemoryReport] = memory
+
+    @property
+    def stages(self) -> List[StageProfile]:
+        """
+        The profiles of the stages, in pipeline order.
+        """
+        return self._stages
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Gets the profile as a JSON-compatible dictionary.
+        """
+        result = {
+            "wall_time": self.wall_time,
+            "stages": [stage.to_json() for stage in self._stages]
+        }
+
+        if self.memory is not None:
+            result["memory"] = self.memory.to_json()
+
+        return result
+
+    def format_table(self) -> str:
+        """
+        Formats the profile as a human-readable table.
+        """
+        headers = ("Stage", "Kind", "In", "Out", "Wall (s)", "CPU (s)", "Wall (%)", "Elements/s")
+        rows = [
+            (
+                stage.name,
+                stage.kind,
+                str(stage.elements_in),
+                str(stage.elements_out),
+                f"{stage.wall_time:.3f}",
+                f"{stage.cpu_time:.3f}",
+                f"{100 * stage.wall_time / self.wall_time if self.wall_time > 0.0 else 0.0:.1f}",
+                f"{stage.elements_per_second:.1f}"
+            )
+            for stage in self._stages
+        ]
+
+        # Add the memory columns if memory was profiled
+        if self.memory is not None:
+            headers += ("Alloc (MB)", "Retained (MB)", "RSS+ (MB)")
+            rows = [
+                row + (
+                    format_megabytes(stage.memory_allocated),
+                    format_megabytes(stage.memory_retained),
+                    format_megabytes(stage.rss_growth)
+                )
+                for row, stage in zip(rows, self._stages)
+            ]
+
+        widths = [max(len(row[column]) for row in [headers] + rows) for column in range(len(headers))]
+
+        def format_row(row) -> str:
+            # Left-align the name/kind columns, right-align the numbers
+            return "  ".join(
+                cell.ljust(width) if column < 2 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+
+        lines = [format_row(headers), "  ".join("-" * width for width in widths)]
+        lines += [format_row(row) for row in rows]
+        lines.append(f"Total wall time: {self.wall_time:.3f}s")
+        if self.memory is not None:
+            lines.append(self.memory.format())
+
+        return "\n".join(lines)
+
+
+def get_stage_name(stage) -> str:
+    """
+    Gets a name to identify a stage by in a profile, looking through any
+    wrappers the pipeline adds around the stage.
+
+    :param stage:   The source, processor or sink.
+    :return:        The name of the stage.
+    """
+    while True:
+        if isinstance(stage, (BatchingStreamProcessor, ParallelStreamProcessor)):
+            stage = stage.processor
+        elif isinstance(stage, (BatchingStreamSink, ReleasingStreamSink)):
+            stage = stage.sink
+        elif isinstance(stage, JournallingStreamSource):
+            stage = stage.source
+        else:
+            return type(stage).__name__
+
+
+def _timed_then(then: ThenFunction, profile: StageProfile) -> ThenFunction:
+    """
+    Wraps a stage's 'then' function so that elements are counted, and time
+    spent downstream is excluded from the stage's profile.
+    """
+    def profiled_then(element):
+        profile.elements_out += 1
+        profile.pause()
+        try:
+            then(element)
+        finally:
+            profile.resume()
+
+    return profiled_then
+
+
+def _timed_done(done: DoneFunction, profile: StageProfile) -> DoneFunction:
+    """
+    Wraps a stage's 'done' function so that time spent finishing the
+    downstream stages is excluded from the stage's profile.
+    """
+    def profiled_done():
+        profile.pause()
+        try:
+            done()
+        finally:
+            profile.resume()
+
+    return profiled_done
+
+
+def _timed_call(profile: StageProfile, method: Callable, *args):
+    """
+    Calls a stage's method, adding the time spent to its profile.
+    """
+    profile.resume()
+    try:
+        return method(*args)
+    finally:
+        profile.pause()
+
+
+class ProfilingStreamSource(StreamSource[ElementType]):
+    """
+    Wraps a stream-source, recording its performance counters.
+    """
+    def __init__(
+            self,
+            source: StreamSource[ElementType],
+            profile: Optional[StageProfile] = None,
+            memory_tracker: Optional[MemoryTracker] = None
+    ):
+        self._source: StreamSource[ElementType] = source
+        self._profile: StageProfile = (
+            profile if profile is not None
+            else StageProfile(get_stage_name(source), SOURCE_STAGE, memory_tracker)
+        )
+
+    @property
+    def profile(self) -> StageProfile:
+        return self._profile
+
+    def produce(
+            self,
+            then: ThenFunction[ElementType],
+            done: DoneFunction
+    ):
+        _timed_call(
+            self._profile,
+            self._source.produce,
+            _timed_then(then, self._profile),
+            _timed_done(done, self._profile)
+        )
+
+
+class ProfilingStreamProcessor(StreamProcessor[InputElementType, OutputElementType]):
+    """
+    Wraps a stream-processor, recording its performance counters.
+    """
+    def __init__(
+            self,
+            processor: StreamProcessor[InputElementType, OutputElementType],
+            profile: Optional[StageProfile] = None,
+            memory_tracker: Optional[MemoryTracker] = None
+    ):
+        self._processor: StreamProcessor[InputElementType, OutputElementType] = processor
+        self._profile: StageProfile = (
+            profile if profile is not None
+            else StageProfile(get_stage_name(processor), PROCESSOR_STAGE, memory_tracker)
+        )
+
+        # The wrapped 'then'/'done' functions, which are reused while the
+        # downstream functions are the same
+        self._then: Optional[ThenFunction] = None
+        self._done: Optional[DoneFunction] = None
+        self._timed_then: Optional[ThenFunction] = None
+        self._timed_done: Optional[DoneFunction] = None
+
+    @property
+    def profile(self) -> StageProfile:
+        return self._profile
+
+    def start(self):
+        _timed_call(self._profile, self._processor.start)
+
+    def process_element(
+            self,
+            element: InputElementType,
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        self._profile.elements_in += 1
+        _timed_call(self._profile, self._processor.process_element, element, *self._wrap(then, done))
+
+    def finish(
+            self,
+            then: ThenFunction[OutputElementType],
+            done: DoneFunction
+    ):
+        _timed_call(self._profile, self._processor.finish, *self._wrap(then, done))
+
+    def _wrap(self, then: ThenFunction, done: DoneFunction):
+        """
+        Gets the timed versions of the downstream functions.
+        """
+        if then is not self._then or done is not self._done:
+            self._then, self._done = then, done
+            self._timed_then = _timed_then(then, self._profile)
+            self._timed_done = _timed_done(done, self._profile)
+
+        return self._timed_then, self._timed_done
+
+
+class ProfilingStreamSink(StreamSink[ElementType]):
+    """
+    Wraps a stream-sink, recording its performance counters.
+    """
+    def __init__(
+            self,
+            sink: StreamSink[ElementType],
+            profile: Optional[StageProfile] = None,
+            memory_tracker: Optional[MemoryTracker] = None
+    ):
+        self._sink: StreamSink[ElementType] = sink
+        self._memory_tracker: Optional[MemoryTracker] = memory_tracker
+        self._profile: StageProfile = (
+            profile if profile is not None
+            else StageProfile(get_stage_name(sink), SINK_STAGE, memory_tracker)
+        )
+
+    @property
+    def profile(self) -> StageProfile:
+        return self._profile
+
+    def start(self):
+        _timed_call(self._profile, self._sink.start)
+
+    def start_resumed(self):
+        _timed_call(self._profile, self._sink.start_resumed)
+
+    def consume_element(self, element: ElementType):
+        self._profile.elements_in += 1
+        _timed_call(self._profile, self._sink.consume_element, element)
+
+        # Record the largest objects held by the element, now that it is fully processed
+        if self._memory_tracker is not None:
+            self._memory_tracker.inspect_element(element)
+
+    def finish(self):
+        _timed_call(self._profile, self._sink.finish)
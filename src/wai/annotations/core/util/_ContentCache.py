@@ -0,0 +1,147 @@
+import hashlib
+import os
+from tempfile import NamedTemporaryFile
+from typing import List, Optional, Tuple
+
+# The fraction of the maximum size to evict down to, so that eviction
+# isn't triggered again by the next few entries
+_EVICTION_LOW_WATER_MARK = 0.9
+
+
+class ContentCache:
+    """
+    A size-bounded cache of binary values on disk, which persists between
+    runs. Values are stored in a file per key, so the cache can be shared by
+    several processes. When the total size exceeds the maximum, the least-
+    recently used values are evicted, based on the modification times of
+    their files (which are updated when read).
+    """
+    def __init__(self, directory: str, max_size: int):
+        # The directory the values are stored in
+        self._directory: str = directory
+
+        # The maximum total size of the stored values, in bytes
+        self._max_size: int = max_size
+
+        # The total size of the stored values, as far as this process knows
+        # (scanned from the directory when first needed)
+        self._size: Optional[int] = None
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Creates a key from the parts which identify a value.
+
+        :param parts:   The identifying parts, e.g. a content hash and the parameters
+                        which the value was derived from it with.
+        :return:        The key.
+        """
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Gets the value for a key from the cache.
+
+        :param key:     The key (from make_key).
+        :return:        The value, or None if it is not cached.
+        """
+        filename = self._filename(key)
+
+        try:
+            with open(filename, "rb") as file:
+                value = file.read()
+
+            # Mark the value as recently used
+            os.utime(filename)
+        except FileNotFoundError:
+            # Not cached, or evicted by another process
+            return None
+
+        return value
+
+    def put(self, key: str, value: bytes):
+        """
+        Stores the value for a key in the cache, evicting the least-recently
+        used values if the cache grows too large.
+
+        :param key:     The key (from make_key).
+        :param value:   The value to store.
+        """
+        # Values larger than the whole cache are never stored
+        if len(value) > self._max_size:
+            return
+
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._scan())
+
+        # Write to a temporary file and move it into place, so that other
+        # processes never see a partially-written value
+        filename = self._filename(key)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with NamedTemporaryFile("wb", dir=os.path.dirname(filename), suffix=".tmp", delete=False) as file:
+            file.write(value)
+        os.replace(file.name, filename)
+
+        self._size += len(value)
+        if self._size > self._max_size:
+            self.evict()
+
+    def evict(self):
+        """
+        Evicts the least-recently used values until the cache is comfortably
+        within its maximum size.
+        """
+        entries = sorted(self._scan())
+        size = sum(entry_size for _, _, entry_size in entries)
+        target = int(self._max_size * _EVICTION_LOW_WATER_MARK)
+
+        for _, filename, entry_size in entries:
+            if size <= target:
+                break
+
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                # Already evicted by another process
+                pass
+
+            size -= entry_size
+
+        self._size = size
+
+    def _filename(self, key: str) -> str:
+        """
+        Gets the file the value for a key is stored in. Values are spread
+        over sub-directories by the first characters of their keys.
+        """
+        return os.path.join(self._directory, key[:2], key)
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """
+        Gets the (modification time, filename, size) of each stored value.
+        """
+        entries = []
+
+        if not os.path.isdir(self._directory):
+            return entries
+
+        for subdirectory in os.scandir(self._directory):
+            if not subdirectory.is_dir():
+                continue
+
+            for entry in os.scandir(subdirectory.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+
+        return entries
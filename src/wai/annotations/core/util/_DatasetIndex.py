@@ -0,0 +1,221 @@
+import json
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# The version of the index's schema
+INDEX_VERSION = 1
+
+# The schema of the index. Each indexed (annotation/negative) file has a row in 'files',
+# with the image size of its first instance and its label counts (also as a JSON object,
+# for use with the label_count/has_label functions in selection predicates)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    negative INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    instances INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    labels TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS instances (
+    file TEXT NOT NULL,
+    data TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER
+);
+CREATE INDEX IF NOT EXISTS instances_file ON instances (file);
+CREATE TABLE IF NOT EXISTS labels (
+    file TEXT NOT NULL,
+    label TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (file, label)
+);
+CREATE INDEX IF NOT EXISTS labels_label ON labels (label, count);
+"""
+
+
+class DatasetIndex:
+    """
+    An SQLite index of the files in a data-set, recording for each file its
+    size and modification time, the data files and image sizes of the
+    instances read from it, and the number of times each label occurs in
+    its annotations. Files can then be selected by predicates over the index
+    without reading their annotations.
+
+    Selection predicates are SQL expressions over the columns of the 'files'
+    table (path, negative, size, mtime, instances, width, height, labels), and
+    can use the functions label_count(labels, LABEL) and has_label(labels, LABEL),
+    e.g. "has_label(labels, 'cat') AND width >= 640". The 'instances' and
+    'labels' tables can be used in sub-queries (joined on their 'file' column).
+    """
+    def __init__(self, filename: str):
+        # The file the index is stored in
+        self._filename: str = filename
+
+        self._connection: sqlite3.Connection = sqlite3.connect(filename)
+        self._connection.create_function("label_count", 2, _label_count, deterministic=True)
+        self._connection.create_function("has_label", 2, _has_label, deterministic=True)
+        self._connection.executescript(_SCHEMA)
+
+        version = self._connection.execute("SELECT value FROM metadata WHERE key = 'version'").fetchone()
+        if version is None:
+            with self._connection:
+                self._connection.execute("INSERT INTO metadata VALUES ('version', ?)", (str(INDEX_VERSION),))
+        elif int(version[0]) != INDEX_VERSION:
+            raise ValueError(
+                f"Index '{filename}' has version {version[0]} (expected {INDEX_VERSION}); re-create it"
+            )
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def close(self):
+        """
+        Commits any changes and closes the index.
+        """
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def is_current(self, path: str, size: int, mtime: int) -> bool:
+        """
+        Whether the index holds an entry for a file which is unchanged.
+
+        :param path:    The absolute path to the file.
+        :param size:    The file's current size.
+        :param mtime:   The file's current modification time, in nanoseconds.
+        :return:        True if the indexed entry matches.
+        """
+        return self._connection.execute(
+            "SELECT 1 FROM files WHERE path = ? AND size = ? AND mtime = ?",
+            (path, size, mtime)
+        ).fetchone() is not None
+
+    def put(
+            self,
+            path: str,
+            negative: bool,
+            size: int,
+            mtime: int,
+            instances: List[Tuple[str, Optional[int], Optional[int]]],
+            label_counts: Dict[str, int]
+    ):
+        """
+        Adds or replaces the entry for a file. Changes are committed on 'commit' or 'close'.
+
+        :param path:            The absolute path to the file.
+        :param negative:        Whether the file was read as a negative.
+        :param size:            The file's size.
+        :param mtime:           The file's modification time, in nanoseconds.
+        :param instances:       The (data filename, width, height) of each instance read from
+                                the file (width and height are None if not applicable).
+        :param label_counts:    The number of occurrences of each label in the file.
+        """
+        self.remove(path)
+
+        width, height = instances[0][1:] if len(instances) > 0 else (None, None)
+
+        self._connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, int(negative), size, mtime, len(instances), width, height, json.dumps(label_counts))
+        )
+        self._connection.executemany(
+            "INSERT INTO instances VALUES (?, ?, ?, ?)",
+            ((path, data, width, height) for data, width, height in instances)
+        )
+        self._connection.executemany(
+            "INSERT INTO labels VALUES (?, ?, ?)",
+            ((path, label, count) for label, count in label_counts.items())
+        )
+
+    def remove(self, path: str):
+        """
+        Removes the entry for a file, if any.
+
+        :param path:    The absolute path to the file.
+        """
+        for table, column in (("files", "path"), ("instances", "file"), ("labels", "file")):
+            self._connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (path,))
+
+    def mark_present(self, path: str):
+        """
+        Marks a file as still being part of the data-set, for 'remove_absent'.
+
+        :param path:    The absolute path to the file.
+        """
+        self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS present (path TEXT PRIMARY KEY)")
+        self._connection.execute("INSERT OR IGNORE INTO present VALUES (?)", (path,))
+
+    def remove_absent(self) -> int:
+        """
+        Removes the entries for files which haven't been marked as present
+        since the index was opened.
+
+        :return:    The number of files removed.
+        """
+        self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS present (path TEXT PRIMARY KEY)")
+
+        absent = "SELECT path FROM files WHERE path NOT IN (SELECT path FROM temp.present)"
+        removed, = self._connection.execute(f"SELECT COUNT(*) FROM ({absent})").fetchone()
+        for table, column in (("instances", "file"), ("labels", "file"), ("files", "path")):
+            self._connection.execute(f"DELETE FROM {table} WHERE {column} IN ({absent})")
+
+        return removed
+
+    def select(self, predicate: str) -> Iterator[Tuple[str, int]]:
+        """
+        Selects the indexed files which match a predicate.
+
+        :param predicate:   The SQL expression to select files with (see class documentation).
+        :return:            An iterator over the absolute path and indexed modification
+                            time (in nanoseconds) of each matching file.
+        """
+        try:
+            yield from self._connection.execute(f"SELECT path, mtime FROM files WHERE ({predicate})")
+        except sqlite3.Error as e:
+            raise ValueError(f"Invalid index selection predicate '{predicate}': {e}") from e
+
+    def commit(self):
+        """
+        Commits the changes made to the index.
+        """
+        self._connection.commit()
+
+
+def _label_count(labels: Optional[str], label: str) -> int:
+    """
+    SQL function which gets the count of a label from a file's JSON label counts.
+    """
+    return json.loads(labels).get(label, 0) if labels is not None else 0
+
+
+def _has_label(labels: Optional[str], label: str) -> bool:
+    """
+    SQL function which checks if a label occurs in a file's JSON label counts.
+    """
+    return _label_count(labels, label) > 0
+
+
+def file_signature(path: str) -> Tuple[int, int]:
+    """
+    Gets the size and modification time (in nanoseconds) of a file, which
+    identify whether its index entry is current.
+
+    :param path:    The file.
+    :return:        The size and modification time.
+    """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
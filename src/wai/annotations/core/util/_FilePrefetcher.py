@@ -0,0 +1,299 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import RLock
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+# The prefetchers which are currently reading ahead
+_active_prefetchers: List['FilePrefetcher'] = []
+
+
+def take_prefetched_data(filename: str) -> Optional[bytes]:
+    """
+    Takes the data for a file from any active prefetcher which
+    has read it ahead of time.
+
+    :param filename:    The name of the file.
+    :return:            The file's data, or None if it wasn't prefetched.
+    """
+    for prefetcher in tuple(_active_prefetchers):
+        data = prefetcher.take(filename)
+        if data is not None:
+            return data
+
+    return None
+
+
+# The most files a prefetcher keeps track of which have been produced but not yet
+# taken by a reader. Readers in a pipelined execution can lag behind the source
+# by the queues between them; files beyond this are treated as passed over
+_MAX_UNTAKEN_FILES = 1024
+
+
+class FilePrefetcher:
+    """
+    Reads the contents of files on a background pool of threads, ahead
+    of the files being requested. Prefetched data is held in memory until
+    it is taken, up to a maximum number of bytes.
+
+    The files are read ahead of the reader, rather than of the source
+    iterating over them, so a reader further down a pipelined execution
+    still finds its files prefetched. A file's data is discarded once a
+    later file is taken (the reader has passed it over), or once too many
+    files are waiting to be taken.
+    """
+    def __init__(
+            self,
+            read_ahead: int,
+            memory_budget: int,
+            fadvise: bool = False,
+            workers: Optional[int] = None
+    ):
+        # The number of files to read ahead of the current file
+        self._read_ahead: int = read_ahead
+
+        # The maximum number of bytes of prefetched data to hold
+        self._memory_budget: int = memory_budget
+
+        # Whether to advise the OS that the files will be needed soon
+        self._fadvise: bool = fadvise and hasattr(os, "posix_fadvise")
+
+        # The number of threads to read files on
+        self._workers: int = workers if workers is not None else max(1, min(read_ahead, 8))
+
+        # The pool of reading threads (only exists while active)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # The pending/completed reads, by filename
+        self._reads: Dict[str, Future] = {}
+
+        # The files iterated over (or about to be) which haven't yet been taken, in order
+        self._untaken: Deque[str] = deque()
+
+        # The number of files at the front of the untaken files whose reads have been scheduled
+        self._scheduled: int = 0
+
+        # Whether iteration has finished, so the prefetcher closes once the reader has caught up
+        self._draining: bool = False
+
+        # The number of bytes of prefetched data currently held
+        self._reserved: int = 0
+
+        # Lock protecting the read-table/reservation (re-entrant, as discarding
+        # a completed read releases its reservation immediately)
+        self._lock: RLock = RLock()
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Whether this prefetcher reads ahead at all.
+        """
+        return self._read_ahead > 0
+
+    def __enter__(self) -> 'FilePrefetcher':
+        if self.is_enabled:
+            # Close any prefetchers whose readers never took their last files
+            for prefetcher in tuple(_active_prefetchers):
+                if prefetcher._draining:
+                    prefetcher._close()
+
+            self._executor = ThreadPoolExecutor(self._workers)
+            self._draining = False
+            _active_prefetchers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._executor is None:
+            return
+
+        # Keep the data for the files the reader hasn't reached yet, unless iteration failed
+        with self._lock:
+            self._draining = True
+            drained = len(self._untaken) == 0
+
+        if drained or exc_type is not None:
+            self._close()
+
+    def iterate(self, filenames: Iterable[str]) -> Iterator[str]:
+        """
+        Iterates over the given filenames, reading the files ahead of
+        them being taken.
+
+        :param filenames:   The filenames to iterate over.
+        :return:            An iterator over the same filenames.
+        """
+        # If not reading ahead, just pass the filenames through
+        if not self.is_enabled or self._executor is None:
+            yield from filenames
+            return
+
+        iterator = iter(filenames)
+        upcoming: Deque[str] = deque()
+        exhausted = False
+
+        while True:
+            # Keep the files after the current one known to the prefetcher, so
+            # they are read ahead even when the reader keeps up with iteration
+            while not exhausted and len(upcoming) <= self._read_ahead:
+                filename = next(iterator, None)
+                if filename is None:
+                    exhausted = True
+                else:
+                    self._add(filename)
+                    upcoming.append(filename)
+
+            if len(upcoming) == 0:
+                return
+
+            yield upcoming.popleft()
+
+    def take(self, filename: str) -> Optional[bytes]:
+        """
+        Takes the prefetched data for a file, releasing it from this prefetcher.
+        The data for any files before it which haven't been taken is discarded.
+
+        :param filename:    The name of the file.
+        :return:            The data, or None if the file wasn't prefetched.
+        """
+        with self._lock:
+            future = self._reads.pop(filename, None)
+
+            if future is None:
+                return None
+
+            # The reader has passed over the files before this one
+            while len(self._untaken) > 0:
+                passed = self._pop_untaken()
+                if passed == filename:
+                    break
+                self._discard(passed)
+
+            self._schedule_window()
+
+            drained = self._draining and len(self._untaken) == 0
+
+        data = future.result()
+
+        if data is not None:
+            self._release(len(data))
+
+        if drained:
+            self._close()
+
+        return data
+
+    def _add(self, filename: str):
+        """
+        Adds a file to those waiting to be taken, reading it if it is
+        within the read-ahead window.
+
+        :param filename:    The name of the file.
+        """
+        with self._lock:
+            self._untaken.append(filename)
+
+            # Give up on the oldest files if the reader isn't taking them
+            while len(self._untaken) > _MAX_UNTAKEN_FILES:
+                self._discard(self._pop_untaken())
+
+            self._schedule_window()
+
+    def _pop_untaken(self) -> str:
+        """
+        Removes the oldest untaken file. Must hold the lock.
+        """
+        self._scheduled = max(0, self._scheduled - 1)
+        return self._untaken.popleft()
+
+    def _schedule_window(self):
+        """
+        Starts reading the untaken files within the read-ahead window of the
+        reader's position. Must hold the lock.
+        """
+        while self._scheduled < min(self._read_ahead + 1, len(self._untaken)):
+            filename = self._untaken[self._scheduled]
+            if filename not in self._reads:
+                self._reads[filename] = self._executor.submit(self._read, filename)
+            self._scheduled += 1
+
+    def _discard(self, filename: str):
+        """
+        Discards any prefetched data for a file.
+
+        :param filename:    The name of the file.
+        """
+        with self._lock:
+            future = self._reads.pop(filename, None)
+
+        if future is None or future.cancel():
+            return
+
+        future.add_done_callback(
+            lambda completed: self._release(len(completed.result()))
+            if completed.result() is not None
+            else None
+        )
+
+    def _close(self):
+        """
+        Abandons any outstanding reads and shuts down the reading threads.
+        """
+        with self._lock:
+            if self._executor is None:
+                return
+
+            _active_prefetchers.remove(self)
+
+            for future in self._reads.values():
+                future.cancel()
+            self._reads.clear()
+            self._untaken.clear()
+            self._scheduled = 0
+
+            executor, self._executor = self._executor, None
+
+        # Don't wait for reads in progress, as this may be called by the reader
+        executor.shutdown(wait=False)
+
+    def _read(self, filename: str) -> Optional[bytes]:
+        """
+        Reads a file, provided its contents fit in the memory budget.
+
+        :param filename:    The name of the file to read.
+        :return:            The file contents, or None if not read.
+        """
+        try:
+            with open(filename, "rb") as file:
+                if self._fadvise:
+                    os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+                # Reserve room for the file's contents, or skip it if there is none
+                size = os.fstat(file.fileno()).st_size
+                with self._lock:
+                    if self._reserved + size > self._memory_budget:
+                        return None
+                    self._reserved += size
+
+                try:
+                    data = file.read()
+                except OSError:
+                    self._release(size)
+                    raise
+
+                # Correct the reservation if the file changed size
+                self._release(size - len(data))
+
+                return data
+
+        except OSError:
+            # Let the reader report the problem when it reads the file itself
+            return None
+
+    def _release(self, size: int):
+        """
+        Releases reserved memory.
+
+        :param size:    The number of bytes to release.
+        """
+        with self._lock:
+            self._reserved -= size
@@ -0,0 +1,146 @@
+import pickle
+from collections.abc import Sequence
+from tempfile import TemporaryFile
+from threading import Lock
+from typing import BinaryIO, Generic, Iterator, List, Optional, Tuple, TypeVar, Union, overload
+
+ItemType = TypeVar("ItemType")
+
+
+class SpillingList(Sequence, Generic[ItemType]):
+    """
+    An append-only list which keeps its items in memory up to a budget
+    (measured by their pickled size), and pickles the items beyond it to an
+    anonymous temporary file. Spilled items are loaded from the file each
+    time they are accessed, so iterating over the list only needs one item
+    in memory at a time. The file is deleted when the list is closed or
+    garbage-collected.
+    """
+    def __init__(self, memory_budget: int, directory: Optional[str] = None):
+        # The maximum pickled size of the items kept in memory, in bytes
+        self._memory_budget: int = memory_budget
+
+        # The directory to create the temporary file in (the system default if None)
+        self._directory: Optional[str] = directory
+
+        # The items kept in memory (always the first items in the list)
+        self._items: List[ItemType] = []
+
+        # The pickled size of the items kept in memory
+        self._memory_size: int = 0
+
+        # The (offset, length) in the file of each spilled item
+        self._spilled: List[Tuple[int, int]] = []
+
+        # The file spilled items are written to (created on the first spill)
+        self._file: Optional[BinaryIO] = None
+
+        # The size of the file
+        self._file_size: int = 0
+
+        # Guards the file position, so items can be loaded from several threads
+        self._lock: Lock = Lock()
+
+    @property
+    def memory_size(self) -> int:
+        """
+        The pickled size of the items kept in memory, in bytes.
+        """
+        return self._memory_size
+
+    @property
+    def spilled_count(self) -> int:
+        """
+        The number of items which have been spilled to disk.
+        """
+        return len(self._spilled)
+
+    def append(self, item: ItemType):
+        """
+        Adds an item to the end of the list, spilling it to disk if it
+        doesn't fit in the memory budget.
+
+        :param item:    The item to add.
+        """
+        pickled = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+
+        # Once one item has been spilled, all following items are too, so
+        # that the in-memory items remain a prefix of the list
+        if len(self._spilled) == 0 and self._memory_size + len(pickled) <= self._memory_budget:
+            self._items.append(item)
+            self._memory_size += len(pickled)
+            return
+
+        with self._lock:
+            if self._file is None:
+                self._file = TemporaryFile("w+b", dir=self._directory)
+
+            self._file.seek(self._file_size)
+            self._file.write(pickled)
+
+        self._spilled.append((self._file_size, len(pickled)))
+        self._file_size += len(pickled)
+
+    def extend(self, items):
+        """
+        Adds each of the items to the end of the list.
+        """
+        for item in items:
+            self.append(item)
+
+    def close(self):
+        """
+        Deletes the temporary file. Spilled items can't be accessed afterwards.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._items) + len(self._spilled)
+
+    @overload
+    def __getitem__(self, index: int) -> ItemType: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ItemType]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ItemType, List[ItemType]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Index {index} out of range for list of length {len(self)}")
+
+        if index < len(self._items):
+            return self._items[index]
+
+        return self._load(*self._spilled[index - len(self._items)])
+
+    def __iter__(self) -> Iterator[ItemType]:
+        yield from self._items
+
+        for offset, length in self._spilled:
+            yield self._load(offset, length)
+
+    def _load(self, offset: int, length: int) -> ItemType:
+        """
+        Loads a spilled item from the file.
+        """
+        with self._lock:
+            if self._file is None:
+                raise ValueError("Can't load spilled items from a closed list")
+
+            self._file.seek(offset)
+            pickled = self._file.read(length)
+
+        return pickle.loads(pickled)
@@ -2,13 +2,24 @@
 Package for general utility functions.
 """
 from ._chain_map import chain_map
+from ._ContentCache import ContentCache
+from ._DatasetIndex import DatasetIndex, file_signature, INDEX_VERSION
 from ._extension_to_regex import extension_to_regex
+from ._FilePrefetcher import FilePrefetcher, take_prefetched_data
 from ._gcd import gcd
 from ._get_files_from_directory import get_files_from_directory
+from ._glob_can_reach import glob_can_reach
 from ._InstanceState import InstanceState, StateType
+from ._place_file import (
+    place_file, copy_file, is_same_file, remove_if_linked, DATA_PLACEMENTS,
+    WRITE_PLACEMENT, COPY_PLACEMENT, HARDLINK_PLACEMENT, SYMLINK_PLACEMENT, REFLINK_PLACEMENT
+)
 from ._polygon_to_poly_array import polygon_to_poly_array
 from ._read_file_list import read_file_list
 from ._recursive_iglob import recursive_iglob
 from ._ReentrantContextManager import ReentrantContextManager
+from ._scandir_iglob import scandir_iglob
+from ._shuffle import buffered_shuffle, external_shuffle
+from ._SpillingList import SpillingList
 from ._WeakIdentityKeyDictionary import WeakIdentityKeyDictionary
 from ._polygons import UNION, INTERSECT, COMBINATIONS, to_polygon, to_polygons, intersect_over_union
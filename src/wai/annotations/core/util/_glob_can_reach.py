@@ -0,0 +1,47 @@
+import fnmatch
+import os
+from typing import List
+
+
+def glob_can_reach(pathname: str, path: str) -> bool:
+    """
+    Whether a (recursive) glob could match the given path, or any path
+    within it if it is a directory. Decided from the paths alone, without
+    consulting the file system, so files which don't exist yet are included.
+
+    :param pathname:    The path to glob.
+    :param path:        The file or directory.
+    :return:            True if the glob could match the path or anything within it.
+    """
+    return _can_reach(_split(pathname), _split(path))
+
+
+def _can_reach(pattern: List[str], path: List[str]) -> bool:
+    """
+    Whether the components of a glob could match the components of a path,
+    with any left over matching within it.
+    """
+    # The whole path has been matched
+    if len(path) == 0:
+        return True
+
+    # The glob ends above the path
+    if len(pattern) == 0:
+        return False
+
+    # A recursive component matches any number of the path's components
+    if pattern[0] == "**":
+        return _can_reach(pattern[1:], path) or _can_reach(pattern, path[1:])
+
+    return fnmatch.fnmatch(path[0], pattern[0]) and _can_reach(pattern[1:], path[1:])
+
+
+def _split(path: str) -> List[str]:
+    """
+    Splits a path into the components of its absolute form.
+    """
+    drive, path = os.path.splitdrive(os.path.abspath(path))
+    if os.altsep is not None:
+        path = path.replace(os.altsep, os.sep)
+
+    return [drive] + [component for component in path.split(os.sep) if component != ""]
@@ -0,0 +1,164 @@
+import errno
+import os
+import shutil
+
+# The ways a data file can be placed in the output
+WRITE_PLACEMENT = "write"
+COPY_PLACEMENT = "copy"
+HARDLINK_PLACEMENT = "hardlink"
+SYMLINK_PLACEMENT = "symlink"
+REFLINK_PLACEMENT = "reflink"
+DATA_PLACEMENTS = (WRITE_PLACEMENT, COPY_PLACEMENT, HARDLINK_PLACEMENT, SYMLINK_PLACEMENT, REFLINK_PLACEMENT)
+
+# The Linux ioctl request which clones a file's extents into another file
+_FICLONE = 0x40049409
+
+# The errors which indicate a kernel-side copy/link isn't possible between two files
+_UNSUPPORTED_ERRORS = frozenset({
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.EPERM, errno.EBADF
+})
+
+
+def place_file(source: str, destination: str, placement: str = COPY_PLACEMENT):
+    """
+    Places the contents of an existing file at another location, without
+    reading them into memory. Links and reflinks fall back to copying if
+    the file system doesn't support them between the two locations.
+
+    :param source:          The file to place.
+    :param destination:     The filename to place it at.
+    :param placement:       How to place the file: 'copy' uses a kernel-side copy,
+                            'hardlink'/'symlink' link the destination to the source,
+                            and 'reflink' clones the source's extents on file systems
+                            which support copy-on-write.
+    """
+    if placement not in DATA_PLACEMENTS:
+        raise ValueError(f"Unknown data placement '{placement}' (expected one of {', '.join(DATA_PLACEMENTS)})")
+
+    # Nothing to do if the source is already at the destination
+    if _is_same_entry(source, destination):
+        if not os.path.exists(source):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), source)
+        return
+    elif _is_placed(source, destination, placement):
+        return
+
+    # Remove any existing file first, so that writing doesn't go through a link left by a previous placement
+    if os.path.lexists(destination):
+        os.remove(destination)
+
+    if placement == HARDLINK_PLACEMENT:
+        if _link(os.link, source, destination):
+            return
+    elif placement == SYMLINK_PLACEMENT:
+        if _link(os.symlink, os.path.abspath(source), destination):
+            return
+    elif placement == REFLINK_PLACEMENT:
+        if _reflink(source, destination):
+            return
+
+    copy_file(source, destination)
+
+
+def copy_file(source: str, destination: str):
+    """
+    Copies a file using the kernel's copy_file_range where available (which
+    the file system may implement as a reflink or server-side copy), falling
+    back to shutil.copyfile (which uses sendfile where available).
+
+    :param source:          The file to copy.
+    :param destination:     The filename to copy it to.
+    """
+    if hasattr(os, "copy_file_range"):
+        with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+            remaining = os.fstat(source_file.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(source_file.fileno(), destination_file.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                else:
+                    return
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRORS:
+                    raise
+
+    shutil.copyfile(source, destination)
+
+
+def is_same_file(filename1: str, filename2: str) -> bool:
+    """
+    Whether two filenames refer to the same existing file.
+    """
+    try:
+        return os.path.samefile(filename1, filename2)
+    except OSError:
+        return False
+
+
+def remove_if_linked(filename: str):
+    """
+    Removes a file if it is a symbolic link, or has other hard links, so
+    that writing to the filename doesn't modify the linked file.
+    """
+    if os.path.islink(filename) or (os.path.exists(filename) and os.stat(filename).st_nlink > 1):
+        os.remove(filename)
+
+
+def _is_same_entry(filename1: str, filename2: str) -> bool:
+    """
+    Whether two filenames are the same directory entry (as opposed to links to the same file).
+    """
+    def normalise(filename: str) -> str:
+        return os.path.join(os.path.realpath(os.path.dirname(os.path.abspath(filename))), os.path.basename(filename))
+
+    return normalise(filename1) == normalise(filename2)
+
+
+def _is_placed(source: str, destination: str, placement: str) -> bool:
+    """
+    Whether the destination is already a link to the source of the given placement.
+    """
+    if not is_same_file(source, destination):
+        return False
+
+    return placement == (SYMLINK_PLACEMENT if os.path.islink(destination) else HARDLINK_PLACEMENT)
+
+
+def _link(link, source: str, destination: str) -> bool:
+    """
+    Creates the destination as a (hard or symbolic) link to the source.
+
+    :return:    Whether the link was created.
+    """
+    try:
+        link(source, destination)
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRORS:
+            raise
+        return False
+
+    return True
+
+
+def _reflink(source: str, destination: str) -> bool:
+    """
+    Clones the source's extents into the destination.
+
+    :return:    Whether the clone was created.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        try:
+            fcntl.ioctl(destination_file.fileno(), _FICLONE, source_file.fileno())
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRORS:
+                raise
+            return False
+
+    return True
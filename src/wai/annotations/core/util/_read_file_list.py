@@ -16,7 +16,7 @@ def read_file_list(filename: str) -> Iterator[str]:
     base_dir = os.path.dirname(filename)
 
     with open(filename, 'r') as file:
-        for line in file.readlines():
+        for line in file:
             # Strip any leading/training whitespace
             line = line.strip()
 
@@ -1,12 +1,16 @@
-import glob
 from typing import Iterator
 
+from ._scandir_iglob import scandir_iglob
 
-def recursive_iglob(pathname: str) -> Iterator[str]:
+
+def recursive_iglob(pathname: str, workers: int = 0) -> Iterator[str]:
     """
-    Same as glob.iglob but is always recursive.
+    Same as glob.iglob but is always recursive. Uses the scandir-based
+    globbing engine, which avoids stat-ing each directory entry.
 
     :param pathname:    The path to glob.
+    :param workers:     The number of threads to list directories with
+                        concurrently (0 to list them on the calling thread).
     :return:            The globbed path.
     """
-    return glob.iglob(pathname, recursive=True)
+    return scandir_iglob(pathname, workers)
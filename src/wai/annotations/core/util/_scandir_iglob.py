@@ -0,0 +1,276 @@
+import fnmatch
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+# Marks a '**' component, which matches any number of nested directories
+_RECURSIVE = object()
+
+# The characters which make a path component a pattern rather than a literal name
+_MAGIC = re.compile(r"[*?[]")
+
+# Whether file names can be matched without normalising their case
+_CASE_SENSITIVE = os.path.normcase("A") == "A"
+
+# The characters which separate path components
+_SEPARATORS = tuple(os.sep + (os.altsep or ""))
+
+# A directory listing, as (name, is-directory) pairs
+Listing = List[Tuple[str, bool]]
+
+
+class _Pattern(NamedTuple):
+    """
+    A path component containing wildcards.
+    """
+    # The compiled pattern
+    regex: Pattern
+
+    # Whether the pattern can match hidden files (only if it begins with a dot, as in glob)
+    include_hidden: bool
+
+
+def scandir_iglob(pathname: str, workers: int = 0) -> Iterator[str]:
+    """
+    Equivalent to glob.iglob(pathname, recursive=True), but walks directories
+    with os.scandir, using the file types it reports instead of stat-ing each
+    entry, and matches names against patterns compiled once up front.
+
+    :param pathname:    The path to glob.
+    :param workers:     The number of threads to list sibling directories with
+                        concurrently (0 to list them on the calling thread). Helps
+                        on network file systems, where each listing has high latency.
+    :return:            An iterator over the matching paths, in the same order
+                        as glob.iglob.
+    """
+    root, components = _parse(pathname)
+
+    if workers > 0:
+        with ThreadPoolExecutor(workers, thread_name_prefix="scandir_iglob") as executor:
+            yield from _Globber(components, executor).glob(root, 0)
+    else:
+        yield from _Globber(components).glob(root, 0)
+
+
+def _parse(pathname: str) -> Tuple[str, List[Union[str, _Pattern, object]]]:
+    """
+    Splits a path into its leading literal part, and the remaining components,
+    each of which is a literal name, a compiled pattern, or the recursive marker.
+    Consecutive literal components are joined together.
+    """
+    drive, path = os.path.splitdrive(pathname)
+
+    separators = os.sep + (os.altsep or "")
+    stripped = path.lstrip(separators)
+    root = drive + path[:len(path) - len(stripped)]
+
+    # Split into names and the separators between them (kept so literal parts are returned as given)
+    tokens = re.split(f"([{re.escape(separators)}]+)", stripped) if stripped != "" else []
+
+    components: List[Union[str, _Pattern, object]] = []
+    for token_index in range(0, len(tokens), 2):
+        name = tokens[token_index]
+        if name == "**":
+            component = _RECURSIVE
+        elif _MAGIC.search(name):
+            component = _Pattern(re.compile(fnmatch.translate(os.path.normcase(name))), _is_hidden(name))
+        else:
+            component = name
+
+        if isinstance(component, str) and len(components) > 0 and isinstance(components[-1], str):
+            components[-1] = components[-1] + tokens[token_index - 1] + component
+        else:
+            components.append(component)
+
+    # The leading literal components don't need matching
+    if len(components) > 1 and isinstance(components[0], str):
+        root = os.path.join(root, components.pop(0))
+
+    return root, components
+
+
+class _Globber:
+    """
+    Matches the components of a parsed path against the file system.
+    """
+    def __init__(self, components: List[Union[str, _Pattern, object]], executor: Optional[ThreadPoolExecutor] = None):
+        # The components to match
+        self._components: List[Union[str, _Pattern, object]] = components
+
+        # The threads to list directories on ahead of time, if any
+        self._executor: Optional[ThreadPoolExecutor] = executor
+
+        # The listings in progress for directories which will be visited
+        self._prefetched: Dict[str, Future] = {}
+
+    def glob(self, path: str, index: int, listing: Optional[Listing] = None) -> Iterator[str]:
+        """
+        Matches the components from the given index onwards, under a path
+        which has matched the components before it.
+
+        :param path:        The matched path.
+        :param index:       The index of the next component to match.
+        :param listing:     The listing of the path, if already listed.
+        :return:            An iterator over the matching paths.
+        """
+        # A path with no components left to match has been found
+        if index == len(self._components):
+            yield path
+            return
+
+        component = self._components[index]
+        is_last = index == len(self._components) - 1
+
+        if component is _RECURSIVE:
+            # The directory itself, then all its descendants
+            if is_last:
+                if path != "" and os.path.isdir(path):
+                    yield os.path.join(path, "")
+                yield from self._walk(path)
+            else:
+                yield from self._glob_recursive(path, index)
+
+        elif isinstance(component, str):
+            path = os.path.join(path, component)
+            if not is_last:
+                yield from self.glob(path, index + 1)
+            elif os.path.lexists(path):
+                yield path
+
+        else:
+            prefix, match, include_hidden = _prefix(path), component.regex.match, component.include_hidden
+            matches = [
+                prefix + name
+                for name, is_dir in (listing if listing is not None else self._list(path))
+                if (include_hidden or name[0] != ".")
+                and (is_last or is_dir)
+                and match(name if _CASE_SENSITIVE else os.path.normcase(name))
+            ]
+
+            if is_last:
+                yield from matches
+                return
+
+            self._prefetch(self._listed_path(match, index + 1) for match in matches)
+
+            for match in matches:
+                yield from self.glob(match, index + 1)
+
+    def _glob_recursive(self, path: str, index: int) -> Iterator[str]:
+        """
+        Matches the components after a (non-final) '**' component under a
+        directory and each of its non-hidden descendants, depth-first, listing
+        each directory only once.
+        """
+        listing = self._list(path)
+
+        yield from self.glob(path, index + 1, listing)
+
+        prefix = _prefix(path)
+        subdirectories = [
+            prefix + name
+            for name, is_dir in listing
+            if is_dir and name[0] != "."
+        ]
+
+        self._prefetch(subdirectories)
+
+        for subdirectory in subdirectories:
+            yield from self._glob_recursive(subdirectory, index)
+
+    def _walk(self, path: str) -> Iterator[str]:
+        """
+        Iterates over the non-hidden descendants of a directory, depth-first,
+        in the same order as glob.
+        """
+        prefix = _prefix(path)
+        listing = [
+            (prefix + name, is_dir)
+            for name, is_dir in self._list(path)
+            if name[0] != "."
+        ]
+
+        self._prefetch(child for child, is_dir in listing if is_dir)
+
+        for child, is_dir in listing:
+            yield child
+            if is_dir:
+                yield from self._walk(child)
+
+    def _listed_path(self, path: str, index: int) -> Optional[str]:
+        """
+        Gets the directory which matching the components from the given
+        index under a path will list first, if any.
+        """
+        if index >= len(self._components):
+            return None
+
+        component = self._components[index]
+        if isinstance(component, str):
+            return os.path.join(path, component) if index < len(self._components) - 1 else None
+
+        return path
+
+    def _prefetch(self, paths: Iterator[Optional[str]]):
+        """
+        Starts listing directories which are about to be visited, if listing
+        on other threads.
+        """
+        if self._executor is None:
+            return
+
+        for path in paths:
+            if path is not None and path not in self._prefetched:
+                self._prefetched[path] = self._executor.submit(_list_directory, path)
+
+    def _list(self, path: str) -> Listing:
+        """
+        Lists a directory, using the prefetched listing if there is one.
+        """
+        prefetched = self._prefetched.pop(path, None)
+        if prefetched is not None:
+            return prefetched.result()
+
+        return _list_directory(path)
+
+
+def _list_directory(path: str) -> Listing:
+    """
+    Lists the entries of a directory, with whether each is a directory
+    (following symbolic links, as glob does). Directories which can't be
+    listed are treated as empty.
+    """
+    try:
+        with os.scandir(path if path != "" else os.curdir) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return []
+
+    try:
+        return [(entry.name, entry.is_dir()) for entry in entries]
+    except OSError:
+        return [(entry.name, _is_dir(entry)) for entry in entries]
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    """
+    Whether a directory entry is a directory, treating entries which can't
+    be checked (e.g. broken links on some platforms) as files.
+    """
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _prefix(path: str) -> str:
+    """
+    Gets the prefix to add to names in a directory to join them to its path
+    (as os.path.join would, but without the overhead for every name).
+    """
+    return path if path == "" or path.endswith(_SEPARATORS) else path + os.sep
+
+
+def _is_hidden(name: str) -> bool:
+    return name[0] == "."
@@ -0,0 +1,105 @@
+import pickle
+from random import Random
+from tempfile import TemporaryFile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TypeVar
+
+ItemType = TypeVar("ItemType")
+
+# The number of temporary files an external shuffle scatters items over
+_EXTERNAL_SHUFFLE_BUCKETS = 64
+
+
+def buffered_shuffle(items: Iterable[ItemType], random: Random, buffer_size: int) -> Iterator[ItemType]:
+    """
+    Shuffles a stream of items approximately, by filling a buffer of a fixed size
+    and then yielding a randomly-chosen item from it as each new item arrives.
+    Only the buffer is held in memory, but items can only move back by at most
+    the buffer size (and forward by any amount, with decreasing likelihood).
+
+    :param items:       The items to shuffle.
+    :param random:      The source of randomness.
+    :param buffer_size: The number of items to hold in the buffer.
+    :return:            An iterator over the items in shuffled order.
+    """
+    if buffer_size < 1:
+        raise ValueError(f"Shuffle buffer size must be at least 1, got {buffer_size}")
+
+    buffer: List[ItemType] = []
+
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+
+        index = random.randrange(buffer_size)
+        yield buffer[index]
+        buffer[index] = item
+
+    random.shuffle(buffer)
+    yield from buffer
+
+
+def external_shuffle(
+        items: Iterable[ItemType],
+        random: Random,
+        max_in_memory: int,
+        directory: Optional[str] = None
+) -> Iterator[ItemType]:
+    """
+    Shuffles a stream of items exactly (every permutation is equally likely),
+    holding at most a fixed number in memory. If there are more items than
+    that, they are scattered uniformly at random over temporary files on disk,
+    which are then each shuffled in turn (recursively, if one is still too
+    large) and concatenated.
+
+    :param items:           The items to shuffle. Must be picklable.
+    :param random:          The source of randomness.
+    :param max_in_memory:   The maximum number of items to hold in memory at once.
+    :param directory:       The directory to create the temporary files in
+                            (the system default if None).
+    :return:                An iterator over the items in shuffled order.
+    """
+    if max_in_memory < 1:
+        raise ValueError(f"Shuffle memory must hold at least 1 item, got {max_in_memory}")
+
+    iterator = iter(items)
+
+    # Shuffle in memory if all items fit
+    buffer: List[ItemType] = []
+    for item in iterator:
+        buffer.append(item)
+        if len(buffer) > max_in_memory:
+            break
+    else:
+        random.shuffle(buffer)
+        yield from buffer
+        return
+
+    buckets: List[BinaryIO] = [TemporaryFile("w+b", dir=directory) for _ in range(_EXTERNAL_SHUFFLE_BUCKETS)]
+    try:
+        # First pass: scatter the items over the buckets
+        for item in buffer:
+            pickle.dump(item, buckets[random.randrange(len(buckets))], pickle.HIGHEST_PROTOCOL)
+        del buffer
+        for item in iterator:
+            pickle.dump(item, buckets[random.randrange(len(buckets))], pickle.HIGHEST_PROTOCOL)
+
+        # Second pass: shuffle each bucket
+        for bucket in buckets:
+            bucket.seek(0)
+            yield from external_shuffle(_load_all(bucket), random, max_in_memory, directory)
+            bucket.close()
+    finally:
+        for bucket in buckets:
+            bucket.close()
+
+
+def _load_all(file: BinaryIO) -> Iterator:
+    """
+    Loads the pickled items from a file, to its end.
+    """
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
@@ -36,7 +36,7 @@ class Audio(Data):
         """
         if (self._data is None) and (self._audio_data is not None):
             self._data = convert_audio_format(self._audio_data[0], self._audio_data[1], self._format)
-        return self._data
+        return super().data
 
     @property
     def audio_data(self):
@@ -5,8 +5,7 @@ from typing import Optional, Tuple
 from PIL import Image as PILImage
 
 from ...core.domain import Data
-from ...core.util import InstanceState
-from .util import convert_image_format
+from .util import convert_image_format, probe_image_size, pil_image_cache
 from ._ImageFormat import ImageFormat
 
 
@@ -28,19 +27,26 @@ class Image(Data):
             else ImageFormat.for_filename(filename)
         )
 
-        self._size: Optional[Tuple[int, int]] = (
-            size if size is not None
-            else (self.pil_image.width, self.pil_image.height) if self.pil_image is not None
-            else None
-        )
+        # The dimensions of the image, determined from the data when first needed if not given
+        self._size: Optional[Tuple[int, int]] = size
 
-    # The PIL image representation of this image data
-    pil_image: Optional[PILImage.Image] = InstanceState(
-        lambda self: (
-            PILImage.open(io.BytesIO(self.data)) if self.data is not None
-            else None
+    @property
+    def pil_image(self) -> Optional[PILImage.Image]:
+        """
+        The PIL image representation of this image data. Opened images are
+        kept in a process-wide cache with a bounded memory budget, so may be
+        re-opened if they have been evicted or released in the meantime.
+        """
+        return pil_image_cache.get(
+            self,
+            lambda: (
+                PILImage.open(io.BytesIO(self.data)) if self.data is not None
+                else None
+            )
         )
-    )
+
+    def release(self):
+        pil_image_cache.release(self)
 
     @classmethod
     def from_file_data(cls, file_name: str, file_data: bytes) -> 'Image':
@@ -64,7 +70,7 @@ class Image(Data):
 
         return Image(
             os.path.join(self.path, to_format.replace_extension(self.filename)),
-            convert_image_format(self.data, to_format.pil_format_string) if self.data is not None else None,
+            convert_image_format(self.data, to_format.pil_format_string, self.pil_image) if self.data is not None else None,
             to_format,
             self.size
         )
@@ -81,8 +87,31 @@ class Image(Data):
         """
         Gets the (width, height) dimensions of the image.
         """
+        if self._size is None:
+            self._size = self._probe_size()
         return self._size if self._size is not None else (-1, -1)
 
+    def _probe_size(self) -> Optional[Tuple[int, int]]:
+        """
+        Determines the dimensions of the image from its header, falling back
+        to opening it with PIL if the header can't be parsed.
+        """
+        # Read just the header from the source file if the data is deferred
+        if self.is_deferred:
+            try:
+                with open(self._source_file, "rb") as file:
+                    size = probe_image_size(file)
+                if size is not None:
+                    return size
+            except OSError:
+                pass
+        elif self.data is not None:
+            size = probe_image_size(io.BytesIO(self.data))
+            if size is not None:
+                return size
+
+        return (self.pil_image.width, self.pil_image.height) if self.pil_image is not None else None
+
     @property
     def width(self) -> int:
         """
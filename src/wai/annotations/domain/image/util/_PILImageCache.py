@@ -0,0 +1,166 @@
+import os
+import weakref
+from threading import RLock
+from typing import Callable, Optional, OrderedDict, Tuple
+
+from PIL import Image as PILImage
+
+# The environment variable which sets the budget of the shared cache, in megabytes
+BUDGET_ENV_VAR = "WAIANN_PIL_CACHE_MB"
+
+# The default budget of the shared cache, in megabytes
+DEFAULT_BUDGET_MB = 256
+
+# The number of bytes per band of pixel data for PIL modes with more than one
+_BYTES_PER_BAND = {"I": 4, "F": 4, "I;16": 2, "I;16B": 2, "I;16L": 2, "I;16N": 2}
+
+
+class PILImageCache:
+    """
+    A least-recently-used cache of the PIL images opened for image data,
+    bounded by the memory their decoded pixels would occupy. Entries are
+    removed when the owning object is garbage-collected or explicitly
+    released, or evicted when the cache exceeds its budget (in which case
+    the image is simply re-opened if it is needed again).
+    """
+    def __init__(self, budget: int):
+        # The maximum estimated size of the cached images, in bytes
+        self._budget: int = budget
+
+        # The cached images, least-recently used first, by the identity of their owners
+        self._entries: OrderedDict[int, Tuple[weakref.ref, PILImage.Image, int]] = OrderedDict()
+
+        # The estimated size of the cached images, in bytes
+        self._size: int = 0
+
+        # Guards the entries (re-entrant, as releasing garbage-collected
+        # owners can happen while the lock is held)
+        self._lock: RLock = RLock()
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget: int):
+        with self._lock:
+            self._budget = budget
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """
+        The estimated size of the cached images, in bytes.
+        """
+        return self._size
+
+    def get(self, owner, open_image: Callable[[], Optional[PILImage.Image]]) -> Optional[PILImage.Image]:
+        """
+        Gets the PIL image for an owning object, opening it if it is not cached.
+
+        :param owner:       The object the image belongs to.
+        :param open_image:  Opens the image if it is not cached.
+        :return:            The PIL image.
+        """
+        key = id(owner)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is owner:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        image = open_image()
+        if image is None:
+            return None
+
+        size = estimate_decoded_size(image)
+        if size > self._budget:
+            return image
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (weakref.ref(owner, lambda ref: self._remove(key, ref)), image, size)
+            self._size += size
+            self._evict()
+
+        return image
+
+    def release(self, owner):
+        """
+        Removes the PIL image for an owning object from the cache.
+
+        :param owner:   The object the image belongs to.
+        """
+        with self._lock:
+            entry = self._entries.get(id(owner))
+            if entry is not None and entry[0]() is owner:
+                self._remove(id(owner))
+
+    def clear(self):
+        """
+        Removes all images from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: int, ref: Optional[weakref.ref] = None):
+        """
+        Removes an entry from the cache, if it is present (and belongs to
+        the given reference, if given).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (ref is not None and entry[0] is not ref):
+                return
+
+            del self._entries[key]
+            self._size -= entry[2]
+
+    def _evict(self):
+        """
+        Evicts the least-recently used images until within budget.
+        """
+        while self._size > self._budget and len(self._entries) > 0:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._size -= size
+
+
+def estimate_decoded_size(image: PILImage.Image) -> int:
+    """
+    Estimates the memory occupied by a PIL image's pixels once decoded.
+
+    :param image:   The PIL image.
+    :return:        The size in bytes.
+    """
+    bands = len(image.getbands())
+    return image.width * image.height * bands * _BYTES_PER_BAND.get(image.mode, 1)
+
+
+def _default_budget() -> int:
+    """
+    Gets the budget of the shared cache from the environment.
+    """
+    try:
+        return int(float(os.getenv(BUDGET_ENV_VAR, DEFAULT_BUDGET_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_BUDGET_MB * 1024 * 1024
+
+
+# The cache shared by all images in this process
+pil_image_cache: PILImageCache = PILImageCache(_default_budget())
+
+
+def set_pil_image_cache_budget(megabytes: int):
+    """
+    Sets the budget of the shared cache, both in this process and in any
+    (worker) processes it starts from now on.
+
+    :param megabytes:   The budget, in megabytes.
+    """
+    if megabytes < 0:
+        raise ValueError(f"Image cache budget can't be negative, got {megabytes}")
+
+    os.environ[BUDGET_ENV_VAR] = str(megabytes)
+    pil_image_cache.budget = megabytes * 1024 * 1024
@@ -1,2 +1,4 @@
 from ._convert_image_format import convert_image_format
 from ._get_associated_image import get_associated_image
+from ._probe_image_size import probe_image_size
+from ._PILImageCache import PILImageCache, pil_image_cache, estimate_decoded_size, set_pil_image_cache_budget
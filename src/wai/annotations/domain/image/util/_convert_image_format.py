@@ -1,22 +1,25 @@
 import io
+from typing import Optional
 
 from PIL import Image
 
 from ....image_utils import remove_alpha_channel
 
 
-def convert_image_format(image_data: bytes, to_format: str) -> bytes:
+def convert_image_format(image_data: bytes, to_format: str, image: Optional[Image.Image] = None) -> bytes:
     """
     Converts image data from one format to another.
 
     :param image_data:  The binary image data to convert.
     :param to_format:   The format to convert the image data to.
+    :param image:       The image already opened from the data, if any.
     """
     # Uppercase the format
     to_format = to_format.upper()
 
-    # Read the image data into an image
-    image = Image.open(io.BytesIO(image_data))
+    # Read the image data into an image, unless already opened
+    if image is None:
+        image = Image.open(io.BytesIO(image_data))
 
     # Abort if image already in format
     if image.format == to_format:
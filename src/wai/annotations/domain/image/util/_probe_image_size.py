@@ -0,0 +1,111 @@
+import struct
+from typing import BinaryIO, Optional, Tuple
+
+# The signatures at the start of each supported image format
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+BMP_SIGNATURE = b"BM"
+
+# The JPEG start-of-frame markers, which hold the image dimensions (the
+# other markers in the range C0-CF are DHT, JPG and DAC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# The JPEG markers which stand alone, without a length-prefixed segment
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD9)) | {0x01}
+
+
+def probe_image_size(file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    Determines the dimensions of a PNG, JPEG or BMP image by parsing its
+    header, without decoding any pixel data. Only reads as far into the
+    file as the header which holds the dimensions.
+
+    :param file:    The binary image file, positioned at the start of the image.
+    :return:        The (width, height) of the image, or None if the format
+                    isn't recognised or the header is malformed.
+    """
+    signature = file.read(8)
+
+    if signature.startswith(PNG_SIGNATURE):
+        return _probe_png_size(file)
+    elif signature.startswith(JPEG_SIGNATURE):
+        return _probe_jpeg_size(signature[2:], file)
+    elif signature.startswith(BMP_SIGNATURE):
+        return _probe_bmp_size(signature[2:], file)
+
+    return None
+
+
+def _probe_png_size(file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    Reads the dimensions from the IHDR chunk, which must come first.
+    """
+    chunk = file.read(16)
+    if len(chunk) < 16 or chunk[4:8] != b"IHDR":
+        return None
+
+    return struct.unpack(">II", chunk[8:16])
+
+
+def _probe_jpeg_size(buffered: bytes, file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    Scans the marker segments for the start-of-frame segment.
+    """
+    def read(size: int) -> bytes:
+        nonlocal buffered
+        result, buffered = buffered[:size], buffered[size:]
+        if len(result) < size:
+            result += file.read(size - len(result))
+        return result
+
+    while True:
+        # Find the next marker, skipping any fill bytes
+        byte = read(1)
+        while byte != b"\xff":
+            if byte == b"":
+                return None
+            byte = read(1)
+        while byte == b"\xff":
+            byte = read(1)
+        if byte == b"":
+            return None
+        marker = byte[0]
+
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+
+        length_bytes = read(2)
+        if len(length_bytes) < 2:
+            return None
+        length, = struct.unpack(">H", length_bytes)
+
+        if marker in JPEG_SOF_MARKERS:
+            frame = read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return width, height
+
+        # Skip the segment
+        if length < 2 or len(read(length - 2)) < length - 2:
+            return None
+
+
+def _probe_bmp_size(buffered: bytes, file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    Reads the dimensions from the DIB header following the file header.
+    """
+    header = buffered + file.read(24 - len(buffered))
+    if len(header) < 24:
+        return None
+
+    dib_header_size, = struct.unpack("<I", header[12:16])
+
+    # OS/2 BITMAPCOREHEADER has 16-bit unsigned dimensions
+    if dib_header_size == 12:
+        return struct.unpack("<HH", header[16:20])
+
+    # Windows headers have 32-bit signed dimensions, with a negative height for top-down images
+    width, height = struct.unpack("<ii", header[16:24])
+
+    return width, abs(height)
@@ -5,6 +5,7 @@ from wai.common.file.spec import Spectrum as SpectrumBase
 from wai.common.file.spec import read_spectrum
 
 from ...core.domain import Data
+from ...core.util import InstanceState
 
 
 class Spectrum(Data):
@@ -18,10 +19,13 @@ class Spectrum(Data):
     ):
         super().__init__(filename, data)
 
-        self._spectrum_base: SpectrumBase = (
-            read_spectrum(StringIO(data.decode("utf-8"))) if data is not None
+    # The parsed representation of the spectrum data
+    _spectrum_base: SpectrumBase = InstanceState(
+        lambda self: (
+            read_spectrum(StringIO(self.data.decode("utf-8"))) if self.data is not None
             else SpectrumBase()
         )
+    )
 
     def __str__(self):
         return str(self._spectrum_base)
@@ -1,7 +1,6 @@
-from wai.common.cli.options import TypedOption
-
 from wai.annotations.core.component import SinkComponent
-from wai.annotations.core.component.util import AnnotationFileProcessor
+from wai.annotations.core.stream.util import RequiresNoFinalisation
+from wai.annotations.core.component.util import AnnotationFileProcessor, WithDataPlacement, WithOutputDirectory
 from wai.annotations.core.stream import ThenFunction
 from wai.annotations.domain.audio import Audio
 from wai.annotations.domain.audio.speech import SpeechInstance, Transcription
@@ -29,22 +28,18 @@ class AudioReaderSP(AnnotationFileProcessor[SpeechInstance]):
 
 
 class AudioWriterSP(
+    RequiresNoFinalisation,
+    WithDataPlacement,
+    WithOutputDirectory,
     SinkComponent[SpeechInstance]
 ):
     """
     Writes the audio files to the specified output directory.
     """
 
-    output_dir: str = TypedOption(
-        "-o", "--output-dir",
-        type=str,
-        default=".",
-        help="the directory to write the audio files to"
-    )
+    @classmethod
+    def get_help_text_for_output_dir_option(cls) -> str:
+        return "the directory to write the audio files to"
 
     def consume_element(self, element: SpeechInstance):
-        element.data.write_data_if_present(self.output_dir)
-
-    def finish(self):
-        pass
-
+        self.write_data_file(element.data, self.output_dir)
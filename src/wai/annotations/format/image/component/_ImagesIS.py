@@ -1,10 +1,10 @@
 from wai.annotations.core.component import SinkComponent
-from wai.annotations.core.component.util import AnnotationFileProcessor
+from wai.annotations.core.stream.util import RequiresNoFinalisation
+from wai.annotations.core.component.util import AnnotationFileProcessor, WithDataPlacement, WithOutputDirectory
 from wai.annotations.core.stream import ThenFunction
 from wai.annotations.domain.image.segmentation import ImageSegmentationAnnotation
 from wai.annotations.domain.image import Image
 from wai.annotations.domain.image.segmentation import ImageSegmentationInstance
-from wai.common.cli.options import TypedOption
 
 
 class ImagesReaderIS(AnnotationFileProcessor[ImageSegmentationInstance]):
@@ -30,21 +30,18 @@ class ImagesReaderIS(AnnotationFileProcessor[ImageSegmentationInstance]):
 
 
 class ImagesWriterIS(
+    RequiresNoFinalisation,
+    WithDataPlacement,
+    WithOutputDirectory,
     SinkComponent[ImageSegmentationInstance]
 ):
     """
     Writes the images to the specified output directory.
     """
 
-    output_dir: str = TypedOption(
-        "-o", "--output-dir",
-        type=str,
-        default=".",
-        help="the directory to write the images to"
-    )
+    @classmethod
+    def get_help_text_for_output_dir_option(cls) -> str:
+        return "the directory to write the images to"
 
     def consume_element(self, element: ImageSegmentationInstance):
-        element.data.write_data_if_present(self.output_dir)
-
-    def finish(self):
-        pass
+        self.write_data_file(element.data, self.output_dir)
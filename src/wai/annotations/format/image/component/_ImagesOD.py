@@ -1,10 +1,10 @@
 from wai.annotations.core.component import SinkComponent
-from wai.annotations.core.component.util import AnnotationFileProcessor
+from wai.annotations.core.stream.util import RequiresNoFinalisation
+from wai.annotations.core.component.util import AnnotationFileProcessor, WithDataPlacement, WithOutputDirectory
 from wai.annotations.core.stream import ThenFunction
 from wai.annotations.domain.image import Image
 from wai.common.adams.imaging.locateobjects import LocatedObjects
 from wai.annotations.domain.image.object_detection import ImageObjectDetectionInstance
-from wai.common.cli.options import TypedOption
 
 
 class ImagesReaderOD(AnnotationFileProcessor[ImageObjectDetectionInstance]):
@@ -29,22 +29,18 @@ class ImagesReaderOD(AnnotationFileProcessor[ImageObjectDetectionInstance]):
 
 
 class ImagesWriterOD(
+    RequiresNoFinalisation,
+    WithDataPlacement,
+    WithOutputDirectory,
     SinkComponent[ImageObjectDetectionInstance]
 ):
     """
     Writes the images to the specified output directory.
     """
 
-    output_dir: str = TypedOption(
-        "-o", "--output-dir",
-        type=str,
-        default=".",
-        help="the directory to write the images to"
-    )
+    @classmethod
+    def get_help_text_for_output_dir_option(cls) -> str:
+        return "the directory to write the images to"
 
     def consume_element(self, element: ImageObjectDetectionInstance):
-        element.data.write_data_if_present(self.output_dir)
-
-    def finish(self):
-        pass
-
+        self.write_data_file(element.data, self.output_dir)
@@ -1,10 +1,10 @@
 from wai.annotations.core.component import SinkComponent
-from wai.annotations.core.component.util import AnnotationFileProcessor
+from wai.annotations.core.stream.util import RequiresNoFinalisation
+from wai.annotations.core.component.util import AnnotationFileProcessor, WithDataPlacement, WithOutputDirectory
 from wai.annotations.core.stream import ThenFunction
 from wai.annotations.domain.classification import Classification
 from wai.annotations.domain.spectra import Spectrum
 from wai.annotations.domain.spectra.classification import SpectrumClassificationInstance
-from wai.common.cli.options import TypedOption
 
 
 class SpectraReaderSC(AnnotationFileProcessor[SpectrumClassificationInstance]):
@@ -29,21 +29,17 @@ class SpectraReaderSC(AnnotationFileProcessor[SpectrumClassificationInstance]):
 
 
 class SpectraWriterSC(
+    RequiresNoFinalisation,
+    WithDataPlacement,
+    WithOutputDirectory,
     SinkComponent[SpectrumClassificationInstance]
 ):
     """
     Writes the spectra to the specified output directory.
     """
-    output_dir: str = TypedOption(
-        "-o", "--output-dir",
-        type=str,
-        default=".",
-        help="the directory to write the spectra to"
-    )
+    @classmethod
+    def get_help_text_for_output_dir_option(cls) -> str:
+        return "the directory to write the spectra to"
 
     def consume_element(self, element: SpectrumClassificationInstance):
-        element.data.write_data_if_present(self.output_dir)
-
-    def finish(self):
-        pass
-
+        self.write_data_file(element.data, self.output_dir)
@@ -1,8 +1,14 @@
+from typing import Callable, List
+
 from ....core.component import SinkComponent
+from ....core.component.util import ShardableOutput
+from ....core.stream.util import RequiresNoFinalisation
 from ....core.domain import Instance
 
 
 class VoidWriter(
+    ShardableOutput,
+    RequiresNoFinalisation,
     SinkComponent[Instance]
 ):
     """
@@ -11,5 +17,15 @@ class VoidWriter(
     def consume_element(self, element: Instance):
         pass
 
-    def finish(self):
+    def consume_batch(self, elements: List[Instance]):
+        pass
+
+    def redirect_output(self, redirect: Callable[[str], str]):
+        # Writes no files
         pass
+
+    def owns_output_file(self, filename: str) -> bool:
+        return False
+
+    def can_merge_shard_files(self) -> bool:
+        return True
@@ -3,6 +3,7 @@ from abc import abstractmethod
 from wai.common.adams.imaging.locateobjects import LocatedObject
 
 from ....core.component import ProcessorComponent
+from ....core.component.util import WithWorkers
 from ....core.stream import ThenFunction, DoneFunction
 from ....core.stream.util import RequiresNoFinalisation
 from ....domain.image.object_detection import ImageObjectDetectionDomainSpecifier
@@ -12,6 +13,7 @@ ObjectDetectionInstance = ImageObjectDetectionDomainSpecifier.instance_type()
 
 class Coercion(
     RequiresNoFinalisation,
+    WithWorkers,
     ProcessorComponent[ObjectDetectionInstance, ObjectDetectionInstance]
 ):
     """
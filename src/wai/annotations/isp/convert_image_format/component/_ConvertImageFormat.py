@@ -1,13 +1,27 @@
+import hashlib
+import os
+from multiprocessing import Array
+from typing import Optional, Tuple
+
+import PIL
 from wai.common.cli.options import TypedOption
 
 from ....core.component import ProcessorComponent
-from ....core.stream import ThenFunction, DoneFunction
-from ....core.stream.util import RequiresNoFinalisation
-from ....domain.image import ImageFormat, ImageInstance
+from ....core.component.util import WithWorkers
+from ....core.stream import StreamProcessor, ThenFunction, DoneFunction
+from ....core.stream.util import RequiresNoFinalisation, PROCESS_WORKERS
+from ....core.util import ContentCache, InstanceState
+from ....domain.image import Image, ImageFormat, ImageInstance
+from ....domain.image.util import convert_image_format
+
+# The indices of the cache statistics
+_HITS = 0
+_MISSES = 1
 
 
 class ConvertImageFormat(
     RequiresNoFinalisation,
+    WithWorkers,
     ProcessorComponent[ImageInstance, ImageInstance]
 ):
     """
@@ -22,6 +36,38 @@ class ConvertImageFormat(
         help="format to convert images to"
     )
 
+    cache_dir: Optional[str] = TypedOption(
+        "--cache-dir",
+        type=str,
+        metavar="DIR",
+        help="the directory to cache converted images in between runs, keyed by the content of "
+             "the source image and the conversion performed (no caching if not given)"
+    )
+
+    cache_size: int = TypedOption(
+        "--cache-size",
+        type=int,
+        default=1024,
+        metavar="MB",
+        help="the maximum size of the conversion cache, in megabytes; the least-recently "
+             "used conversions are evicted beyond this size"
+    )
+
+    # The cache of converted images
+    cache: Optional[ContentCache] = InstanceState(
+        lambda self: (
+            ContentCache(self.cache_dir, self.cache_size * 1024 * 1024) if self.cache_dir is not None
+            else None
+        )
+    )
+
+    # The number of conversions found/not found in the cache (shared with any worker processes)
+    _cache_statistics = None
+
+    def start(self):
+        if self.cache is not None:
+            self._cache_statistics = Array("q", 2)
+
     def process_element(
             self,
             element: ImageInstance,
@@ -30,7 +76,112 @@ class ConvertImageFormat(
     ):
         then(
             type(element)(
-                element.data.convert(self.format),
+                self.convert(element.data),
                 element.annotations
             )
         )
+
+    def finish(
+            self,
+            then: ThenFunction[ImageInstance],
+            done: DoneFunction
+    ):
+        # Report the effectiveness of the cache
+        if self._cache_statistics is not None:
+            hits, misses = self._cache_statistics[_HITS], self._cache_statistics[_MISSES]
+            self.logger.info(
+                f"Conversion cache: {hits} hits, {misses} misses "
+                f"({100 * hits / (hits + misses) if hits + misses > 0 else 0.0:.1f}% hit rate)"
+            )
+
+        super().finish(then, done)
+
+    def parallelise(self) -> StreamProcessor:
+        # Only send the image data to worker processes, not whole instances
+        if self.is_parallel and self.worker_type == PROCESS_WORKERS:
+            from ._ParallelConvertImageFormat import ParallelConvertImageFormat
+            return ParallelConvertImageFormat(self, self.workers, ordered=not self.unordered)
+
+        return super().parallelise()
+
+    def convert(self, image: Image) -> Image:
+        """
+        Converts an image to the configured format, reusing any previous
+        conversion of the same image content from the cache.
+
+        :param image:   The image to convert.
+        :return:        The converted image.
+        """
+        if not self.requires_transcoding(image):
+            return image.convert(self.format)
+
+        key, data = self.lookup(image)
+        if data is None:
+            data = convert_image_format(image.data, self.format.pil_format_string, image.pil_image)
+            self.store(key, data)
+
+        return self.converted_image(image, data)
+
+    def requires_transcoding(self, image: Image) -> bool:
+        """
+        Whether converting an image requires its data to be transcoded
+        (rather than the format being unchanged, or there being no data).
+        """
+        return image.format is not self.format and image.data is not None
+
+    def lookup(self, image: Image) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Looks up a previous conversion of an image in the cache.
+
+        :param image:   The image to convert.
+        :return:        The key of the conversion in the cache, and the converted
+                        data if it was cached. The key is None if not caching.
+        """
+        if self.cache is None:
+            return None, None
+
+        key = ContentCache.make_key(
+            hashlib.sha256(image.data).hexdigest(),
+            self.format.pil_format_string,
+            PIL.__version__
+        )
+
+        data = self.cache.get(key)
+        self._count(_HITS if data is not None else _MISSES)
+
+        return key, data
+
+    def store(self, key: Optional[str], data: bytes):
+        """
+        Stores the converted data of an image in the cache.
+
+        :param key:     The key from 'lookup', or None if not caching.
+        :param data:    The converted data.
+        """
+        if key is not None:
+            self.cache.put(key, data)
+
+    def converted_image(self, image: Image, data: bytes) -> Image:
+        """
+        Creates the converted image from its transcoded data.
+
+        :param image:   The image which was converted.
+        :param data:    The converted data.
+        :return:        The converted image.
+        """
+        return Image(
+            os.path.join(image.path, self.format.replace_extension(image.filename)),
+            data,
+            self.format,
+            image.size
+        )
+
+    def _count(self, statistic: int):
+        """
+        Counts a cache hit/miss.
+        """
+        if self._cache_statistics is None:
+            return
+
+        with self._cache_statistics.get_lock():
+            self._cache_statistics[statistic] += 1
@@ -0,0 +1,150 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Deque, Optional, Tuple, TYPE_CHECKING
+
+from ....core.stream import StreamProcessor, ThenFunction, DoneFunction
+from ....domain.image import ImageInstance
+from ....domain.image.util import convert_image_format
+
+if TYPE_CHECKING:
+    from ._ConvertImageFormat import ConvertImageFormat
+
+
+class ParallelConvertImageFormat(StreamProcessor[ImageInstance, ImageInstance]):
+    """
+    Runs the transcoding of a convert-image-format component on a pool of
+    worker processes. Unlike running the component on process workers, only
+    the image data is sent to the workers (and the converted data returned),
+    rather than the whole instance with its annotations, and cached conversions
+    are looked up without involving the workers at all.
+    """
+    def __init__(
+            self,
+            converter: 'ConvertImageFormat',
+            workers: int,
+            ordered: bool = True,
+            max_in_flight: Optional[int] = None
+    ):
+        if workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {workers}")
+
+        # The component performing the conversion
+        self._converter: 'ConvertImageFormat' = converter
+
+        # The number of worker processes
+        self._workers: int = workers
+
+        # Whether outputs must be forwarded in input order
+        self._ordered: bool = ordered
+
+        # The maximum number of images to have in the pool at once
+        self._max_in_flight: int = max_in_flight if max_in_flight is not None else 2 * workers
+
+        # The pool of workers (only exists while processing a stream)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # The instances currently being converted, with the key to cache the
+        # converted data under (if not already cached) and the pending
+        # converted data of each, in order of submission
+        self._pending: Deque[Tuple[ImageInstance, Optional[str], Future]] = deque()
+
+    @property
+    def processor(self) -> 'ConvertImageFormat':
+        """
+        The component whose transcoding is run in parallel.
+        """
+        return self._converter
+
+    def start(self):
+        self._converter.start()
+        self._pending = deque()
+        self._executor = ProcessPoolExecutor(self._workers)
+
+    def process_element(
+            self,
+            element: ImageInstance,
+            then: ThenFunction[ImageInstance],
+            done: DoneFunction
+    ):
+        image = element.data
+
+        key, data = None, Future()
+        if not self._converter.requires_transcoding(image):
+            data.set_result(None)
+        else:
+            # Only transcode images which haven't been converted before
+            key, cached = self._converter.lookup(image)
+            if cached is not None:
+                key = None
+                data.set_result(cached)
+            else:
+                data = self._executor.submit(
+                    convert_image_format,
+                    image.data,
+                    self._converter.format.pil_format_string
+                )
+
+        self._pending.append((element, key, data))
+
+        # Forward any results which are ready, blocking if too many are in flight
+        self._forward_results(then, block=len(self._pending) >= self._max_in_flight)
+
+    def finish(
+            self,
+            then: ThenFunction[ImageInstance],
+            done: DoneFunction
+    ):
+        try:
+            # Forward all remaining results
+            while len(self._pending) > 0:
+                self._forward_results(then, block=True)
+
+            self._converter.finish(then, done)
+        finally:
+            self._shutdown()
+
+    def _forward_results(self, then: ThenFunction[ImageInstance], block: bool):
+        """
+        Forwards the converted instances whose data is ready.
+
+        :param then:    The function to forward converted instances with.
+        :param block:   Whether to wait for at least one conversion to complete.
+        """
+        if self._ordered:
+            if block:
+                self._pending[0][2].result()
+            completed = []
+            while len(self._pending) > 0 and self._pending[0][2].done():
+                completed.append(self._pending.popleft())
+        else:
+            if block:
+                wait([data for _, _, data in self._pending], return_when=FIRST_COMPLETED)
+            completed = [pending for pending in self._pending if pending[2].done()]
+            for pending in completed:
+                self._pending.remove(pending)
+
+        for element, key, data in completed:
+            converted_data = data.result()
+
+            # Images which needed no transcoding are converted directly
+            if converted_data is None:
+                converted = self._converter.convert(element.data)
+            else:
+                self._converter.store(key, converted_data)
+                converted = self._converter.converted_image(element.data, converted_data)
+
+            then(type(element)(converted, element.annotations))
+
+    def _shutdown(self):
+        """
+        Shuts down the pool of workers.
+        """
+        if self._executor is None:
+            return
+
+        for _, _, data in self._pending:
+            data.cancel()
+        self._pending.clear()
+
+        self._executor.shutdown(wait=True)
+        self._executor = None
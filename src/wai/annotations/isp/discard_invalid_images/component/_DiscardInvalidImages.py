@@ -1,6 +1,7 @@
 from wai.common.cli.options import FlagOption
 
 from ....core.component import ProcessorComponent
+from ....core.component.util import WithWorkers
 from ....core.stream import ThenFunction, DoneFunction
 from ....core.stream.util import RequiresNoFinalisation
 from ....domain.image import ImageInstance
@@ -8,6 +9,7 @@ from ....domain.image import ImageInstance
 
 class DiscardInvalidImages(
     RequiresNoFinalisation,
+    WithWorkers,
     ProcessorComponent[ImageInstance, ImageInstance]
 ):
     """
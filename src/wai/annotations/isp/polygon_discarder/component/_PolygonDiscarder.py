@@ -2,6 +2,7 @@ from wai.common.adams.imaging.locateobjects import LocatedObjects, LocatedObject
 from wai.common.cli.options import TypedOption, FlagOption
 
 from ....core.component import ProcessorComponent
+from ....core.component.util import WithWorkers
 from ....core.stream import ThenFunction, DoneFunction
 from ....core.stream.util import RequiresNoFinalisation
 from ....domain.image.object_detection import ImageObjectDetectionInstance
@@ -9,6 +10,7 @@ from ....domain.image.object_detection import ImageObjectDetectionInstance
 
 class PolygonDiscarder(
     RequiresNoFinalisation,
+    WithWorkers,
     ProcessorComponent[ImageObjectDetectionInstance, ImageObjectDetectionInstance]
 ):
     """
@@ -1,9 +1,11 @@
-from typing import Any, Callable, Dict, Optional, Set, Union
+import os
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 from wai.common.adams.imaging.locateobjects import LocatedObjects
 from wai.common.cli.options import TypedOption
 
 from ....core.component import ProcessorComponent
+from ....core.component.util import ShardableOutput
 from ....core.domain import Instance
 from ....core.stream import OutputElementType, ThenFunction, DoneFunction
 from ....core.stream.util import ProcessState
@@ -47,7 +49,35 @@ FORMATTERS: Dict[str, Callable[[Set[str]], str]] = {
 FORMATTER_CHOICES = tuple(FORMATTERS.keys())
 
 
+def parse_csv(formatted: str) -> Set[str]:
+    lines = formatted.splitlines()
+    return parse_csv_headless(lines[1]) if len(lines) > 1 else set()
+
+
+def parse_csv_headless(formatted: str) -> Set[str]:
+    return set(label for label in formatted.strip().split(',') if label != "")
+
+
+def parse_list(formatted: str) -> Set[str]:
+    return set(label for label in formatted.splitlines() if label != "")
+
+
+def parse_json(formatted: str) -> Set[str]:
+    from json import loads
+    return set(loads(formatted)["labels"])
+
+
+PARSERS: Dict[str, Callable[[str], Set[str]]] = {
+    "csv": parse_csv,
+    "csv-headless": parse_csv_headless,
+    "list": parse_list,
+    "json": parse_json,
+    "json-pretty": parse_json
+}
+
+
 class WriteLabels(
+    ShardableOutput,
     ProcessorComponent[InstanceType, InstanceType]
 ):
     """
@@ -112,3 +142,23 @@ class WriteLabels(
             file.write(formatted)
 
         done()
+
+    def redirect_output(self, redirect: Callable[[str], str]):
+        self.output = redirect(os.path.abspath(self.output))
+
+    def owns_output_file(self, filename: str) -> bool:
+        return os.path.abspath(filename) == os.path.abspath(self.output)
+
+    def merge_shard_files(self, shard_filenames: List[str], filename: str):
+        # Combine the labels found by each shard
+        parser = PARSERS[self.format]
+        labels = set()
+        for shard_filename in shard_filenames:
+            with open(shard_filename, "r") as file:
+                labels.update(parser(file.read()))
+
+        formatter = FORMATTERS[self.format]
+        formatted = formatter(labels)
+
+        with open(filename, "w") as file:
+            file.write(formatted)
@@ -6,6 +6,7 @@ from typing import Dict, List
 from .batch_split import batch_split_main
 from .convert import convert_main
 from .domains import domains_main
+from .index import index_main
 from .plugins import plugins_main
 from ._typing import CommandMain
 
@@ -15,6 +16,7 @@ __commands: Dict[str, CommandMain] = {
     "plugins": plugins_main,
     "domains": domains_main,
     "batch-split": batch_split_main,
+    "index": index_main,
 }
 
 
@@ -26,6 +26,124 @@ class ConvertOptions(CLIInstantiable):
         metavar="FILENAME"
     )
 
+    # The number of elements to gather into batches for stages which process batches
+    BATCH_SIZE = TypedOption(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="the number of elements to pass at once to stages which support batch-processing",
+        metavar="SIZE"
+    )
+
+    # Whether to run the source and sink on separate threads to the processors
+    PIPELINED = FlagOption(
+        "--pipelined",
+        help="reads, processes and writes elements concurrently, on separate threads"
+    )
+
+    # The number of elements that can wait between the threads of a pipelined conversion
+    QUEUE_SIZE = TypedOption(
+        "--queue-size",
+        type=int,
+        default=16,
+        help="the maximum number of elements waiting between threads when pipelined",
+        metavar="SIZE"
+    )
+
+    # Whether to report the performance of each stage at the end of the conversion
+    PROFILE = FlagOption(
+        "--profile",
+        help="records the time spent in, and number of elements passing through, each stage, "
+             "and prints a report at the end of the conversion"
+    )
+
+    # The file to write the profiling report to as JSON
+    PROFILE_JSON = TypedOption(
+        "--profile-json",
+        type=str,
+        default="",
+        help="the file to write the profiling report to in JSON format (implies --profile)",
+        metavar="FILENAME"
+    )
+
+    # Whether to also profile the memory usage of each stage
+    PROFILE_MEMORY = FlagOption(
+        "--profile-memory",
+        help="also records the memory allocated and retained by each stage, and the largest objects held "
+             "by the converted elements, using tracemalloc (implies --profile, and slows the conversion)"
+    )
+
+    # The number of elements to check the domain of after each stage before only checking a sample
+    VALIDATE_FIRST = TypedOption(
+        "--validate-first",
+        type=int,
+        default=-1,
+        help="the number of elements to check the domain of after each stage, before only checking "
+             "every --validate-every'th element (-1 to check all elements)",
+        metavar="N"
+    )
+
+    # The interval at which to check the domains of elements after the first few
+    VALIDATE_EVERY = TypedOption(
+        "--validate-every",
+        type=int,
+        default=0,
+        help="the interval at which to check the domain of elements after the first --validate-first elements "
+             "(0 to check no more)",
+        metavar="K"
+    )
+
+    # Whether to skip checking the calling semantics of the pipeline stages
+    UNCHECKED = FlagOption(
+        "--unchecked",
+        help="skips checking that each stage follows the stream calling semantics, "
+             "reducing per-element overhead (for production runs)"
+    )
+
+    # The number of processes to split the conversion across
+    WORKERS = TypedOption(
+        "--workers",
+        type=int,
+        default=1,
+        help="the number of processes to split the input files across, each performing the full conversion "
+             "on its share (requires a source which reads local files)",
+        metavar="N"
+    )
+
+    # The journal of completed source elements, for resuming interrupted conversions
+    CHECKPOINT = TypedOption(
+        "--checkpoint",
+        type=str,
+        default="",
+        help="the file to record the source elements which have been completely converted in",
+        metavar="FILENAME"
+    )
+
+    # Whether to resume an interrupted conversion from its checkpoint
+    RESUME = FlagOption(
+        "--resume",
+        help="resumes an interrupted conversion, skipping the source elements recorded in the checkpoint "
+             "file and adding to the existing output (requires --checkpoint)"
+    )
+
+    # Whether to only convert the input files which have changed since the last conversion
+    INCREMENTAL = FlagOption(
+        "--incremental",
+        help="only converts input files which are new or changed since the last conversion into the same output, "
+             "and removes the outputs of deleted input files, using a manifest stored with the output "
+             "(requires a source which reads local files and a sink which writes local files)"
+    )
+
+    # The maximum amount of memory to hold opened images in
+    IMAGE_CACHE_MEMORY = TypedOption(
+        "--image-cache-memory",
+        type=int,
+        default=-1,
+        help="the maximum amount of memory to keep opened images in, in megabytes, after which the least recently "
+             "used are closed (-1 for the WAIANN_PIL_CACHE_MB environment variable, or 256 if it isn't set)",
+        metavar="MB"
+    )
+
     # Override the default help option
     HELP = FlagOption(
         "-h", "--help",
@@ -1,16 +1,21 @@
 """
 Module containing the main entry point function for converting annotations.
 """
+import json
+import sys
 from typing import Optional
 
 from wai.common.cli import OptionsList
 
 from ....core.builder import ConversionPipelineBuilder
+from ....core.stream.util import CheckpointJournal
 from ...logging import get_app_logger
 from ..plugins import PluginsOptions, get_plugins_formatted
 from ._help import convert_help
 from ._macros import perform_macro_expansion
 from ._ConvertOptions import ConvertOptions
+from ._incremental import convert_incremental
+from ._sharding import convert_sharded
 
 
 def convert_main(options: Optional[OptionsList] = None):
@@ -25,7 +30,6 @@ def convert_main(options: Optional[OptionsList] = None):
 
     # Get the command-line arguments if none are specified directly
     if options is None:
-        import sys
         options = sys.argv[1:]
 
     # Split the options into global and stage-specific
@@ -59,13 +63,71 @@ def convert_main(options: Optional[OptionsList] = None):
         print(get_plugins_formatted(stage_plugin_options))
         return
 
+    # Bound the memory held by opened images (also in any worker processes)
+    if convert_options.IMAGE_CACHE_MEMORY != -1:
+        from ....domain.image.util import set_pil_image_cache_budget
+        set_pil_image_cache_budget(convert_options.IMAGE_CACHE_MEMORY)
+
     # Perform macro expansion on the stage options
     stage_options = perform_macro_expansion(stage_options, convert_options.MACRO_FILE)
 
     # Create the conversion pipeline
-    conversion_pipeline = ConversionPipelineBuilder.from_options(stage_options)
+    builder_kwargs = dict(
+        validate_first=convert_options.VALIDATE_FIRST if convert_options.VALIDATE_FIRST >= 0 else None,
+        validate_every=convert_options.VALIDATE_EVERY
+    )
+    conversion_pipeline = ConversionPipelineBuilder.from_options(stage_options, **builder_kwargs)
 
     # Execute the pipeline
-    conversion_pipeline.process()
+    profile = convert_options.PROFILE or convert_options.PROFILE_JSON != "" or convert_options.PROFILE_MEMORY
+    process_kwargs = dict(
+        checked=not convert_options.UNCHECKED,
+        batch_size=convert_options.BATCH_SIZE,
+        profile=profile,
+        profile_memory=convert_options.PROFILE_MEMORY,
+        thread_boundaries=(
+            (0, len(conversion_pipeline.processors))
+            if convert_options.PIPELINED else
+            tuple()
+        ),
+        queue_size=convert_options.QUEUE_SIZE
+    )
+    if convert_options.INCREMENTAL and (convert_options.WORKERS > 1 or convert_options.CHECKPOINT != ""):
+        raise Exception("Incremental conversions can't be split across workers or checkpointed")
+
+    if convert_options.PROFILE_MEMORY and convert_options.WORKERS > 1:
+        raise Exception("Memory profiling is not supported when splitting the conversion across workers")
+
+    if convert_options.CHECKPOINT != "":
+        if convert_options.WORKERS > 1:
+            raise Exception("Checkpointing is not supported when splitting the conversion across workers")
+        process_kwargs.update(journal=CheckpointJournal(convert_options.CHECKPOINT), resume=convert_options.RESUME)
+    elif convert_options.RESUME:
+        raise Exception("Can only resume a conversion with a checkpoint file (--checkpoint)")
+
+    if convert_options.INCREMENTAL:
+        pipeline_profile = convert_incremental(stage_options, builder_kwargs, **process_kwargs)
+    elif convert_options.WORKERS > 1:
+        pipeline_profile = convert_sharded(
+            stage_options,
+            convert_options.WORKERS,
+            convert_options.VERBOSITY,
+            builder_kwargs,
+            **process_kwargs
+        )
+    else:
+        conversion_pipeline.process(**process_kwargs)
+        pipeline_profile = conversion_pipeline.profile
+
+        if convert_options.RESUME:
+            logger.info(f"Skipped {process_kwargs['journal'].skipped} elements completed before resuming")
+
+    # Report the performance of each stage
+    if profile and pipeline_profile is not None:
+        print(pipeline_profile.format_table(), file=sys.stderr)
+
+        if convert_options.PROFILE_JSON != "":
+            with open(convert_options.PROFILE_JSON, "w") as file:
+                json.dump(pipeline_profile.to_json(), file, indent=2)
 
     logger.info("Finished conversion")
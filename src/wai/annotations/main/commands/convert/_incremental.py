@@ -0,0 +1,432 @@
+"""
+Provides incremental conversions, which only convert the input files
+which have changed since the previous conversion.
+"""
+import hashlib
+import json
+import os
+import shutil
+from itertools import chain
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from wai.common.cli import OptionsList
+
+from ....core.builder import ConversionPipelineBuilder
+from ....core.component.util import LocalFilenameSource, LocalFileWriter, ShardableOutput, WithOutputDirectory
+from ....core.stream import Pipeline
+from ....core.stream.util import RequiresNoFinalisation, PipelineProfile, processes_batches, consumes_batches
+from ...logging import get_app_logger
+from ._sharding import iterate_components, shard_path, unshard_path, _write_file_list
+
+# The name of the manifest file, written into the output directory of the conversion
+MANIFEST_FILENAME = ".wai-annotations-manifest.json"
+
+# The version of the manifest format
+MANIFEST_VERSION = 1
+
+# The size of the chunks to read when hashing input files
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ManifestEntry:
+    """
+    The state of an input file when it was last converted, and the
+    output files which were written for it.
+    """
+    def __init__(
+            self,
+            negative: bool,
+            size: int,
+            mtime: int,
+            sha256: str,
+            outputs: Optional[List[str]] = None
+    ):
+        # Whether the file was converted as a negative
+        self.negative: bool = negative
+
+        # The size and modification time (in nanoseconds) of the file
+        self.size: int = size
+        self.mtime: int = mtime
+
+        # The hash of the file's contents
+        self.sha256: str = sha256
+
+        # The files written for this input
+        self.outputs: List[str] = outputs if outputs is not None else []
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "negative": self.negative,
+            "size": self.size,
+            "mtime": self.mtime,
+            "sha256": self.sha256,
+            "outputs": self.outputs
+        }
+
+    @classmethod
+    def from_json(cls, json_object: Dict[str, Any]) -> 'ManifestEntry':
+        return cls(
+            json_object["negative"],
+            json_object["size"],
+            json_object["mtime"],
+            json_object["sha256"],
+            json_object["outputs"]
+        )
+
+
+class Manifest:
+    """
+    A record of the input files of a conversion and the output files
+    written for them, stored alongside the output.
+    """
+    def __init__(
+            self,
+            stage_options: Sequence[str],
+            entries: Optional[Dict[str, ManifestEntry]] = None,
+            shared_outputs: Optional[List[str]] = None
+    ):
+        # The (macro-expanded) stage options of the conversion
+        self.stage_options: List[str] = list(stage_options)
+
+        # The entries for each input file, by absolute path
+        self.entries: Dict[str, ManifestEntry] = entries if entries is not None else {}
+
+        # The files written which can't be attributed to a single input file
+        self.shared_outputs: List[str] = shared_outputs if shared_outputs is not None else []
+
+    def iterate_outputs(self) -> Iterator[str]:
+        """
+        Iterates over all output files recorded in the manifest.
+        """
+        for entry in self.entries.values():
+            yield from entry.outputs
+
+        yield from self.shared_outputs
+
+    def save(self, filename: str):
+        """
+        Writes the manifest to disk, replacing any existing manifest atomically.
+
+        :param filename:    The file to write the manifest to.
+        """
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "w") as file:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "stage-options": self.stage_options,
+                    "inputs": {path: entry.to_json() for path, entry in self.entries.items()},
+                    "shared-outputs": self.shared_outputs
+                },
+                file,
+                indent=2
+            )
+        os.replace(temp_filename, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> Optional['Manifest']:
+        """
+        Loads a manifest from disk.
+
+        :param filename:    The file the manifest was written to.
+        :return:            The manifest, or None if there is no (compatible) manifest.
+        """
+        if not os.path.exists(filename):
+            return None
+
+        with open(filename, "r") as file:
+            json_object = json.load(file)
+
+        if json_object.get("version") != MANIFEST_VERSION:
+            return None
+
+        return cls(
+            json_object["stage-options"],
+            {path: ManifestEntry.from_json(entry) for path, entry in json_object["inputs"].items()},
+            json_object["shared-outputs"]
+        )
+
+
+def convert_incremental(
+        stage_options: OptionsList,
+        builder_kwargs: Optional[Dict[str, Any]] = None,
+        **process_kwargs
+) -> Optional[PipelineProfile]:
+    """
+    Performs a conversion incrementally, only converting the input files
+    which are new or have changed since the last conversion into the same
+    output, and removing the outputs of input files which no longer exist.
+    The state of each input file is kept in a manifest in the output directory.
+
+    Outputs can only be attributed to individual input files when every stage
+    of the pipeline writes/forwards each element as it receives it. Otherwise,
+    or if the conversion options have changed, any change to the input files
+    causes a full conversion.
+
+    :param stage_options:   The (macro-expanded) stage options of the conversion.
+    :param builder_kwargs:  The keyword arguments to the ConversionPipelineBuilder.from_options call.
+    :param process_kwargs:  The keyword arguments to the Pipeline.process call.
+    :return:                The profile of the conversion, if profiling and any files were converted.
+    """
+    logger = get_app_logger()
+
+    if builder_kwargs is None:
+        builder_kwargs = {}
+
+    # Create the pipeline to determine the inputs and outputs of the conversion
+    pipeline = ConversionPipelineBuilder.from_options(stage_options, **builder_kwargs)
+
+    # Can only track conversions from local files to local files
+    source = pipeline.source if pipeline.has_source else None
+    if not isinstance(source, LocalFilenameSource):
+        raise Exception("Incremental conversions require a source which reads local files")
+    sink = pipeline.sink if pipeline.has_sink else None
+    if not isinstance(sink, (LocalFileWriter, WithOutputDirectory)):
+        raise Exception("Incremental conversions require a sink which writes local files")
+
+    manifest_filename = os.path.join(sink.output_path, MANIFEST_FILENAME)
+    previous = Manifest.load(manifest_filename)
+
+    # Determine which input files have changed
+    current = Manifest(stage_options)
+    changed: List[Tuple[str, bool]] = []
+    for filename, negative in scan_inputs(source):
+        previous_entry = previous.entries.get(filename) if previous is not None else None
+        current.entries[filename] = entry = inspect_input(filename, negative, previous_entry)
+        if previous_entry is None or previous_entry.negative != negative or previous_entry.sha256 != entry.sha256:
+            changed.append((filename, negative))
+    deleted = (
+        [filename for filename in previous.entries if filename not in current.entries]
+        if previous is not None else
+        []
+    )
+
+    # Decide whether the existing output can be updated in place
+    if previous is None:
+        full = True
+    elif previous.stage_options != current.stage_options:
+        logger.info("Conversion options have changed since the last conversion, converting all files")
+        full = True
+    elif len(changed) == 0 and len(deleted) == 0:
+        logger.info("No input files have changed since the last conversion")
+        current.shared_outputs = previous.shared_outputs
+        for filename, entry in current.entries.items():
+            entry.outputs = previous.entries[filename].outputs
+        current.save(manifest_filename)
+        return None
+    elif len(previous.shared_outputs) > 0:
+        logger.info("Output can't be updated per input file, converting all files")
+        full = True
+    else:
+        full = False
+
+    if full:
+        # Replace all previous output
+        if previous is not None:
+            remove_outputs(previous.iterate_outputs())
+        inputs = [(filename, entry.negative) for filename, entry in current.entries.items()]
+    else:
+        logger.info(f"Converting {len(changed)} new/changed files and removing outputs of {len(deleted)} files")
+
+        # Remove the outputs of the changed and deleted files, and keep those of the unchanged files
+        for filename in chain((filename for filename, negative in changed), deleted):
+            if filename in previous.entries:
+                remove_outputs(previous.entries[filename].outputs)
+        changed_filenames = set(filename for filename, negative in changed)
+        for filename, entry in current.entries.items():
+            if filename not in changed_filenames:
+                entry.outputs = previous.entries[filename].outputs
+        inputs = changed
+
+    profile = _convert_inputs(stage_options, inputs, current, builder_kwargs, process_kwargs)
+
+    current.save(manifest_filename)
+
+    return profile
+
+
+def scan_inputs(source: LocalFilenameSource) -> Iterator[Tuple[str, bool]]:
+    """
+    Iterates over the input files of a conversion.
+
+    :param source:  The source of the conversion.
+    :return:        An iterator of absolute filename, negative pairs.
+    """
+    for filename in source.iterate_input_file_names():
+        yield os.path.abspath(filename), False
+    for filename in source.iterate_negative_file_names():
+        yield os.path.abspath(filename), True
+
+
+def inspect_input(filename: str, negative: bool, previous: Optional[ManifestEntry]) -> ManifestEntry:
+    """
+    Creates the manifest entry for an input file. The file's contents are
+    only hashed if its size or modification time differ from the previous
+    entry.
+
+    :param filename:    The absolute path to the input file.
+    :param negative:    Whether the file is converted as a negative.
+    :param previous:    The entry for the file in the previous manifest, if any.
+    :return:            The entry for the file, with no outputs.
+    """
+    stat = os.stat(filename)
+
+    # Assume the contents are unchanged if the file hasn't been touched
+    if previous is not None and previous.size == stat.st_size and previous.mtime == stat.st_mtime_ns:
+        sha256 = previous.sha256
+    else:
+        sha256 = hash_file(filename)
+
+    return ManifestEntry(negative, stat.st_size, stat.st_mtime_ns, sha256)
+
+
+def hash_file(filename: str) -> str:
+    """
+    Calculates the SHA-256 hash of a file's contents.
+
+    :param filename:    The file to hash.
+    :return:            The hash as a hex-string.
+    """
+    sha256 = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def remove_outputs(filenames: Iterable[str]):
+    """
+    Removes the output files of a previous conversion.
+
+    :param filenames:   The output files.
+    """
+    for filename in filenames:
+        if os.path.exists(filename):
+            os.remove(filename)
+
+
+def outputs_are_attributable(
+        pipeline: Pipeline,
+        batch_size: int = 1,
+        thread_boundaries: Sequence[int] = tuple(),
+        **process_kwargs
+) -> bool:
+    """
+    Whether the files a pipeline writes for each element are written by the
+    time the source's 'then' function returns for that element.
+
+    :param pipeline:            The conversion pipeline.
+    :param batch_size:          The batch size of the execution.
+    :param thread_boundaries:   The thread boundaries of the execution.
+    :return:                    True if output files can be attributed to input files.
+    """
+    if len(thread_boundaries) > 0:
+        return False
+
+    if batch_size > 1 and (
+            any(processes_batches(processor) for processor in pipeline.processors)
+            or consumes_batches(pipeline.sink)
+    ):
+        return False
+
+    return all(
+        isinstance(stage, RequiresNoFinalisation)
+        for stage in pipeline.processors + (pipeline.sink,)
+    )
+
+
+def _convert_inputs(
+        stage_options: OptionsList,
+        inputs: List[Tuple[str, bool]],
+        manifest: Manifest,
+        builder_kwargs: Dict[str, Any],
+        process_kwargs: Dict[str, Any]
+) -> Optional[PipelineProfile]:
+    """
+    Converts the given input files, recording the files written for each
+    in the manifest. The files are written into a staging directory, and
+    moved into place as they are attributed to an input file.
+    """
+    pipeline = ConversionPipelineBuilder.from_options(stage_options, **builder_kwargs)
+    writers = [component for component in iterate_components(pipeline) if isinstance(component, ShardableOutput)]
+    attributable = outputs_are_attributable(pipeline, **process_kwargs)
+
+    # Stage the output alongside the actual output, so files can be moved rather than copied
+    temp_parent = os.path.dirname(os.path.normpath(pipeline.sink.output_path))
+    os.makedirs(temp_parent, exist_ok=True)
+
+    with TemporaryDirectory(prefix=".wai-annotations-staging-", dir=temp_parent) as temp_directory:
+        staging_directory = os.path.join(temp_directory, "files")
+
+        # Read only the changed files
+        source: LocalFilenameSource = pipeline.source
+        source.inputs = []
+        source.input_files = [
+            _write_file_list(
+                [filename for filename, negative in inputs if not negative],
+                os.path.join(temp_directory, "inputs.txt")
+            )
+        ]
+        source.negatives = []
+        source.negative_files = [
+            _write_file_list(
+                [filename for filename, negative in inputs if negative],
+                os.path.join(temp_directory, "negatives.txt")
+            )
+        ]
+
+        # Write into the staging directory
+        def redirect(path: str) -> str:
+            redirected = shard_path(path, staging_directory)
+            os.makedirs(os.path.dirname(redirected), exist_ok=True)
+            return redirected
+
+        for writer in writers:
+            writer.redirect_output(redirect)
+
+        def tracked_elements():
+            for element in source.iterate_elements():
+                yield element
+
+                # The element has been completely converted once the next one is requested
+                if attributable:
+                    manifest.entries[os.path.abspath(element[0])].outputs.extend(
+                        _move_staged_files(staging_directory, writers, include_whole_files=False)
+                    )
+
+        pipeline.process(tracked_elements(), **process_kwargs)
+
+        # Any remaining files can't be attributed to a single input file
+        manifest.shared_outputs = list(_move_staged_files(staging_directory, writers, include_whole_files=True))
+
+    return pipeline.profile
+
+
+def _move_staged_files(
+        staging_directory: str,
+        writers: List[ShardableOutput],
+        include_whole_files: bool
+) -> Iterator[str]:
+    """
+    Moves the files written into the staging directory to their actual locations.
+
+    :param staging_directory:   The staging directory.
+    :param writers:             The components of the conversion which write files.
+    :param include_whole_files: Whether to move files which a component writes the entire
+                                contents of, which may still be being written.
+    :return:                    An iterator of the actual locations of the moved files.
+    """
+    for dirpath, dirnames, filenames in os.walk(staging_directory):
+        for filename in filenames:
+            staged_filename = os.path.join(dirpath, filename)
+            actual_filename = unshard_path(staged_filename, staging_directory)
+
+            if not include_whole_files and any(writer.owns_output_file(actual_filename) for writer in writers):
+                continue
+
+            os.makedirs(os.path.dirname(actual_filename), exist_ok=True)
+            shutil.move(staged_filename, actual_filename)
+
+            yield actual_filename
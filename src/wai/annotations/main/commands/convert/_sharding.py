@@ -0,0 +1,365 @@
+"""
+Provides sharded execution of conversions across multiple worker processes.
+"""
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import mkdtemp
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from wai.common.cli import OptionsList
+
+from ....core.builder import ConversionPipelineBuilder
+from ....core.component.util import LocalFilenameSource, LocalFileWriter, ShardableOutput, WithOutputDirectory
+from ....core.stream import Pipeline
+from ....core.stream.util import ParallelStreamProcessor, PipelineProfile, StageProfile
+from ...logging import get_app_logger
+
+
+def convert_sharded(
+        stage_options: OptionsList,
+        workers: int,
+        verbosity: int,
+        builder_kwargs: Optional[Dict[str, Any]] = None,
+        **process_kwargs
+) -> Optional[PipelineProfile]:
+    """
+    Performs a conversion by partitioning the input files across a number
+    of worker processes, each executing the full conversion pipeline on its
+    share of the files. Each worker writes into its own directory, and once
+    all have completed, the written files are moved into place, with any
+    files written by more than one worker being merged.
+
+    :param stage_options:   The (macro-expanded) stage options of the conversion.
+    :param workers:         The number of worker processes.
+    :param verbosity:       The logging level for the workers.
+    :param builder_kwargs:  The keyword arguments to each worker's ConversionPipelineBuilder.from_options call.
+    :param process_kwargs:  The keyword arguments to each worker's Pipeline.process call.
+    :return:                The combined profile of the workers, if profiling.
+    """
+    logger = get_app_logger()
+
+    if builder_kwargs is None:
+        builder_kwargs = {}
+
+    # Create the pipeline to determine the inputs and outputs of the conversion
+    pipeline = ConversionPipelineBuilder.from_options(stage_options, **builder_kwargs)
+
+    # Can only shard conversions which read local files
+    source = pipeline.source if pipeline.has_source else None
+    if not isinstance(source, LocalFilenameSource):
+        raise Exception("Conversions can only be split across workers when the source reads local files")
+
+    # Make sure the outputs of the shards can be combined before starting any of them
+    check_shardable_outputs(pipeline)
+
+    # Partition the inputs into a contiguous shard for each worker
+    shards = [
+        shard
+        for shard in zip(
+            partition(source.input_file_names, workers),
+            partition(source.negative_file_names, workers)
+        )
+        if len(shard[0]) + len(shard[1]) > 0
+    ]
+    # Nothing to shard, so just perform the (empty) conversion as normal
+    if len(shards) == 0:
+        pipeline.process(**process_kwargs)
+        return pipeline.profile
+
+    logger.info(f"Converting {len(source.input_file_names) + len(source.negative_file_names)} files "
+                f"in {len(shards)} shards")
+
+    # Write the shards alongside the output if possible, so merging can move files rather than copy them
+    sink = pipeline.sink if pipeline.has_sink else None
+    temp_parent = (
+        os.path.dirname(os.path.normpath(sink.output_path))
+        if isinstance(sink, (LocalFileWriter, WithOutputDirectory)) else
+        None
+    )
+    if temp_parent is not None:
+        os.makedirs(temp_parent, exist_ok=True)
+
+    temp_directory = mkdtemp(prefix=".wai-annotations-shards-", dir=temp_parent)
+    try:
+        shard_directories = []
+        start_time = time.perf_counter()
+
+        with ProcessPoolExecutor(len(shards)) as executor:
+            futures = []
+            for index, (inputs, negatives) in enumerate(shards):
+                shard_directory = os.path.join(temp_directory, f"shard-{index}")
+                os.makedirs(shard_directory)
+                shard_directories.append(shard_directory)
+
+                futures.append(
+                    executor.submit(
+                        _convert_shard,
+                        stage_options,
+                        _write_file_list(inputs, os.path.join(temp_directory, f"inputs-{index}.txt")),
+                        _write_file_list(negatives, os.path.join(temp_directory, f"negatives-{index}.txt")),
+                        os.path.join(shard_directory, "files"),
+                        verbosity,
+                        builder_kwargs,
+                        process_kwargs
+                    )
+                )
+
+            # Wait for all shards, raising the first error
+            profiles = [future.result() for future in futures]
+
+        wall_time = time.perf_counter() - start_time
+
+        logger.info("Merging the outputs of the shards")
+        try:
+            merge_shard_outputs(
+                [
+                    component
+                    for component in iterate_components(pipeline)
+                    if isinstance(component, ShardableOutput)
+                ],
+                [os.path.join(shard_directory, "files") for shard_directory in shard_directories],
+                os.path.join(temp_directory, "merged")
+            )
+        except Exception:
+            # Keep the outputs of the completed shards so they aren't lost
+            logger.error(f"Failed to merge the outputs of the shards, which have been kept in '{temp_directory}'")
+            temp_directory = None
+            raise
+    finally:
+        if temp_directory is not None:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+    if profiles[0] is None:
+        return None
+
+    return _combine_profiles(profiles, wall_time)
+
+
+def partition(items: Sequence[str], count: int) -> List[Sequence[str]]:
+    """
+    Partitions a sequence into contiguous, nearly-equally-sized parts.
+
+    :param items:   The sequence to partition.
+    :param count:   The number of parts.
+    :return:        The parts.
+    """
+    size, remainder = divmod(len(items), count)
+    parts = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < remainder else 0)
+        parts.append(items[start:end])
+        start = end
+
+    return parts
+
+
+def iterate_components(pipeline: Pipeline) -> Iterator[Any]:
+    """
+    Iterates over the components of a pipeline, looking through any
+    parallelisation of the processors.
+
+    :param pipeline:    The pipeline.
+    :return:            An iterator over the source, processors and sink.
+    """
+    if pipeline.has_source:
+        yield pipeline.source
+
+    for processor in pipeline.processors:
+        while isinstance(processor, ParallelStreamProcessor):
+            processor = processor.processor
+        yield processor
+
+    if pipeline.has_sink:
+        yield pipeline.sink
+
+
+def shard_path(path: str, shard_directory: str) -> str:
+    """
+    Maps an absolute output path to its location within a shard's directory.
+
+    :param path:                The absolute output path.
+    :param shard_directory:     The directory the shard writes into.
+    :return:                    The path to write to instead.
+    """
+    drive, path = os.path.splitdrive(path)
+    return os.path.join(shard_directory, drive.replace(":", ""), path.lstrip(os.sep))
+
+
+def unshard_path(path: str, shard_directory: str) -> str:
+    """
+    Maps a file within a shard's directory back to its actual location.
+    Inverse of 'shard_path'.
+
+    :param path:                The path to a file in the shard directory.
+    :param shard_directory:     The directory the shard writes into.
+    :return:                    The actual path of the file.
+    """
+    relative = os.path.relpath(path, shard_directory)
+
+    # Restore the drive letter on systems which have them
+    if os.path.splitdrive(shard_directory)[0] != "":
+        drive, relative = relative.split(os.sep, 1)
+        return f"{drive}:{os.sep}{relative}"
+
+    return os.sep + relative
+
+
+def check_shardable_outputs(pipeline: Pipeline):
+    """
+    Checks that the outputs of a conversion can be split across workers,
+    i.e. that its sink writes to a location which can be redirected, and
+    that any files written by more than one shard can be merged.
+
+    :param pipeline:    The conversion pipeline.
+    """
+    if pipeline.has_sink and not isinstance(pipeline.sink, ShardableOutput):
+        raise Exception(
+            f"Conversions can't be split across workers when writing with {type(pipeline.sink).__name__}, "
+            f"as its output can't be redirected for each worker"
+        )
+
+    for component in iterate_components(pipeline):
+        if isinstance(component, ShardableOutput) and not component.can_merge_shard_files():
+            raise Exception(
+                f"Conversions can't be split across workers when using {type(component).__name__}, "
+                f"as it can't merge the files written by separate workers"
+            )
+
+
+def merge_shard_outputs(
+        components: Sequence[ShardableOutput],
+        shard_directories: Sequence[str],
+        merge_directory: str
+):
+    """
+    Moves the files written by each shard of a conversion to their actual
+    locations, merging any which were written by more than one shard.
+    Files are only moved into place once all merges have succeeded.
+
+    :param components:          The components of the conversion which write files.
+    :param shard_directories:   The directories the shards wrote into, in shard order.
+    :param merge_directory:     A directory in which to write the merged files before
+                                moving them into place.
+    """
+    # Find the versions of each file written by the shards, and the directories they created
+    shard_files: Dict[str, List[str]] = {}
+    directories: List[str] = []
+    for shard_directory in shard_directories:
+        for dirpath, dirnames, filenames in os.walk(shard_directory):
+            if dirpath != shard_directory:
+                directories.append(unshard_path(dirpath, shard_directory))
+
+            for filename in filenames:
+                shard_filename = os.path.join(dirpath, filename)
+                shard_files.setdefault(unshard_path(shard_filename, shard_directory), []).append(shard_filename)
+
+    # Files written by more than one shard must be merged by the component which wrote them
+    owners: Dict[str, ShardableOutput] = {}
+    for filename, versions in shard_files.items():
+        if len(versions) == 1:
+            continue
+
+        owner = next((component for component in components if component.owns_output_file(filename)), None)
+        if owner is None:
+            raise Exception(f"File '{filename}' was written by multiple workers and can't be merged")
+        owners[filename] = owner
+
+    # Merge them alongside the shards, so that a failure leaves the output untouched
+    sources: Dict[str, str] = {}
+    for filename, versions in shard_files.items():
+        if filename in owners:
+            merged_filename = shard_path(filename, merge_directory)
+            os.makedirs(os.path.dirname(merged_filename), exist_ok=True)
+            owners[filename].merge_shard_files(versions, merged_filename)
+            sources[filename] = merged_filename
+        else:
+            sources[filename] = versions[0]
+
+    # Recreate any (possibly empty) directories the shards created
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    # Move the files into place
+    for filename, source in sources.items():
+        shutil.move(source, filename)
+
+
+def _write_file_list(filenames: Sequence[str], list_filename: str) -> str:
+    """
+    Writes a list of files for a shard's source to read.
+
+    :param filenames:       The files in the list.
+    :param list_filename:   The file to write the list to.
+    :return:                The list filename.
+    """
+    with open(list_filename, "w") as file:
+        for filename in filenames:
+            file.write(f"{os.path.abspath(filename)}\n")
+
+    return list_filename
+
+
+def _convert_shard(
+        stage_options: OptionsList,
+        inputs_file: str,
+        negatives_file: str,
+        shard_directory: str,
+        verbosity: int,
+        builder_kwargs: Dict[str, Any],
+        process_kwargs: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Executes the conversion for one shard, in a worker process.
+
+    :return:    The profile of the shard's conversion as JSON, if profiling.
+    """
+    get_app_logger().setLevel(verbosity)
+
+    pipeline = ConversionPipelineBuilder.from_options(stage_options, **builder_kwargs)
+
+    # Read only the shard's files
+    source: LocalFilenameSource = pipeline.source
+    source.inputs = []
+    source.input_files = [inputs_file]
+    source.negatives = []
+    source.negative_files = [negatives_file]
+
+    # Write into the shard's directory
+    def redirect(path: str) -> str:
+        redirected = shard_path(path, shard_directory)
+        os.makedirs(os.path.dirname(redirected), exist_ok=True)
+        return redirected
+
+    for component in iterate_components(pipeline):
+        if isinstance(component, ShardableOutput):
+            component.redirect_output(redirect)
+
+    pipeline.process(**process_kwargs)
+
+    return pipeline.profile.to_json() if pipeline.profile is not None else None
+
+
+def _combine_profiles(profiles: List[Dict[str, Any]], wall_time: float) -> PipelineProfile:
+    """
+    Combines the profiles of the shards of a conversion, summing the
+    counters of each stage.
+
+    :param profiles:    The JSON profiles of each shard.
+    :param wall_time:   The total time taken by the conversion.
+    :return:            The combined profile.
+    """
+    stages: List[StageProfile] = []
+    for index, stage_json in enumerate(profiles[0]["stages"]):
+        stage = StageProfile(stage_json["name"], stage_json["kind"])
+        for profile in profiles:
+            shard_stage_json = profile["stages"][index]
+            stage.elements_in += shard_stage_json["elements_in"]
+            stage.elements_out += shard_stage_json["elements_out"]
+            stage.wall_time += shard_stage_json["wall_time"]
+            stage.cpu_time += shard_stage_json["cpu_time"]
+        stages.append(stage)
+
+    return PipelineProfile(stages, wall_time)
@@ -0,0 +1,6 @@
+"""
+Package containing the specification of the 'index' sub-command.
+"""
+from ._index_main import index_main
+from ._IndexOptions import IndexOptions
+from ._help import index_help
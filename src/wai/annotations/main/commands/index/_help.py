@@ -0,0 +1,20 @@
+"""
+Provides the help information for the 'index' sub-command.
+"""
+from ....core.help import MainUsageFormatter
+from ._IndexOptions import IndexOptions
+
+
+def index_help() -> str:
+    """
+    Gets the help text for the 'index' sub-command.
+    """
+    return IndexOptions.get_configured_parser(
+                prog="wai-annotations index",
+                description="Reads a data-set with the stages Source [ISP [ISP ...]], recording the size and "
+                            "modification time, image size and label counts of each input file in an SQLite "
+                            "index. Sources can then select input files by predicates over the index "
+                            "(--index/--select) without reading their annotations. Only files which have "
+                            "changed since they were last indexed are re-read.",
+                formatter_class=MainUsageFormatter
+            ).format_help()
@@ -0,0 +1,205 @@
+"""
+Module containing the main entry point function for indexing data-sets.
+"""
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from wai.common.adams.imaging.locateobjects import LocatedObjects
+from wai.common.cli import OptionsList
+
+from ....core.builder import ConversionPipelineBuilder
+from ....core.component.util import LocalFilenameSource
+from ....core.domain import Instance
+from ....core.stream import Pipeline
+from ....core.stream.util import RequiresNoFinalisation
+from ....core.util import DatasetIndex, file_signature
+from ....domain.classification import Classification
+from ....domain.image import Image
+from ....domain.image.object_detection.util import get_object_label
+from ....domain.image.segmentation import ImageSegmentationAnnotation
+from ...logging import get_app_logger
+from ..convert import perform_macro_expansion
+from ._help import index_help
+from ._IndexOptions import IndexOptions
+
+# The number of files to index between commits
+_COMMIT_INTERVAL = 1000
+
+
+class IndexEntry:
+    """
+    The information gathered about an input file while its instances are read.
+    """
+    def __init__(self, path: str, negative: bool, size: int, mtime: int):
+        self.path: str = path
+        self.negative: bool = negative
+        self.size: int = size
+        self.mtime: int = mtime
+
+        # The (data filename, width, height) of each instance read from the file
+        self.instances: List[Tuple[str, Optional[int], Optional[int]]] = []
+
+        # The number of occurrences of each label in the file
+        self.label_counts: Counter = Counter()
+
+    def add(self, instance: Instance):
+        """
+        Adds an instance read from the file.
+        """
+        data = instance.data
+        width, height = data.size if isinstance(data, Image) else (-1, -1)
+        self.instances.append((
+            os.path.join(data.path, data.filename),
+            width if width >= 0 else None,
+            height if height >= 0 else None
+        ))
+        self.label_counts.update(count_labels(instance.annotations))
+
+    def put(self, index: DatasetIndex):
+        """
+        Records the file in the index.
+        """
+        index.put(self.path, self.negative, self.size, self.mtime, self.instances, dict(self.label_counts))
+
+
+def index_main(options: Optional[OptionsList] = None):
+    """
+    Main function for indexing data-sets.
+
+    :param options:
+                The CLI arguments to the program.
+    """
+    # Get the application logger
+    logger = get_app_logger()
+
+    # Get the command-line arguments if none are specified directly
+    if options is None:
+        options = sys.argv[1:]
+
+    # Split the options into global and stage-specific
+    global_options, stage_options = ConversionPipelineBuilder.split_global_options(options)
+
+    # Consume global options
+    try:
+        index_options = IndexOptions(global_options)
+    except ValueError:
+        logger.exception("Error parsing index options")
+        print(index_help())
+        raise
+
+    # Set the logger level from the options
+    logger.setLevel(index_options.VERBOSITY)
+
+    # If the help is requested, print it and return
+    if index_options.HELP:
+        print(index_help())
+        return
+
+    if index_options.OUTPUT == "":
+        raise Exception("No index file given to write to (-o/--output)")
+
+    if len(stage_options) == 0:
+        raise Exception("No source stage given to read the data-set to index with")
+
+    # Perform macro expansion on the stage options
+    stage_options = perform_macro_expansion(stage_options, index_options.MACRO_FILE)
+
+    # Create the pipeline which reads the data-set
+    pipeline = ConversionPipelineBuilder.from_options(stage_options)
+
+    with DatasetIndex(index_options.OUTPUT) as index:
+        indexed, unchanged, removed = index_pipeline(pipeline, index, index_options.REBUILD)
+
+    logger.info(f"Indexed {indexed} files ({unchanged} unchanged, {removed} removed) in '{index_options.OUTPUT}'")
+
+
+def index_pipeline(pipeline: Pipeline, index: DatasetIndex, rebuild: bool = False) -> Tuple[int, int, int]:
+    """
+    Reads the input files of a pipeline, recording each in an index. Entries
+    for files which are no longer input files are removed from the index.
+
+    :param pipeline:    The pipeline reading the data-set (no sink).
+    :param index:       The index to update.
+    :param rebuild:     Whether to re-read files whose index entries are current.
+    :return:            The number of files indexed, left unchanged, and removed.
+    """
+    if pipeline.has_sink:
+        raise Exception("Indexing reads a data-set, so can't write it with a sink stage")
+
+    # Can only index conversions which read local files
+    source = pipeline.source if pipeline.has_source else None
+    if not isinstance(source, LocalFilenameSource):
+        raise Exception("Data-sets can only be indexed when the source reads local files")
+
+    # Instances must be produced as each file is read, to know which file they came from
+    if not all(isinstance(processor, RequiresNoFinalisation) for processor in pipeline.processors):
+        raise Exception("Data-sets can only be indexed when their reader produces instances as each file is read")
+
+    indexed, unchanged = 0, 0
+    entry: Optional[IndexEntry] = None
+
+    def tracked_elements():
+        nonlocal entry, indexed, unchanged
+
+        for filename, negative in source.iterate_elements():
+            path = os.path.abspath(filename)
+            index.mark_present(path)
+            size, mtime = file_signature(path)
+
+            if not rebuild and index.is_current(path, size, mtime):
+                unchanged += 1
+                continue
+
+            entry = IndexEntry(path, negative, size, mtime)
+
+            yield filename, negative
+
+            # The file has been completely read once the next one is requested
+            entry.put(index)
+            entry = None
+            indexed += 1
+            if indexed % _COMMIT_INTERVAL == 0:
+                index.commit()
+
+    pipeline.process(tracked_elements(), lambda instance: entry.add(instance))
+
+    # Remove the files which are no longer part of the data-set
+    removed = index.remove_absent()
+
+    return indexed, unchanged, removed
+
+
+def count_labels(annotations) -> Dict[str, int]:
+    """
+    Counts the occurrences of each label in an instance's annotations.
+
+    :param annotations:     The annotations (None for negatives).
+    :return:                The count of each label.
+    """
+    if annotations is None:
+        return {}
+    elif isinstance(annotations, Classification):
+        return {annotations.label: 1}
+    elif isinstance(annotations, LocatedObjects):
+        return Counter(
+            label
+            for label in (
+                get_object_label(located_object, None)
+                for located_object in annotations
+            )
+            if label is not None
+        )
+    elif isinstance(annotations, ImageSegmentationAnnotation):
+        # Each label with any pixels counts once
+        labels = annotations.labels
+        return {
+            labels[index - 1]: 1
+            for index in np.unique(annotations.indices)
+            if 0 < index <= len(labels)
+        }
+
+    # Other annotations (e.g. transcripts) have no labels
+    return {}
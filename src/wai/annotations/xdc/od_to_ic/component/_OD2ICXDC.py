@@ -1,6 +1,7 @@
 from wai.common.cli.options import TypedOption
 
 from ....core.component import ProcessorComponent
+from ....core.component.util import WithWorkers
 from ....core.stream import ThenFunction, DoneFunction
 from ....core.stream.util import RequiresNoFinalisation
 from ....domain.classification import Classification
@@ -11,6 +12,7 @@ from ....domain.image.classification import ImageClassificationInstance
 
 class OD2ICXDC(
     RequiresNoFinalisation,
+    WithWorkers,
     ProcessorComponent[ImageObjectDetectionInstance, ImageClassificationInstance]
 ):
     """
@@ -3,6 +3,7 @@ import numpy as np
 from wai.common.cli.options import FlagOption
 
 from ....core.component import ProcessorComponent
+from ....core.component.util import WithWorkers
 from ....core.stream import ThenFunction, DoneFunction
 from ....core.stream.util import ProcessState, RequiresNoFinalisation
 from ....domain.image.object_detection import ImageObjectDetectionInstance
@@ -13,6 +14,7 @@ from ....domain.image.segmentation.util import UnlabelledInputMixin, mask_from_r
 
 class OD2ISXDC(
     RequiresNoFinalisation,
+    WithWorkers,
     UnlabelledInputMixin,
     ProcessorComponent[ImageObjectDetectionInstance, ImageSegmentationInstance]
 ):